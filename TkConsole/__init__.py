@@ -12,10 +12,33 @@ Meta:
 
 Modules:
     core (module): Contains the Console class for creating the custom console widget.
+    aio (module): Contains helpers for running the Tkinter event loop together with an asyncio event loop.
+    ansi (module): Contains the AnsiParser and TagPool classes for styling output with ANSI escape sequences.
+    channels (module): Contains the ChannelConsole class, a console whose output is split into channels shown as tabs.
+    completion (module): Contains the completers and the CompletionEngine class for tab completion in the entry field.
+    export (module): Contains the ConsoleExport class for saving the scrollback of a console to a file in chunks.
+    highlight (module): Contains the Highlighter class that highlights patterns in new output in one pass.
+    headless (module): Contains the HeadlessConsole class, a console without a display that does not import Tkinter.
+    history (module): Contains the InputHistory class that keeps the input history of a console in an append-only file.
+    lines (module): Contains the LineEditor and ProgressBar classes for rewriting the last line of a console in place.
+    process (module): Contains the ConsoleProcess class for streaming the output of a subprocess into a console.
+    queues (module): Contains the OutputQueue class for handing output to a console from other threads.
+    record (module): Contains the SessionRecorder and SessionReplay classes for recording the output and input of a
+        console and replaying them.
+    repl (module): Contains the ConsoleRepl class, an interactive Python interpreter that evaluates off the Tkinter
+        thread.
+    search (module): Contains the SearchIndex class for searching the output of a console.
+    server (module): Contains the ConsoleServer class, a local socket server that streams the messages of other
+        processes into a console.
+    stats (module): Contains the ConsoleStats class that counts and times the hot paths of a console.
+    store (module): Contains the LineStore class that keeps the scrollback of a console in virtual mode.
+    streams (module): Contains the ConsoleStream class and the redirect context manager for writing to a console like
+        to a file.
 """
 
 
 from __future__ import absolute_import
+import importlib
 
 # meta
 __title__ = "TkConsole"
@@ -24,4 +47,28 @@ __license__ = "GNU GPL v3"
 __copyright__ = "Copyright 2023, Eftal Gezer"
 __version__ = "0.1.0"
 
-from .core import Console
+from .export import ConsoleExport
+from .headless import HeadlessConsole
+from .highlight import Highlighter, DEFAULT_RULES
+from .history import InputHistory
+from .lines import LineEditor, ProgressBar
+from .queues import OutputQueue, BLOCK, DROP_OLDEST, DROP_NEWEST
+from .record import SessionRecorder, SessionReplay, read_session
+from .search import SearchIndex
+from .server import ConsoleServer
+from .stats import ConsoleStats
+from .store import LineStore
+from .streams import ConsoleStream, redirect
+
+# modules that import Tkinter, or run as scripts, are only imported once one of their classes is used
+_TK_CLASSES = {
+    "Console": "core", "AnsiParser": "ansi", "TagPool": "ansi", "ChannelConsole": "channels",
+    "ConsoleProcess": "process", "ConsoleRepl": "repl",
+}
+
+
+def __getattr__(name):
+    """Imports the classes that need Tkinter on first access, so that the headless console runs without it."""
+    if name in _TK_CLASSES:
+        return getattr(importlib.import_module(f".{_TK_CLASSES[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,78 @@
+"""
+TkConsole Asyncio Support
+
+This module runs the Tkinter event loop inside an asyncio event loop on the same thread, so that coroutines can await
+`Console.ainput` and keep writing to a console while the window stays responsive.
+
+Functions:
+    tk_loop(root, interval=1 / 120): A coroutine that processes Tkinter events until the root window is destroyed.
+    run(root, main, interval=1 / 120): Runs a coroutine alongside the Tkinter event loop.
+
+Usage:
+    async def main():
+        name = await console.ainput("Name: ")
+        console.print(f"Hello, {name}!")
+
+    run(root, main())
+"""
+
+import asyncio
+import contextlib
+import tkinter as tk
+
+
+async def tk_loop(root, interval=1 / 120):
+    """
+    Processes Tkinter events until the root window is destroyed.
+
+    Args:
+        root (tk.Tk): The root window.
+        interval (float): The number of seconds between two rounds of event processing.
+    """
+    while True:
+        try:
+            root.update()
+        except tk.TclError:
+            return
+        await asyncio.sleep(interval)
+
+
+def run(root, main, interval=1 / 120):
+    """
+    Runs a coroutine alongside the Tkinter event loop until the root window is destroyed.
+
+    The coroutine is cancelled if it is still running when the window is destroyed. If it raises, the window is
+    destroyed and the exception is raised again.
+
+    Args:
+        root (tk.Tk): The root window.
+        main (coroutine): The coroutine to be run.
+        interval (float): The number of seconds between two rounds of Tkinter event processing.
+
+    Returns:
+        The result of the coroutine, or None if it was cancelled.
+    """
+
+    def destroy_on_error(task):
+        """
+        Destroy the root window when the coroutine raises.
+        """
+        if not task.cancelled() and task.exception() is not None:
+            with contextlib.suppress(tk.TclError):
+                root.destroy()
+
+    async def runner():
+        """
+        Run the coroutine and the Tkinter event loop together.
+        """
+        task = asyncio.ensure_future(main)
+        task.add_done_callback(destroy_on_error)
+        await tk_loop(root, interval)
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            return None
+        return task.result()
+
+    return asyncio.run(runner())
@@ -0,0 +1,254 @@
+"""
+TkConsole ANSI
+
+This module parses ANSI escape sequences in console output. SGR (Select Graphic Rendition) sequences are turned into
+styles, and every distinct style is mapped onto one text area tag from a bounded pool, so that the number of tags does
+not grow with the amount of output. Other escape sequences are removed from the text.
+
+Constants:
+    DEFAULT_STYLE (tuple): The style of text without SGR attributes.
+    PALETTE (tuple): The colors of the 16 basic ANSI color codes.
+
+Classes:
+    AnsiParser: An incremental parser that splits text into styled segments.
+    TagPool: A bounded pool of text area tags, one per style.
+"""
+
+import collections
+import re
+import tkinter.font as tkFont
+from .lines import LINE_EDITS
+
+# foreground, background, bold, italic, underline, inverse, strikethrough
+DEFAULT_STYLE = (None, None, False, False, False, False, False)
+
+PALETTE = (
+    "#000000", "#CD3131", "#0DBC79", "#E5E510", "#2472C8", "#BC3FBC", "#11A8CD", "#E5E5E5",
+    "#666666", "#F14C4C", "#23D18B", "#F5F543", "#3B8EEA", "#D670D6", "#29B8DB", "#FFFFFF",
+)
+
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+_ESCAPE = re.compile(r"\x1b(?:\[([0-?]*)[ -/]*([@-~])|\][^\x07\x1b]*(?:\x07|\x1b\\)|[ -/]+[0-~]|[@-Z\\-_])")
+_INCOMPLETE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*|[ -/]+)?\Z")
+
+_ATTRIBUTES = {1: (2, True), 3: (3, True), 4: (4, True), 7: (5, True), 9: (6, True),
+               22: (2, False), 23: (3, False), 24: (4, False), 27: (5, False), 29: (6, False)}
+
+
+def color_256(number):
+    """
+    Returns the color of an entry of the 256-color ANSI palette.
+
+    Args:
+        number (int): The palette entry, from 0 to 255.
+
+    Returns:
+        str: The color as a "#RRGGBB" string.
+    """
+    if number < 16:
+        return PALETTE[number]
+    if number < 232:
+        number -= 16
+        red, green, blue = _CUBE_LEVELS[number // 36], _CUBE_LEVELS[number // 6 % 6], _CUBE_LEVELS[number % 6]
+        return f"#{red:02X}{green:02X}{blue:02X}"
+    level = 8 + 10 * (number - 232)
+    return f"#{level:02X}{level:02X}{level:02X}"
+
+
+class AnsiParser:
+    """
+    An incremental parser that splits text into segments of uniform style.
+
+    Escape sequences split across two calls of `feed` are held back until they are complete.
+
+    Attributes:
+        style (tuple): The current style, as a tuple in the layout of `DEFAULT_STYLE`.
+        max_pending (int): The maximum length of an incomplete escape sequence that is held back.
+        keep_line_edits (bool): Whether the cursor movement and erase-line sequences of `LINE_EDITS` are kept in the
+            text, for a `LineEditor` to apply them.
+    """
+
+    def __init__(self, max_pending=256, keep_line_edits=False):
+        """
+        Initialize the parser with the default style.
+
+        Args:
+            max_pending (int): The maximum length of an incomplete escape sequence that is held back.
+            keep_line_edits (bool): Whether cursor movement and erase-line sequences are kept in the text.
+        """
+        self.style = DEFAULT_STYLE
+        self.max_pending = max_pending
+        self.keep_line_edits = keep_line_edits
+        self._pending = ""
+
+    def feed(self, text):
+        """
+        Parses a chunk of text.
+
+        Args:
+            text (str): The text to be parsed.
+
+        Returns:
+            list: The (text, style) segments of the chunk, without escape sequences.
+        """
+        if self._pending:
+            text = self._pending + text
+            self._pending = ""
+        if "\x1b" not in text:
+            return [(text, self.style)] if text else []
+        incomplete = _INCOMPLETE.search(text, text.rfind("\x1b"))
+        if incomplete and len(text) - incomplete.start() <= self.max_pending:
+            self._pending = text[incomplete.start():]
+            text = text[:incomplete.start()]
+        segments = []
+        position = 0
+        for match in _ESCAPE.finditer(text):
+            if match.start() > position:
+                segments.append((text[position:match.start()], self.style))
+            position = match.end()
+            if match.group(2) == "m":
+                self._select_graphic_rendition(match.group(1))
+            elif self.keep_line_edits and match.group(2) and match.group(2) in LINE_EDITS:
+                segments.append((f"\x1b[{match.group(1) if match.group(1).isdigit() else ''}{match.group(2)}",
+                                 self.style))
+        if position < len(text):
+            segments.append((text[position:], self.style))
+        return segments
+
+    def _select_graphic_rendition(self, parameters):
+        """
+        Applies the parameters of an SGR sequence to the current style.
+
+        Args:
+            parameters (str): The semicolon-separated parameters of the sequence.
+        """
+        codes = [int(code) if code.isdigit() else 0 for code in parameters.replace(":", ";").split(";")]
+        style = list(self.style)
+        index = 0
+        while index < len(codes):
+            code = codes[index]
+            index += 1
+            if code == 0:
+                style = list(DEFAULT_STYLE)
+            elif code in _ATTRIBUTES:
+                position, value = _ATTRIBUTES[code]
+                style[position] = value
+            elif 30 <= code <= 37 or 90 <= code <= 97:
+                style[0] = PALETTE[code - 30 if code < 90 else code - 82]
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                style[1] = PALETTE[code - 40 if code < 100 else code - 92]
+            elif code in (39, 49):
+                style[code == 49] = None
+            elif code in (38, 48) and index < len(codes):
+                if codes[index] == 5 and index + 1 < len(codes):
+                    style[code == 48] = color_256(min(codes[index + 1], 255))
+                    index += 2
+                elif codes[index] == 2 and index + 3 < len(codes):
+                    red, green, blue = (min(value, 255) for value in codes[index + 1:index + 4])
+                    style[code == 48] = f"#{red:02X}{green:02X}{blue:02X}"
+                    index += 4
+        self.style = tuple(style)
+
+
+class TagPool:
+    """
+    A bounded pool of text area tags, one per style.
+
+    When the pool is full, the least recently used tag is deleted, which removes its styling from the text that still
+    carries it.
+
+    Args:
+        console (Console): The console whose text area the tags are created in.
+        max_tags (int): The maximum number of tags in the pool.
+
+    Attributes:
+        console (Console): The console whose text area the tags are created in.
+        max_tags (int): The maximum number of tags in the pool.
+    """
+
+    def __init__(self, console, max_tags=256):
+        """
+        Initialize an empty pool.
+
+        Args:
+            console (Console): The console whose text area the tags are created in.
+            max_tags (int): The maximum number of tags in the pool.
+        """
+        self.console = console
+        self.max_tags = max_tags
+        self._tags = collections.OrderedDict()
+        self._fonts = {}
+        self._counter = 0
+
+    def __len__(self):
+        """Returns the number of tags in the pool."""
+        return len(self._tags)
+
+    def tag(self, style):
+        """
+        Returns the tag of a style, creating it if needed.
+
+        Args:
+            style (tuple): The style, as a tuple in the layout of `DEFAULT_STYLE`.
+
+        Returns:
+            str or None: The name of the tag, or None for the default style.
+        """
+        if style == DEFAULT_STYLE:
+            return None
+        name = self._tags.get(style)
+        if name is not None:
+            self._tags.move_to_end(style)
+            return name
+        if len(self._tags) >= self.max_tags:
+            self.console.text_area.tag_delete(self._tags.popitem(last=False)[1])
+        name = f"ansi{self._counter}"
+        self._counter += 1
+        self.console.text_area.tag_configure(name, **self._options(style))
+        self._tags[style] = name
+        return name
+
+    def _options(self, style):
+        """
+        Returns the tag options of a style.
+
+        Args:
+            style (tuple): The style, as a tuple in the layout of `DEFAULT_STYLE`.
+
+        Returns:
+            dict: The keyword arguments for `tag_configure`.
+        """
+        foreground, background, bold, italic, underline, inverse, strikethrough = style
+        if inverse:
+            foreground, background = background or self.console.background, foreground or self.console.foreground
+        options = {}
+        if foreground:
+            options["foreground"] = foreground
+        if background:
+            options["background"] = background
+        if bold or italic:
+            options["font"] = self._font(bold, italic)
+        if underline:
+            options["underline"] = True
+        if strikethrough:
+            options["overstrike"] = True
+        return options
+
+    def _font(self, bold, italic):
+        """
+        Returns the console's font in the given weight and slant.
+
+        Args:
+            bold (bool): Whether the font is bold.
+            italic (bool): Whether the font is italic.
+
+        Returns:
+            tkFont.Font: The font.
+        """
+        font = self._fonts.get((bold, italic))
+        if font is None:
+            options = self.console.font.actual()
+            options.update(weight="bold" if bold else "normal", slant="italic" if italic else "roman")
+            font = self._fonts[(bold, italic)] = tkFont.Font(**options)
+        return font
@@ -0,0 +1,411 @@
+"""
+TkConsole Channels
+
+This module provides a console whose output is split into named channels shown as tabs. Every channel keeps its
+scrollback in its own line store, and a single console in virtual mode renders the selected channel: selecting
+another tab swaps the backing store of that console and renders the visible lines of the new store. Output to the
+other channels is only appended to their stores, and the unread counts on their tabs are updated at most once per
+`tab_interval`.
+
+Classes:
+    Channel: The scrollback and unread count of one channel.
+    ChannelConsole: A console whose output is split into named channels shown as tabs.
+"""
+
+import bisect
+import collections
+import itertools
+import operator
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from .ansi import AnsiParser
+from .core import Console
+from .lines import LineEditor
+from .queues import OutputQueue, BLOCK
+from .search import SearchIndex
+from .store import LineStore
+
+
+class Channel:
+    """
+    The scrollback and unread count of one channel.
+
+    Args:
+        name (str): The name of the channel.
+        tab (tk.Frame): The empty frame standing for the channel in the notebook.
+        ansi (bool): Whether ANSI escape sequences are parsed.
+        searchable (bool): Whether the output is indexed for searching.
+        timestamps (bool): Whether the start times of the lines are kept.
+        rewrite_lines (bool): Whether carriage returns and erase-line sequences rewrite the last line.
+
+    Attributes:
+        name (str): The name of the channel.
+        tab (tk.Frame): The empty frame standing for the channel in the notebook.
+        store (LineStore): The scrollback of the channel.
+        ansi_parser (AnsiParser or None): The parser of ANSI escape sequences in the output, if `ansi` is enabled.
+        search_index (SearchIndex or None): The index of the output for searching, if `searchable` is enabled.
+        line_times (collections.deque or None): The start times of the lines, if `timestamps` is enabled.
+        line_editor (LineEditor or None): The editor of the last line, if `rewrite_lines` is enabled.
+        trimmed_lines (int): The total number of lines trimmed from the scrollback.
+        selection (tuple or None): The selected range as (line, column) pairs of `store` when the channel was last
+            shown.
+        unread (int): The number of lines written while the channel was not selected.
+    """
+
+    def __init__(self, name, tab, ansi=False, searchable=False, timestamps=False, rewrite_lines=False):
+        """
+        Initialize an empty channel.
+
+        Args:
+            name (str): The name of the channel.
+            tab (tk.Frame): The empty frame standing for the channel in the notebook.
+            ansi (bool): Whether ANSI escape sequences are parsed.
+            searchable (bool): Whether the output is indexed for searching.
+            timestamps (bool): Whether the start times of the lines are kept.
+            rewrite_lines (bool): Whether carriage returns and erase-line sequences rewrite the last line.
+        """
+        self.name = name
+        self.tab = tab
+        self.store = LineStore()
+        self.ansi_parser = AnsiParser(keep_line_edits=rewrite_lines) if ansi else None
+        self.search_index = SearchIndex() if searchable else None
+        self.line_times = collections.deque([time.time()]) if timestamps else None
+        self.line_editor = LineEditor() if rewrite_lines else None
+        self.trimmed_lines = 0
+        self.selection = None
+        self.unread = 0
+
+
+class ChannelConsole(tk.Frame):
+    """
+    A console whose output is split into named channels shown as tabs.
+
+    Writing to a channel that does not exist yet adds it. The selected channel is shown by `console`, which also
+    takes input; tabs cannot be switched while an input is pending.
+
+    Args:
+        parent_ (tk.Tk): The parent Tkinter window.
+        **kwargs: Keyword arguments for configuring the channels, and for `console`, which is always in virtual mode.
+
+    Attributes:
+        console (Console): The console showing the selected channel.
+        notebook (ttk.Notebook): The tabs of the channels.
+        channels (dict): The channels by name, in the order of their tabs.
+        current (Channel or None): The selected channel.
+        tab_interval (int): The delay in milliseconds between updates of the unread counts on the tabs.
+        output_queue (OutputQueue): The bounded queue through which other threads hand output to the channels.
+        drain_interval (int): The delay in milliseconds between drains of the output queue.
+        drain_batch (int): The maximum number of queued writes drained per tick.
+    """
+
+    def __init__(self, parent_, **kwargs):
+        """
+        Initialize the tabs and the console, and add the initial channels.
+
+        Args:
+            parent_ (tk.Tk): The parent Tkinter window.
+            **kwargs: Keyword arguments for configuring the channels and the console.
+
+        Attributes:
+            console (Console): The console showing the selected channel.
+            notebook (ttk.Notebook): The tabs of the channels.
+            channels (dict): The channels by name, in the order of their tabs.
+            current (Channel or None): The selected channel.
+            tab_interval (int): The delay in milliseconds between updates of the unread counts on the tabs.
+            output_queue (OutputQueue): The bounded queue through which other threads hand output to the channels.
+            drain_interval (int): The delay in milliseconds between drains of the output queue.
+            drain_batch (int): The maximum number of queued writes drained per tick.
+        """
+        tk.Frame.__init__(self, parent_)
+        self.parent = parent_
+        self.tab_interval = kwargs.get("tab_interval", 100)
+        self.output_queue = OutputQueue(kwargs.get("queue_size", 10000), kwargs.get("backpressure", BLOCK))
+        self.drain_interval = kwargs.get("drain_interval", 16)
+        self.drain_batch = kwargs.get("drain_batch", 1000)
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(side=tk.TOP, fill="x")
+        body = tk.Frame(self)
+        body.pack(expand=True, fill="both")
+        options = dict(kwargs, virtual=True, threadsafe=False)
+        self.console = Console(body, **options)
+        self.channels = {}
+        self.current = None
+        self._tabs = {}
+        self._unread_tabs = set()
+        self._tab_job = None
+        self._drain_job = None
+        self._tk_thread_id = threading.get_ident()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        for name in kwargs.get("channels", ("main",)):
+            self.add_channel(name)
+        if kwargs.get("threadsafe", False):
+            self._drain_job = self.after(self.drain_interval, self._drain_loop)
+
+    def add_channel(self, name):
+        """
+        Adds a channel with its tab, and selects it if it is the first one.
+
+        Args:
+            name (str): The name of the channel.
+
+        Returns:
+            Channel: The new channel, or the existing one of that name.
+        """
+        if name in self.channels:
+            return self.channels[name]
+        tab = tk.Frame(self.notebook, height=0)
+        self.notebook.add(tab, text=name)
+        console = self.console
+        channel = Channel(name, tab, console.ansi_parser is not None, console.search_index is not None,
+                          console.line_times is not None, console.line_editor is not None)
+        self.channels[name] = channel
+        self._tabs[str(tab)] = channel
+        if self.current is None:
+            self.select(name)
+        return channel
+
+    def remove_channel(self, name):
+        """
+        Removes a channel with its tab and scrollback, selecting the first remaining channel if it was selected.
+
+        Args:
+            name (str): The name of the channel.
+
+        Raises:
+            ValueError: If the channel is the only one.
+        """
+        channel = self.channels[name]
+        if len(self.channels) == 1:
+            raise ValueError("The only channel cannot be removed")
+        if channel is self.current:
+            self.select(next(other for other in self.channels if other != name))
+        self._unread_tabs.discard(channel)
+        del self._tabs[str(channel.tab)]
+        del self.channels[name]
+        self.notebook.forget(channel.tab)
+        channel.tab.destroy()
+
+    def select(self, name):
+        """
+        Shows a channel, rendering the visible lines of its scrollback at its end.
+
+        Args:
+            name (str): The name of the channel.
+
+        Raises:
+            RuntimeError: If an input is pending.
+        """
+        channel = self.channels[name]
+        if channel is self.current:
+            return
+        console = self.console
+        if console.entry is not None:
+            raise RuntimeError("Channels cannot be switched while an input is pending")
+        console.flush()
+        if console.helpers.search_matches:
+            console.clear_search()
+        if self.current is not None:
+            console._save_virtual_selection()
+            self.current.selection = console.helpers.virtual_selection
+            self.current.trimmed_lines = console.helpers.trimmed_lines
+        self.current = channel
+        self._swap_in(channel)
+        channel.unread = 0
+        self._unread_tabs.discard(channel)
+        self.notebook.tab(channel.tab, text=channel.name)
+        if str(self.notebook.select()) != str(channel.tab):
+            self.notebook.select(channel.tab)
+
+    def _swap_in(self, channel):
+        """
+        Makes the console show a channel: swaps in its store, parser, editor, index and times, derives the line and byte
+        counts from its store and renders its end.
+
+        Args:
+            channel (Channel): The channel to be shown.
+        """
+        console = self.console
+        helpers = console.helpers
+        store = channel.store
+        console.store = store
+        console.ansi_parser = channel.ansi_parser
+        console.search_index = channel.search_index
+        console.line_times = channel.line_times
+        console.line_editor = channel.line_editor
+        helpers.line_count = len(store)
+        helpers.byte_count = store.byte_count
+        helpers.trimmed_lines = channel.trimmed_lines
+        helpers.line_sizes = collections.deque()
+        helpers.partial_line_size = 0
+        if console.max_lines or console.max_bytes:
+            starts = store.starts[store.first:]
+            helpers.line_sizes.extend(map(operator.sub, starts[1:], starts[:-1]))
+            helpers.partial_line_size = len(store.data) - starts[-1]
+        helpers.virtual_selection = channel.selection
+        helpers.window_start, helpers.window_stop = 0, 0
+        console.text_area.tag_remove(tk.SEL, "1.0", tk.END)
+        console._render_window(len(store))
+        console.text_area.see(tk.END)
+
+    def _on_tab_changed(self, event):
+        """Shows the channel of the selected tab, or goes back to the shown one while an input is pending."""
+        channel = self._tabs.get(str(self.notebook.select()))
+        if channel is None or channel is self.current:
+            return
+        if self.console.entry is not None:
+            self.notebook.select(self.current.tab)
+            return
+        self.select(channel.name)
+
+    def write(self, name, output, tag=None):
+        """
+        Writes the given output text to a channel.
+
+        Args:
+            name (str): The name of the channel.
+            output (str): The text to be written.
+            tag (str, optional): The text area tag used to style the text, such as "stderr", while it is rendered.
+        """
+        self._write_segments(name, [(output, tag)])
+
+    def print(self, name, *args, **kwargs):
+        """
+        Prints the provided text to a channel.
+
+        Args:
+            name (str): The name of the channel.
+            *args: Variable number of arguments to be concatenated and printed.
+            **kwargs: Optional keyword arguments for controlling the print behavior.
+        """
+        text = "".join(map(str, args))
+        end = kwargs.get("end", "\n")
+        self.write(name, text + end, kwargs.get("tag"))
+
+    def _write_segments(self, name, segments):
+        """
+        Writes (text, tag) output segments to a channel: to the console if it is selected, or to its store.
+
+        Args:
+            name (str): The name of the channel.
+            segments (list): The (text, tag) pairs to be written.
+        """
+        channel = self.channels.get(name) or self.add_channel(name)
+        if channel is self.current:
+            self.console._write_segments(segments)
+            return
+        output = "".join(text for text, _ in segments)
+        if channel.ansi_parser is not None:
+            output = "".join(text for text, _ in channel.ansi_parser.feed(output))
+        if channel.line_editor is not None:
+            replaced, segments = channel.line_editor.feed([(output, None)])
+            if replaced is not None:
+                channel.store.clear_last_line()
+                if channel.search_index is not None:
+                    channel.search_index.clear_last_line()
+                output = "".join(text for text, _ in segments)
+        if not output:
+            return
+        channel.store.append(output)
+        newlines = output.count("\n")
+        if channel.search_index is not None:
+            channel.search_index.append(output)
+        if channel.line_times is not None and newlines:
+            channel.line_times.extend([time.time()] * newlines)
+        self._trim_channel(channel)
+        if newlines:
+            channel.unread += newlines
+            self._unread_tabs.add(channel)
+            if self._tab_job is None:
+                self._tab_job = self.after(self.tab_interval, self._update_tabs)
+
+    def _trim_channel(self, channel):
+        """Removes the oldest lines of a channel that is not shown once it exceeds the console's limits."""
+        console = self.console
+        store = channel.store
+        count = 0
+        if console.max_lines and len(store) > int(console.max_lines * (1 + console.trim_slack)):
+            count = len(store) - console.max_lines
+        if console.max_bytes and store.byte_count > int(console.max_bytes * (1 + console.trim_slack)):
+            target = store.starts[store.first] + store.byte_count - console.max_bytes
+            count = max(count, bisect.bisect_left(store.starts, target, store.first) - store.first)
+        count = min(count, len(store) - 1)
+        if not count:
+            return
+        store.trim(count)
+        channel.trimmed_lines += count
+        if channel.search_index is not None:
+            channel.search_index.trim(count)
+        if channel.line_times is not None:
+            for _ in range(count):
+                channel.line_times.popleft()
+        channel.selection = None
+
+    def _update_tabs(self):
+        """Shows the unread counts on the tabs of the channels written since the last update."""
+        self._tab_job = None
+        for channel in self._unread_tabs:
+            self.notebook.tab(channel.tab, text=f"{channel.name} ({channel.unread})")
+        self._unread_tabs.clear()
+
+    def write_threadsafe(self, name, output, timeout=None, tag=None):
+        """
+        Writes the given output text to a channel from any thread.
+
+        Calls from other threads only push the text into `output_queue`; the channel console must have been created
+        with `threadsafe=True`.
+
+        Args:
+            name (str): The name of the channel.
+            output (str): The text to be written.
+            timeout (float, optional): The maximum number of seconds to wait for room under the "block" policy.
+            tag (str, optional): The text area tag used to style the text, such as "stderr".
+
+        Returns:
+            bool: True if the text was written or queued, False if it was dropped.
+        """
+        if threading.get_ident() == self._tk_thread_id:
+            self.drain_output()
+            self.write(name, output, tag)
+            return True
+        if self._drain_job is None:
+            raise RuntimeError("ChannelConsole must be created with threadsafe=True to be written from other threads")
+        return self.output_queue.put((name, output, tag), timeout)
+
+    def print_threadsafe(self, name, *args, **kwargs):
+        """
+        Prints the provided text to a channel from any thread.
+
+        Args:
+            name (str): The name of the channel.
+            *args: Variable number of arguments to be concatenated and printed.
+            **kwargs: Optional keyword arguments for controlling the print behavior.
+
+        Returns:
+            bool: True if the text was written or queued, False if it was dropped.
+        """
+        text = "".join(map(str, args))
+        end = kwargs.get("end", "\n")
+        return self.write_threadsafe(name, text + end, kwargs.get("timeout"), kwargs.get("tag"))
+
+    def drain_output(self, max_items=None):
+        """
+        Writes queued output from other threads to the channels, one write per run of the same channel. Must be
+        called from the Tkinter thread.
+
+        Args:
+            max_items (int, optional): The maximum number of queued writes to take. All are taken if omitted.
+
+        Returns:
+            int: The number of queued writes taken.
+        """
+        items = self.output_queue.drain(max_items)
+        for name, group in itertools.groupby(items, operator.itemgetter(0)):
+            self._write_segments(name, [(output, tag) for _, output, tag in group])
+        return len(items)
+
+    def _drain_loop(self):
+        """Drains the output queue once and schedules the next drain, sooner if the queue is still backed up."""
+        count = self.drain_output(self.drain_batch)
+        self._drain_job = self.after(1 if count == self.drain_batch else self.drain_interval, self._drain_loop)
@@ -0,0 +1,504 @@
+"""
+TkConsole Completion
+
+This module provides tab completion for the entry field of a console. Completers are plugins that complete the token
+before the text cursor: static vocabularies are served from a prebuilt trie, and completers marked as threaded, such as
+the file path completer, run on a worker thread so that the entry field stays responsive. A request supersedes the
+previous one, whose pending work is cancelled and whose late results are discarded.
+
+Classes:
+    Trie: A prefix tree of words.
+    Completer: The base class of completers.
+    WordCompleter: A completer of words from a static vocabulary.
+    PathCompleter: A completer of file system paths, run on a worker thread.
+    AttributeCompleter: A completer of names and attributes in a namespace.
+    CompletionEngine: Runs the completers of a console and collects their candidates.
+    CompletionPopup: A paged popup listing completion candidates.
+"""
+
+import builtins
+import concurrent.futures
+import keyword
+import os
+import queue
+import tkinter as tk
+
+_END = ""
+
+
+class Trie:
+    """
+    A prefix tree of words.
+
+    Args:
+        words (iterable): The words the trie is built from.
+    """
+
+    def __init__(self, words=()):
+        """
+        Initialize the trie with a vocabulary.
+
+        Args:
+            words (iterable): The words the trie is built from.
+        """
+        self._root = {}
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        """Returns the number of words in the trie."""
+        return self._size
+
+    def __contains__(self, word):
+        """Returns whether a word is in the trie."""
+        node = self._node(word)
+        return node is not None and _END in node
+
+    def _node(self, prefix):
+        """Returns the node of a prefix, or None if no word starts with it."""
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+
+    def add(self, word):
+        """
+        Adds a word to the trie.
+
+        Args:
+            word (str): The word to be added.
+        """
+        node = self._root
+        for char in word:
+            node = node.setdefault(char, {})
+        if _END not in node:
+            node[_END] = True
+            self._size += 1
+
+    def complete(self, prefix, limit=None):
+        """
+        Returns the words that start with a prefix.
+
+        Args:
+            prefix (str): The prefix.
+            limit (int, optional): The maximum number of words returned.
+
+        Returns:
+            list: The words in lexicographic order.
+        """
+        node = self._node(prefix)
+        words = []
+        stack = [(prefix, node)] if node is not None else []
+        while stack and (limit is None or len(words) < limit):
+            word, node = stack.pop()
+            if _END in node:
+                words.append(word)
+            stack.extend((word + char, node[char]) for char in sorted(node, reverse=True) if char != _END)
+        return words
+
+
+class Completer:
+    """
+    The base class of completers.
+
+    A completer completes the token that ends at the text cursor: `start` finds where the token begins, and `complete`
+    returns the candidates that replace it. Subclasses override `complete`, and set `threaded` if it is slow enough to
+    be run on a worker thread, in which case it must not use Tkinter.
+
+    Attributes:
+        delimiters (str): The characters that separate tokens.
+        threaded (bool): Whether `complete` is run on a worker thread.
+    """
+
+    delimiters = " \t"
+    threaded = False
+
+    def start(self, text):
+        """
+        Returns where the token to be completed begins.
+
+        Args:
+            text (str): The text of the entry field before the text cursor.
+
+        Returns:
+            int: The index of the first character of the token.
+        """
+        return max(text.rfind(delimiter) for delimiter in self.delimiters) + 1
+
+    def complete(self, token):
+        """
+        Returns the completions of a token.
+
+        Args:
+            token (str): The token to be completed.
+
+        Returns:
+            list: The candidates that replace the token.
+        """
+        raise NotImplementedError
+
+
+class WordCompleter(Completer):
+    """
+    A completer of words from a static vocabulary, served from a prebuilt trie.
+
+    Args:
+        words (iterable): The vocabulary.
+        max_candidates (int): The maximum number of candidates returned.
+
+    Attributes:
+        trie (Trie): The trie of the vocabulary.
+        max_candidates (int): The maximum number of candidates returned.
+    """
+
+    def __init__(self, words, max_candidates=10000):
+        """
+        Initialize the completer and build the trie of its vocabulary.
+
+        Args:
+            words (iterable): The vocabulary.
+            max_candidates (int): The maximum number of candidates returned.
+        """
+        self.trie = Trie(words)
+        self.max_candidates = max_candidates
+
+    def complete(self, token):
+        """Returns the words of the vocabulary that start with the token."""
+        return self.trie.complete(token, self.max_candidates)
+
+
+class PathCompleter(Completer):
+    """
+    A completer of file system paths, run on a worker thread. Directories are completed with a trailing separator,
+    and hidden entries are only completed once the token starts with a dot.
+    """
+
+    threaded = True
+
+    def complete(self, token):
+        """Returns the paths that start with the token."""
+        directory, name = os.path.split(token)
+        try:
+            with os.scandir(os.path.expanduser(directory) or os.curdir) as entries:
+                found = [
+                    os.path.join(directory, entry.name) + (os.sep if entry.is_dir() else "")
+                    for entry in entries
+                    if entry.name.startswith(name) and (name.startswith(".") or not entry.name.startswith("."))
+                ]
+        except OSError:
+            return []
+        return sorted(found)
+
+
+class AttributeCompleter(Completer):
+    """
+    A completer of names and attributes in a namespace, such as "os.pa" to "os.path".
+
+    Only names are looked up; no expression is evaluated. Private names are only completed once the token's last
+    part starts with an underscore.
+
+    Args:
+        namespace (dict): The namespace names are looked up in, after which builtins and keywords are completed.
+
+    Attributes:
+        namespace (dict): The namespace names are looked up in.
+    """
+
+    delimiters = " \t()[]{},:;=+-*/%<>!&|^~@'\""
+
+    def __init__(self, namespace):
+        """
+        Initialize the completer with its namespace.
+
+        Args:
+            namespace (dict): The namespace names are looked up in.
+        """
+        self.namespace = namespace
+
+    def complete(self, token):
+        """Returns the names or attributes that start with the token."""
+        if "." not in token:
+            names = set(self.namespace) | set(dir(builtins)) | set(keyword.kwlist)
+            return sorted(name for name in names if name.startswith(token) and self._visible(name, token))
+        path, attribute = token.rsplit(".", 1)
+        parts = path.split(".")
+        if parts[0] in self.namespace:
+            value = self.namespace[parts[0]]
+        elif hasattr(builtins, parts[0]):
+            value = getattr(builtins, parts[0])
+        else:
+            return []
+        for part in parts[1:]:
+            try:
+                value = getattr(value, part)
+            except Exception:
+                return []
+        return [f"{path}.{name}" for name in sorted(dir(value))
+                if name.startswith(attribute) and self._visible(name, attribute)]
+
+    @staticmethod
+    def _visible(name, prefix):
+        """Returns whether a name is completed for a prefix."""
+        return prefix.startswith("_") or not name.startswith("_")
+
+
+class CompletionEngine:
+    """
+    Runs the completers of a console and collects their candidates.
+
+    Threaded completers run on a worker thread and hand their results back through a queue that is polled from the
+    Tkinter thread while a request is pending.
+
+    Args:
+        console (Console): The console whose entry field is completed.
+        completers (list): The completers.
+        max_workers (int): The number of worker threads of the threaded completers.
+        poll_interval (int): The delay in milliseconds between checks on the threaded completers.
+
+    Attributes:
+        console (Console): The console whose entry field is completed.
+        completers (list): The completers.
+        poll_interval (int): The delay in milliseconds between checks on the threaded completers.
+        generation (int): A counter incremented by every request and cancellation.
+    """
+
+    def __init__(self, console, completers, max_workers=1, poll_interval=16):
+        """
+        Initialize the engine with its completers; the worker threads are started on the first threaded request.
+
+        Args:
+            console (Console): The console whose entry field is completed.
+            completers (list): The completers.
+            max_workers (int): The number of worker threads of the threaded completers.
+            poll_interval (int): The delay in milliseconds between checks on the threaded completers.
+        """
+        self.console = console
+        self.completers = list(completers)
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self._executor = None
+        self._futures = []
+        self._done = queue.SimpleQueue()
+        self._results = []
+        self._pending = 0
+        self._callback = None
+        self._poll_job = None
+
+    def request(self, text, callback):
+        """
+        Completes the token before the text cursor, cancelling the previous request.
+
+        Args:
+            text (str): The text of the entry field before the text cursor.
+            callback (callable): A function called with the list of (start, candidate) completions once all
+                completers have finished.
+        """
+        self.cancel()
+        generation = self.generation
+        for completer in self.completers:
+            start = completer.start(text)
+            if not completer.threaded:
+                self._results.extend((start, candidate) for candidate in completer.complete(text[start:]))
+                continue
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(self.max_workers)
+            future = self._executor.submit(completer.complete, text[start:])
+            future.add_done_callback(lambda future_, start_=start: self._done.put((generation, start_, future_)))
+            self._futures.append(future)
+            self._pending += 1
+        self._callback = callback
+        if self._pending:
+            self._poll_job = self.console.after(self.poll_interval, self._poll)
+        else:
+            self._finish()
+
+    def cancel(self):
+        """Cancels the pending request; the results of work already running are discarded."""
+        for future in self._futures:
+            future.cancel()
+        if self._poll_job is not None:
+            self.console.after_cancel(self._poll_job)
+            self._poll_job = None
+        self.generation += 1
+        self._futures = []
+        self._results = []
+        self._pending = 0
+        self._callback = None
+
+    def _poll(self):
+        """Collects the results of the threaded completers of the current request."""
+        self._poll_job = None
+        while True:
+            try:
+                generation, start, future = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation or future.cancelled():
+                continue
+            self._pending -= 1
+            if future.exception() is None:
+                self._results.extend((start, candidate) for candidate in future.result())
+        if self._pending:
+            self._poll_job = self.console.after(self.poll_interval, self._poll)
+        else:
+            self._finish()
+
+    def _finish(self):
+        """Hands the collected completions of the current request to its callback."""
+        results, callback = list(dict.fromkeys(self._results)), self._callback
+        self._futures = []
+        self._results = []
+        self._callback = None
+        if callback is not None:
+            callback(results)
+
+    def close(self):
+        """Cancels the pending request and stops the worker threads."""
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class CompletionPopup:
+    """
+    A paged popup listing completion candidates below the entry field of a console.
+
+    Only the candidates of the current page are put into the list box, so that long candidate lists are shown as
+    quickly as short ones. 'Up' and 'Down' move the selection across pages, 'Prior' and 'Next' turn the page, 'Return'
+    or 'Tab' accept the selected candidate and 'Escape' closes the popup; any other key closes it and is typed into
+    the entry field.
+
+    Args:
+        console (Console): The console whose entry field is completed.
+        completions (list): The (start, candidate) completions.
+        on_select (callable): A function called with the start and the candidate of the accepted completion.
+        page_size (int): The number of candidates per page.
+
+    Attributes:
+        console (Console): The console whose entry field is completed.
+        completions (list): The (start, candidate) completions.
+        page_size (int): The number of candidates per page.
+        page (int): The current page.
+        window (tk.Toplevel): The window of the popup.
+        listbox (tk.Listbox): The list of the candidates of the current page.
+        label (tk.Label): The footer showing the range of the current page.
+    """
+
+    def __init__(self, console, completions, on_select, page_size=20):
+        """
+        Initialize and show the popup.
+
+        Args:
+            console (Console): The console whose entry field is completed.
+            completions (list): The (start, candidate) completions.
+            on_select (callable): A function called with the start and the candidate of the accepted completion.
+            page_size (int): The number of candidates per page.
+        """
+        self.console = console
+        self.completions = completions
+        self.on_select = on_select
+        self.page_size = page_size
+        self.page = 0
+        entry = console.entry
+        self.window = tk.Toplevel(console.parent)
+        self.window.overrideredirect(True)
+        self.window.geometry(f"+{entry.winfo_rootx()}+{entry.winfo_rooty() + entry.winfo_height()}")
+        self.listbox = tk.Listbox(self.window, font=console.font, background=console.background,
+                                  foreground=console.foreground, height=min(page_size, len(completions)),
+                                  activestyle="none", borderwidth=0, highlightthickness=0, exportselection=False)
+        self.listbox.pack(fill="both", expand=True)
+        self.label = tk.Label(self.window, font=console.font, background=console.background,
+                              foreground=console.foreground, anchor="w")
+        self.label.pack(fill="x")
+        self.listbox.bind("<Up>", lambda event: self.move(-1))
+        self.listbox.bind("<Down>", lambda event: self.move(1))
+        self.listbox.bind("<Prior>", lambda event: self.show_page(self.page - 1))
+        self.listbox.bind("<Next>", lambda event: self.show_page(self.page + 1))
+        self.listbox.bind("<Return>", self.accept)
+        self.listbox.bind("<KP_Enter>", self.accept)
+        self.listbox.bind("<Tab>", self.accept)
+        self.listbox.bind("<Double-Button-1>", self.accept)
+        self.listbox.bind("<Escape>", lambda event: self.close())
+        self.listbox.bind("<Key>", self._forward_key)
+        self.show_page(0)
+        self.listbox.focus_set()
+
+    @property
+    def pages(self):
+        """int: The number of pages."""
+        return (len(self.completions) + self.page_size - 1) // self.page_size
+
+    def show_page(self, page, selection=0):
+        """
+        Shows a page of candidates.
+
+        Args:
+            page (int): The page to be shown; pages out of range are ignored.
+            selection (int): The position of the selected candidate on the page.
+        """
+        if not 0 <= page < self.pages:
+            return "break"
+        self.page = page
+        first = page * self.page_size
+        candidates = [candidate for _, candidate in self.completions[first:first + self.page_size]]
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *candidates)
+        self.select(min(selection, len(candidates) - 1) if selection >= 0 else len(candidates) - 1)
+        self.label.configure(text=f"{first + 1}-{first + len(candidates)} of {len(self.completions)}")
+        return "break"
+
+    def select(self, position):
+        """
+        Selects a candidate of the current page.
+
+        Args:
+            position (int): The position of the candidate on the page.
+        """
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(position)
+        self.listbox.activate(position)
+        self.listbox.see(position)
+
+    def move(self, step):
+        """
+        Moves the selection, turning the page at its first and last candidate.
+
+        Args:
+            step (int): 1 to move down, -1 to move up.
+        """
+        position = self.listbox.index(tk.ACTIVE) + step
+        if position < 0:
+            return self.show_page(self.page - 1, -1)
+        if position >= self.listbox.size():
+            return self.show_page(self.page + 1, 0)
+        self.select(position)
+        return "break"
+
+    def accept(self, event=None):
+        """Accepts the selected candidate and closes the popup."""
+        start, candidate = self.completions[self.page * self.page_size + self.listbox.index(tk.ACTIVE)]
+        self.close()
+        self.on_select(start, candidate)
+        return "break"
+
+    def _forward_key(self, event):
+        """Closes the popup and types a printable key into the entry field."""
+        if event.keysym in ("Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R"):
+            return "break"
+        self.close()
+        if event.char and event.char.isprintable() and self.console.entry is not None:
+            self.console.entry.insert(tk.INSERT, event.char)
+        return "break"
+
+    def close(self):
+        """Closes the popup and gives the focus back to the entry field."""
+        if self.console.completion_popup is self:
+            self.console.completion_popup = None
+        self.window.destroy()
+        if self.console.entry is not None:
+            self.console.entry.focus_set()
@@ -9,11 +9,33 @@ Classes:
     Console: A class representing the custom console widget.
 """
 
-from typing import Union
+from typing import Callable, Union
+import asyncio
+import bisect
+import collections
+import concurrent.futures
 import dataclasses
+import os
+import re
+import threading
+import time
 import tkinter as tk
 import tkinter.font as tkFont
-from tkinter import scrolledtext
+from tkinter import filedialog, scrolledtext
+from .ansi import AnsiParser, TagPool
+from .completion import CompletionEngine, CompletionPopup
+from .export import ConsoleExport
+from .highlight import Highlighter
+from .history import InputHistory
+from .lines import LineEditor, ProgressBar
+from .process import ConsoleProcess
+from .queues import OutputQueue, BLOCK
+from .record import SessionRecorder, SessionReplay
+from .repl import ConsoleRepl
+from .search import SearchIndex
+from .server import ConsoleServer
+from .stats import ConsoleStats, TkCallProxy
+from .store import LineStore
 
 
 class Console(tk.Frame):
@@ -28,6 +50,41 @@ class Console(tk.Frame):
         font (tkFont.Font): The font used for the console's text.
         background (str): The background color of the console.
         foreground (str): The foreground color (text color) of the console.
+        error_foreground (str): The foreground color of text written with the "stderr" tag.
+        buffered (bool): Whether output is collected in memory and flushed once per frame.
+        flush_interval (int): The delay in milliseconds between buffered flushes (0 flushes when idle).
+        max_batch_size (int): The number of pending characters that forces an immediate flush.
+        output_queue (OutputQueue): The bounded queue through which other threads hand output to the console.
+        drain_interval (int): The delay in milliseconds between drains of the output queue.
+        drain_batch (int): The maximum number of queued writes drained per tick.
+        max_lines (int or None): The maximum number of lines kept in the scrollback.
+        max_bytes (int or None): The maximum number of bytes kept in the scrollback.
+        trim_slack (float): The fraction by which the scrollback may exceed its limit before it is trimmed.
+        virtual (bool): Whether the scrollback is kept in `store` and only the visible lines are rendered.
+        virtual_margin (int): The number of lines rendered above and below the visible lines in virtual mode.
+        store (LineStore or None): The backing store of the scrollback in virtual mode.
+        line_editor (LineEditor or None): The editor of the last line, if `rewrite_lines` is enabled.
+        ansi_parser (AnsiParser or None): The parser of ANSI escape sequences in the output, if `ansi` is enabled.
+        ansi_tags (TagPool or None): The pool of text area tags for the ANSI styles, if `ansi` is enabled.
+        highlighter (Highlighter or None): The patterns highlighted in new output, if `highlight_rules` is given.
+        search_index (SearchIndex or None): The index of the output for searching, if `searchable` is enabled.
+        search_bar (tk.Entry or None): The entry field of the search bar while it is shown.
+        resize_delay (int): The time in milliseconds a resize has to settle before the layout is adjusted.
+        history (InputHistory or None): The input history navigated from the entry field, if `history` is enabled.
+        completion (CompletionEngine or None): The engine running the tab completers, if `completers` are given.
+        completion_page_size (int): The number of candidates per page of the completion popup.
+        completion_popup (CompletionPopup or None): The popup listing completion candidates while it is shown.
+        line_times (collections.deque or None): The start times of the scrollback's lines, if `timestamps` is enabled.
+        instruments (ConsoleStats or None): The counters and timers of the hot paths, if `instrument` is enabled.
+        recorder (SessionRecorder or None): The recording of the output and inputs, while `record` is active.
+        max_render_rate (int or None): The maximum number of output lines rendered per second, if limited.
+        pause_scrolled (bool): Whether output is held back while the view is scrolled away from the end.
+        pause_limit (int): The maximum number of lines held back while the view is scrolled away from the end.
+        suppress_interval (int): The delay in milliseconds before the summary of suppressed lines is written.
+        reuse_entry (bool): Whether one entry field is kept and moved to the insertion point for every input.
+        input_queue (collections.deque): The inputs taken before the entry field is shown, pushed ahead of time
+            with `push_input` or `input_script`, or typed ahead if `type_ahead` is enabled.
+        type_ahead (bool): Whether lines typed while no input is pending are queued for the next inputs.
         text_area (scrolledtext.ScrolledText): The text area of the console for displaying output.
         entry (tk.Entry): The entry field for user input.
         edit_menu (tk.Menu): The context menu for copy/paste actions.
@@ -45,12 +102,94 @@ class Console(tk.Frame):
             text_cursor_position (int or None): The position of the text cursor in the entry field.
             yview (float or None): The vertical scroll position of the text area.
             index (float or None): The current line index of the text cursor in the text area.
+            pending_output (list): (text, tag) output segments waiting to be flushed in buffered mode.
+            pending_size (int): The total length of the pending output chunks.
+            flush_job (str or None): The identifier of the scheduled flush callback.
+            drain_job (str or None): The identifier of the scheduled output queue drain callback.
+            tk_thread_id (int or None): The identifier of the thread running Tkinter.
+            line_count (int): The number of lines in the text area.
+            byte_count (int): The number of UTF-8 encoded bytes written to the text area.
+            line_sizes (collections.deque): The byte sizes of the complete lines, kept when scrollback is bounded.
+            partial_line_size (int): The byte size of the last, unterminated line.
+            window_start (int): The first line of `store` rendered in the text area in virtual mode.
+            window_stop (int): The line of `store` after the last one rendered in the text area in virtual mode.
+            virtual_selection (tuple or None): The selected range as (line, column) pairs of `store` in virtual mode.
+            render_job (str or None): The identifier of the scheduled re-render callback in virtual mode.
+            input_future (concurrent.futures.Future or None): The future resolved with the pending input.
+            input_callback (callable or None): The function called with the pending input once it is entered.
+            search_matches (tuple or None): The global start and end offsets of the matches of the current search.
+            search_current (int): The position of the current match in `search_matches`.
+            highlight_job (str or None): The identifier of the scheduled highlighting of the visible matches.
+            search_job (str or None): The identifier of the scheduled search of the search bar's query.
+            font_metrics (tuple or None): The font name, the width of "0" and the line height the metrics were measured
+                for.
+            text_size (tuple or None): The last configured width and height of the text area.
+            settled_size (tuple or None): The width and height of the text area the layout was last adjusted for.
+            resize_job (str or None): The identifier of the scheduled layout adjustment after a resize.
+            history_typed (str or None): The text typed into the entry field before navigating the history.
+            history_text (str or None): The history entry last shown in the entry field.
+            history_matches (list or None): The history entries starting with `history_typed`, most recent first.
+            history_position (int): The position of the shown entry in `history_matches`, or -1 for the typed text.
+            history_search (tuple or None): The query of the reverse search and the position of the shown match.
+            trimmed_lines (int): The total number of lines trimmed from the scrollback.
+            render_tokens (float): The number of lines that may still be rendered under `max_render_rate`.
+            render_time (float): The `time.monotonic` time `render_tokens` was last updated.
+            suppressed_lines (int): The number of lines suppressed since the last summary.
+            summary_job (str or None): The identifier of the scheduled summary of suppressed lines.
+            catch_up_job (str or None): The identifier of the scheduled rendering of the end of the store in virtual
+                mode, after output was not rendered under `max_render_rate`.
+            paused_output (list): (text, tag) output segments held back while the view is scrolled away from the end.
+            paused_lines (int): The number of lines in `paused_output`.
+            resume_job (str or None): The identifier of the scheduled insertion of `paused_output`.
+            pooled_entry (tk.Entry or None): The entry field kept for reuse, if `reuse_entry` is enabled.
+            entry_closed (tk.BooleanVar or None): The variable set whenever the kept entry field is closed.
+            typed_ahead (str): The text typed while no input is pending, after the last queued line.
         """
         user_input_var: Union[tk.StringVar, None] = None
         entry_x: Union[int, None] = None
         text_cursor_position: Union[int, None] = None
         yview: Union[float, None] = None
         index: Union[float, None] = None
+        pending_output: list = dataclasses.field(default_factory=list)
+        pending_size: int = 0
+        flush_job: Union[str, None] = None
+        drain_job: Union[str, None] = None
+        tk_thread_id: Union[int, None] = None
+        line_count: int = 1
+        byte_count: int = 0
+        line_sizes: collections.deque = dataclasses.field(default_factory=collections.deque)
+        partial_line_size: int = 0
+        window_start: int = 0
+        window_stop: int = 1
+        virtual_selection: Union[tuple, None] = None
+        render_job: Union[str, None] = None
+        input_future: Union[concurrent.futures.Future, None] = None
+        input_callback: Union[Callable, None] = None
+        search_matches: Union[tuple, None] = None
+        search_current: int = 0
+        highlight_job: Union[str, None] = None
+        search_job: Union[str, None] = None
+        font_metrics: Union[tuple, None] = None
+        text_size: Union[tuple, None] = None
+        settled_size: Union[tuple, None] = None
+        resize_job: Union[str, None] = None
+        history_typed: Union[str, None] = None
+        history_text: Union[str, None] = None
+        history_matches: Union[list, None] = None
+        history_position: int = -1
+        history_search: Union[tuple, None] = None
+        trimmed_lines: int = 0
+        render_tokens: float = 0.0
+        render_time: float = 0.0
+        suppressed_lines: int = 0
+        summary_job: Union[str, None] = None
+        catch_up_job: Union[str, None] = None
+        paused_output: list = dataclasses.field(default_factory=list)
+        paused_lines: int = 0
+        resume_job: Union[str, None] = None
+        pooled_entry: Union[tk.Entry, None] = None
+        entry_closed: Union[tk.BooleanVar, None] = None
+        typed_ahead: str = ""
 
     def __init__(self, parent_, **kwargs):
         """
@@ -64,6 +203,42 @@ class Console(tk.Frame):
             font (tkFont.Font): The font used for the console's text.
             background (str): The background color of the console.
             foreground (str): The foreground color (text color) of the console.
+            error_foreground (str): The foreground color of text written with the "stderr" tag.
+            buffered (bool): Whether output is collected in memory and flushed once per frame.
+            flush_interval (int): The delay in milliseconds between buffered flushes (0 flushes when idle).
+            max_batch_size (int): The number of pending characters that forces an immediate flush.
+            output_queue (OutputQueue): The bounded queue through which other threads hand output to the console.
+            drain_interval (int): The delay in milliseconds between drains of the output queue.
+            drain_batch (int): The maximum number of queued writes drained per tick.
+            max_lines (int or None): The maximum number of lines kept in the scrollback.
+            max_bytes (int or None): The maximum number of bytes kept in the scrollback.
+            trim_slack (float): The fraction by which the scrollback may exceed its limit before it is trimmed.
+            virtual (bool): Whether the scrollback is kept in `store` and only the visible lines are rendered.
+            virtual_margin (int): The number of lines rendered above and below the visible lines in virtual mode.
+            store (LineStore or None): The backing store of the scrollback in virtual mode.
+            line_editor (LineEditor or None): The editor of the last line, if `rewrite_lines` is enabled.
+            ansi_parser (AnsiParser or None): The parser of ANSI escape sequences in the output, if `ansi` is enabled.
+            ansi_tags (TagPool or None): The pool of text area tags for the ANSI styles, if `ansi` is enabled.
+            highlighter (Highlighter or None): The patterns highlighted in new output, if `highlight_rules` is given.
+            search_index (SearchIndex or None): The index of the output for searching, if `searchable` is enabled.
+            search_bar (tk.Entry or None): The entry field of the search bar while it is shown.
+            resize_delay (int): The time in milliseconds a resize has to settle before the layout is adjusted.
+            history (InputHistory or None): The input history navigated from the entry field, if `history` is enabled.
+            completion (CompletionEngine or None): The engine running the tab completers, if `completers` are given.
+            completion_page_size (int): The number of candidates per page of the completion popup.
+            completion_popup (CompletionPopup or None): The popup listing completion candidates while it is shown.
+            line_times (collections.deque or None): The start times of the scrollback's lines, if `timestamps` is
+                enabled.
+            instruments (ConsoleStats or None): The counters and timers of the hot paths, if `instrument` is enabled.
+            recorder (SessionRecorder or None): The recording of the output and inputs, while `record` is active.
+            max_render_rate (int or None): The maximum number of output lines rendered per second, if limited.
+            pause_scrolled (bool): Whether output is held back while the view is scrolled away from the end.
+            pause_limit (int): The maximum number of lines held back while the view is scrolled away from the end.
+            suppress_interval (int): The delay in milliseconds before the summary of suppressed lines is written.
+            reuse_entry (bool): Whether one entry field is kept and moved to the insertion point for every input.
+            input_queue (collections.deque): The inputs taken before the entry field is shown, pushed ahead of time
+                with `push_input` or `input_script`, or typed ahead if `type_ahead` is enabled.
+            type_ahead (bool): Whether lines typed while no input is pending are queued for the next inputs.
             text_area (scrolledtext.ScrolledText): The text area of the console for displaying output.
             entry (tk.Entry): The entry field for user input.
             edit_menu (tk.Menu): The context menu for copy/paste actions.
@@ -74,32 +249,145 @@ class Console(tk.Frame):
         self.font = kwargs.get("font", tkFont.Font(family="Monospace", size=10))
         self.background = kwargs.get("background", "#232627")
         self.foreground = kwargs.get("foreground", "#FFFFFF")
+        self.error_foreground = kwargs.get("error_foreground", "#FF6E67")
+        self.buffered = kwargs.get("buffered", False)
+        self.flush_interval = kwargs.get("flush_interval", 16)
+        self.max_batch_size = kwargs.get("max_batch_size", 65536)
+        self.output_queue = OutputQueue(kwargs.get("queue_size", 10000), kwargs.get("backpressure", BLOCK))
+        self.drain_interval = kwargs.get("drain_interval", 16)
+        self.drain_batch = kwargs.get("drain_batch", 1000)
+        self.max_lines = kwargs.get("max_lines", None)
+        self.max_bytes = kwargs.get("max_bytes", None)
+        self.trim_slack = kwargs.get("trim_slack", 0.1)
+        self.virtual = kwargs.get("virtual", False)
+        self.virtual_margin = kwargs.get("virtual_margin", 200)
+        self.store = LineStore() if self.virtual else None
+        self.line_editor = LineEditor() if kwargs.get("rewrite_lines", False) else None
+        self.ansi_parser = None
+        if kwargs.get("ansi", False):
+            self.ansi_parser = AnsiParser(keep_line_edits=self.line_editor is not None)
+        self.ansi_tags = TagPool(self, kwargs.get("max_ansi_tags", 256)) if self.ansi_parser else None
+        rules = kwargs.get("highlight_rules", None)
+        self.highlighter = None
+        if isinstance(rules, Highlighter):
+            self.highlighter = rules
+        elif rules:
+            self.highlighter = Highlighter(rules)
+        self.search_index = SearchIndex() if kwargs.get("searchable", False) else None
+        self.search_bar = None
+        self.resize_delay = kwargs.get("resize_delay", 50)
+        self.history = kwargs.get("history", None)
+        if self.history is True or isinstance(self.history, str):
+            self.history = InputHistory(None if self.history is True else self.history,
+                                        kwargs.get("max_history", 100000))
+        completers = kwargs.get("completers", None)
+        self.completion = CompletionEngine(self, completers) if completers else None
+        self.completion_page_size = kwargs.get("completion_page_size", 20)
+        self.completion_popup = None
+        self.line_times = collections.deque([time.time()]) if kwargs.get("timestamps", False) else None
+        self.max_render_rate = kwargs.get("max_render_rate", None)
+        self.pause_scrolled = kwargs.get("pause_scrolled", False)
+        self.pause_limit = kwargs.get("pause_limit", 100000)
+        self.suppress_interval = kwargs.get("suppress_interval", 1000)
+        self.reuse_entry = kwargs.get("reuse_entry", False)
+        self.input_queue = collections.deque(kwargs.get("input_script", ()))
+        self.type_ahead = kwargs.get("type_ahead", False)
         self.text_area = scrolledtext.ScrolledText(
             self.parent, wrap=tk.WORD, font=self.font, background=self.background, foreground=self.foreground, padx=0,
             pady=0, borderwidth=0, border=0.0, insertborderwidth=0, selectborderwidth=0
         )
+        self.instruments = None
+        self.recorder = None
+        if kwargs.get("instrument", False) or kwargs.get("stats_hook") is not None:
+            self.instruments = ConsoleStats(kwargs.get("stats_hook"))
+            self.text_area.tk = TkCallProxy(self.text_area.tk, self.instruments)
         self.text_area.pack(expand=True, fill="both", padx=0, pady=0, ipady=0, ipadx=0)
         self.text_area.place(relwidth=1, relheight=1)
+        self.text_area.tag_configure("stderr", foreground=self.error_foreground)
+        if self.highlighter is not None:
+            for tag, options in self.highlighter.styles():
+                self.text_area.tag_configure(tag, **options)
+        self.text_area.tag_configure("search", background="#F5F543", foreground="#000000")
+        self.text_area.tag_configure("search_current", background="#FF9F43", foreground="#000000")
+        self.text_area.tag_configure("suppressed", foreground="#8A8A8A")
         self.entry = None
         self.edit_menu = tk.Menu(self.parent, tearoff=0)
-        self.parent.bind("<Button-3>", self.show_edit_menu)
-        self.parent.bind("<Control-Shift-c>", self.copy_text)
-        self.parent.bind("<Control-Shift-v>", self.paste_text)
-        self.parent.bind("<Control-Shift-C>", self.copy_text)
-        self.parent.bind("<Control-Shift-V>", self.paste_text)
-        self.text_area.bind("<Configure>", self.adjust_on_configure)
-        self.parent.bind("<Home>", self.go_to_home)
-        self.parent.bind("<End>", self.go_to_end)
-        self.parent.bind("<Prior>", self.page_up)
-        self.parent.bind("<Next>", self.page_down)
+        self._scope_bindings(self.text_area)
+        self.bind("<Button-1>", self._on_click)
+        self.bind("<Button-3>", self.show_edit_menu)
+        self.bind("<Control-Shift-c>", self.copy_text)
+        self.bind("<Control-Shift-v>", self.paste_text)
+        self.bind("<Control-Shift-C>", self.copy_text)
+        self.bind("<Control-Shift-V>", self.paste_text)
+        self.text_area.bind("<Configure>", self._on_configure)
+        self.bind("<Home>", self.go_to_home)
+        self.bind("<End>", self.go_to_end)
+        self.bind("<Prior>", self.page_up)
+        self.bind("<Next>", self.page_down)
+        if self.search_index is not None:
+            self.bind("<Control-f>", self.show_search_bar)
+        if self.type_ahead:
+            self.bind("<Key>", self._on_type_ahead)
+        if self.completion is not None or self.history is not None:
+            self.bind("<Destroy>", self._on_destroy, add="+")
+        self.text_area.focus_set()
         self.helpers = self.Helpers()
+        self.helpers.tk_thread_id = threading.get_ident()
+        if kwargs.get("threadsafe", False):
+            self.helpers.drain_job = self.after(self.drain_interval, self._drain_loop)
+        if self.virtual or self.search_index is not None or self.pause_scrolled:
+            self.text_area.configure(yscrollcommand=self._on_yscroll)
+        if self.virtual:
+            self.text_area.vbar.configure(command=self._virtual_yview)
+
+    @property
+    def line_count(self):
+        """int: The number of lines currently kept in the scrollback."""
+        return self.helpers.line_count
+
+    @property
+    def byte_count(self):
+        """int: The number of UTF-8 encoded bytes currently kept in the scrollback."""
+        return self.helpers.byte_count
+
+    def _scope_bindings(self, widget):
+        """
+        Makes the console's key and mouse bindings apply to one of its widgets.
+
+        The bindings are made on the console itself and its name is added to the binding tags of its widgets, ahead
+        of their toplevel window, instead of binding on the parent window, so that several consoles in one window
+        keep their own bindings.
+
+        Args:
+            widget (tk.Widget): The text area, the entry field or the search bar.
+        """
+        tags = list(widget.bindtags())
+        tags.insert(2, str(self))
+        widget.bindtags(tuple(tags))
+
+    def _on_click(self, event):
+        """
+        Closes the context menu and keeps the text cursor of the entry field in place when a widget is clicked. A click
+        on the text area while no input is pending focuses it, since a disabled text widget does not take the focus
+        by itself and the console's key bindings only apply to its focused widgets.
+        """
+        self.edit_menu.unpost()
+        if self.entry is not None and self.helpers.text_cursor_position is not None:
+            self.entry.icursor(self.helpers.text_cursor_position)
+        elif self.entry is None and event.widget is self.text_area:
+            self.text_area.focus_set()
 
     def go_to_home(self, event):
         """Scrolls the text area to the beginning."""
+        if self.store is not None and self.helpers.window_start > 0:
+            self._render_window(0)
         self.text_area.see("1.0")
 
     def go_to_end(self, event):
         """Scrolls the text area to the end."""
+        if self.store is not None and self.helpers.window_stop < len(self.store):
+            self._render_window(len(self.store))
+        self._resume_output()
         self.text_area.see(tk.END)
 
     def page_up(self, event):
@@ -110,47 +398,1016 @@ class Console(tk.Frame):
         """Scrolls the text area down by one page."""
         self.text_area.yview_scroll(1, tk.PAGES)
 
+    def configure_font(self, **options):
+        """
+        Changes the console's font and invalidates the cached font metrics.
+
+        Use this method, or `invalidate_metrics` after changing `font` directly, so that the layout uses the new
+        metrics.
+
+        Args:
+            **options: Font options, such as `family`, `size` or `weight`.
+        """
+        self.font.configure(**options)
+        self.invalidate_metrics()
+
+    def invalidate_metrics(self):
+        """Discards the cached font metrics and text area size, and adjusts the layout to the current ones."""
+        self.helpers.font_metrics = None
+        self.helpers.text_size = None
+        self.adjust_on_configure(None)
+
+    def _char_width(self):
+        """Returns the width of "0" in the console's font, measured once per font."""
+        if self.helpers.font_metrics is None or self.helpers.font_metrics[0] != self.font.name:
+            self.helpers.font_metrics = (self.font.name, self.font.measure("0"), self.font.metrics("linespace"))
+        return self.helpers.font_metrics[1]
+
+    def _line_height(self):
+        """Returns the line height of the console's font, measured once per font."""
+        self._char_width()
+        return self.helpers.font_metrics[2]
+
+    def _text_size(self):
+        """Returns the width and height of the text area, as last reported by a <Configure> event."""
+        if self.helpers.text_size is None:
+            self.helpers.text_size = (self.text_area.winfo_width(), self.text_area.winfo_height())
+        return self.helpers.text_size
+
+    def _follows_output(self):
+        """Returns whether the view follows the end of the output, so that new output should be scrolled into view."""
+        yview = round(self.text_area.yview()[1], 1)
+        index = float(self.text_area.index(tk.CURRENT)) // (self._text_size()[1] // self._char_width() or 1)
+        return yview < index or yview == 1.0
+
+    def _on_configure(self, event):
+        """
+        Records the new size of the text area and adjusts the layout once the size has not changed for
+        `resize_delay` milliseconds, so that a window drag adjusts it once instead of at every <Configure> event.
+        """
+        self.helpers.text_size = (event.width, event.height)
+        if self.instruments is not None:
+            self.instruments.count("configure_events")
+        if self.helpers.resize_job is not None:
+            self.after_cancel(self.helpers.resize_job)
+            self.helpers.resize_job = None
+        if self.helpers.text_size == self.helpers.settled_size:
+            return
+        if self.resize_delay:
+            self.helpers.resize_job = self.after(self.resize_delay, self._settle_resize)
+        else:
+            self.helpers.resize_job = self.after_idle(self._settle_resize)
+
+    def _settle_resize(self):
+        """Adjusts the layout to the settled size of the text area."""
+        self.helpers.resize_job = None
+        self.helpers.settled_size = self.helpers.text_size
+        self.adjust_on_configure(None)
+
     def adjust_on_configure(self, event):
         """
         Adjusts the console's components when the window is resized.
         This method updates the entry field's width and ensures that the text area remains scrolled to the end.
         """
-        self.parent.update_idletasks()
+        stats = self.instruments
+        start = time.perf_counter() if stats is not None else 0.0
         if self.entry:
             if not self.helpers.entry_x:
+                self.entry.update_idletasks()
                 self.helpers.entry_x = self.entry.winfo_x()
             self.entry.configure(
-                width=(self.text_area.winfo_width() - self.helpers.entry_x - 10) // self.font.measure("0")
+                width=(self._text_size()[0] - self.helpers.entry_x - 10) // self._char_width()
             )
         if not self.helpers.yview and not self.helpers.index:
             self.helpers.yview = round(self.text_area.yview()[1], 1)
             self.helpers.index = float(self.text_area.index(tk.CURRENT)) // (
-                    self.text_area.winfo_height() // self.font.measure("0"))
+                    self._text_size()[1] // self._char_width() or 1)
         if self.helpers.yview < self.helpers.index or self.helpers.yview == 1.0:
             self.text_area.see(tk.END)
         self.helpers.yview = None
         self.helpers.index = None
+        if stats is not None:
+            stats.observe("adjust_on_configure", time.perf_counter() - start)
+
+    def stats(self, reset=False):
+        """
+        Returns the counters and timers of the console's hot paths.
+
+        Counters include "writes", "prints", "flushes", "inserts", "bytes", "lines", "tk_calls", "autoscroll_checks",
+        "autoscrolls", "suppressed_lines", "paused_writes", "inputs", "queued_inputs", "configure_events", "copies" and
+        "pastes"; timers include "insert_output", "tk_call", "input_setup", "adjust_on_configure", "copy_text" and
+        "paste_text".
+
+        Args:
+            reset (bool): Whether the counters and timers are cleared after they are read.
+
+        Returns:
+            dict: The snapshot of `ConsoleStats.snapshot`, which is empty if `instrument` is not enabled.
+        """
+        if self.instruments is None:
+            return {"counters": {}, "timers": {}, "seconds": 0.0}
+        snapshot = self.instruments.snapshot()
+        if reset:
+            self.instruments.reset()
+        return snapshot
 
-    def write_output(self, output):
+    def write_output(self, output, tag=None):
         """
         Writes the given output text to the text area and ensures that it's visible.
 
+        In buffered mode the text is only queued in memory; it reaches the text area on the next scheduled flush, or
+        immediately once the pending output reaches `max_batch_size` characters. Text that rewrites the last line, if
+        `rewrite_lines` is enabled, is queued the same way, so that the rewrites between two flushes are applied at
+        once.
+
         Args:
             output (str): The text to be displayed in the console.
+            tag (str, optional): The text area tag used to style the text, such as "stderr".
         """
-        self.parent.update_idletasks()
-        yview = round(self.text_area.yview()[1], 1)
-        index = float(self.text_area.index(tk.CURRENT)) // (self.text_area.winfo_height() // self.font.measure("0"))
+        if self.instruments is not None:
+            self.instruments.count("writes")
+        self._write_segments([(output, tag)])
+
+    def _write_segments(self, segments):
+        """
+        Writes (text, tag) output segments to the text area, or queues them in buffered mode. The highlighted
+        patterns are tagged in the segments of every write, before they are queued.
+
+        Args:
+            segments (list): The (text, tag) pairs to be written.
+        """
+        if self.recorder is not None:
+            for text, tag in segments:
+                self.recorder.output(text, tag)
+        if self.ansi_parser is not None:
+            segments = self._parse_ansi(segments)
+            if not segments:
+                return
+        if self.highlighter is not None:
+            segments = self.highlighter.highlight(segments)
+        coalesce = self.line_editor is not None and (
+            self.helpers.pending_output or self.line_editor.rewrites(segments))
+        if not self.buffered and not coalesce:
+            self._insert_output(segments)
+            return
+        self.helpers.pending_output.extend(segments)
+        self.helpers.pending_size += sum(len(text) for text, _ in segments)
+        if self.helpers.pending_size >= self.max_batch_size:
+            self.flush()
+        elif self.helpers.flush_job is None:
+            if self.flush_interval:
+                self.helpers.flush_job = self.after(self.flush_interval, self.flush)
+            else:
+                self.helpers.flush_job = self.after_idle(self.flush)
+
+    def _parse_ansi(self, segments):
+        """
+        Removes ANSI escape sequences from output segments and tags the text with the styles they select.
+
+        Args:
+            segments (list): The (text, tag) pairs to be parsed.
+
+        Returns:
+            list: The (text, tag) pairs of the parsed text, where tag is a tag name, a tuple of tag names or None.
+        """
+        parsed = []
+        for text, tag in segments:
+            for text_, style in self.ansi_parser.feed(text):
+                style_tag = self.ansi_tags.tag(style)
+                if style_tag is None:
+                    parsed.append((text_, tag))
+                else:
+                    parsed.append((text_, style_tag if tag is None else (tag, style_tag)))
+        return parsed
+
+    def flush(self):
+        """Writes all pending buffered output to the text area with a single insert."""
+        if self.helpers.flush_job is not None:
+            self.after_cancel(self.helpers.flush_job)
+            self.helpers.flush_job = None
+        if self.helpers.pending_output:
+            if self.instruments is not None:
+                self.instruments.count("flushes")
+            segments = self.helpers.pending_output
+            self.helpers.pending_output = []
+            self.helpers.pending_size = 0
+            self._insert_output(segments)
+
+    def _insert_output(self, segments, limited=True):
+        """
+        Inserts (text, tag) output segments into the text area with a single insert and keeps the end visible if the
+        view follows the output. Adjacent segments with the same tag are merged.
+
+        Output is held back while the view is scrolled away from the end if `pause_scrolled` is enabled, and lines
+        beyond `max_render_rate` are suppressed, or left unrendered in the store in virtual mode.
+
+        Args:
+            segments (list): The (text, tag) pairs to be inserted.
+            limited (bool): Whether the output may be held back or suppressed.
+        """
+        stats = self.instruments
+        start = time.perf_counter() if stats is not None else 0.0
+        follow = self._follows_output()
+        render = True
+        if limited and self.store is None and self.pause_scrolled and (self.helpers.paused_output or not follow):
+            self._pause_output(segments)
+            return
+        replaced = None
+        if self.line_editor is not None and self.entry is None:
+            replaced, segments = self.line_editor.feed(segments)
+        if limited and self.store is None and self.max_render_rate:
+            segments = self._limit_output(segments)
+            if not segments and replaced is None:
+                return
+        elif limited and self.max_render_rate:
+            newlines = sum(text.count("\n") for text, _ in segments)
+            render = self._render_budget(newlines) == newlines
+        texts = []
+        args = []
+        last_tag = None
+        for text, tag in segments:
+            if texts and tag != last_tag:
+                args += ["".join(texts), last_tag or ()]
+                texts = []
+            texts.append(text)
+            last_tag = tag
+        args += ["".join(texts), last_tag or ()]
+        output = "".join(args[::2]) if len(args) > 2 else args[0]
+        if replaced is not None:
+            self._uncount_last_line(replaced)
+        if self.store is None:
+            self.text_area.configure(state="normal")
+            if replaced is not None:
+                self.text_area.delete("end-1c linestart", "end-1c")
+            self.text_area.insert(tk.END, *args)
+            self.text_area.configure(state="disabled")
+        else:
+            follow = self._insert_virtual(output, args, render, replaced is not None) and follow
+        self._count_output(output)
+        if self.search_index is not None:
+            self.search_index.append(output)
+        self._trim_scrollback()
+        if follow:
+            self.text_area.see(tk.END)
+        if stats is not None:
+            stats.count("inserts")
+            stats.count("autoscroll_checks")
+            if follow:
+                stats.count("autoscrolls")
+            stats.observe("insert_output", time.perf_counter() - start)
+
+    def _insert_virtual(self, output, args, render=True, replace=False):
+        """
+        Appends the given output text to the backing store and renders it if the text area shows the end of the store.
+        Tags only style the text while it stays rendered, since the store keeps plain text.
+
+        Args:
+            output (str): The text to be appended.
+            args (list): The alternating texts and tags of the output, as passed to the text area's `insert`.
+            render (bool): Whether the output may be rendered now; otherwise the end of the store is rendered once per
+                `flush_interval` while the text area shows it.
+            replace (bool): Whether the output replaces the last line of the store.
+
+        Returns:
+            bool: True if the text area shows the end of the store.
+        """
+        at_end = self.helpers.window_stop == len(self.store)
+        if replace:
+            self.store.clear_last_line()
+        self.store.append(output)
+        if at_end and not render or self.helpers.catch_up_job is not None:
+            if self.helpers.catch_up_job is None:
+                self.helpers.catch_up_job = self.after(self.flush_interval or 16, self._catch_up)
+            return False
+        if not at_end:
+            self._update_virtual_scrollbar()
+            return False
         self.text_area.configure(state="normal")
-        self.text_area.insert(tk.END, output)
+        if replace:
+            self.text_area.delete("end-1c linestart", "end-1c")
+        self.text_area.insert(tk.END, *args)
         self.text_area.configure(state="disabled")
-        if yview < index or yview == 1.0:
+        self.helpers.window_stop = len(self.store)
+        excess = self.helpers.window_stop - self.helpers.window_start - self._visible_lines() - self.virtual_margin
+        if excess > self.virtual_margin and self.entry is None:
+            self._delete_widget_lines(excess)
+            self.helpers.window_start += excess
+        return True
+
+    def _render_budget(self, lines):
+        """
+        Takes lines from the budget of `max_render_rate`, which refills continuously up to one second's worth.
+
+        Args:
+            lines (int): The number of lines to be rendered.
+
+        Returns:
+            int: The number of those lines that may be rendered.
+        """
+        now = time.monotonic()
+        rate = self.max_render_rate
+        tokens = min(rate, self.helpers.render_tokens + (now - self.helpers.render_time) * rate)
+        allowed = min(lines, int(tokens))
+        self.helpers.render_tokens = tokens - allowed
+        self.helpers.render_time = now
+        return allowed
+
+    def _limit_output(self, segments):
+        """
+        Drops the oldest lines of output segments that exceed `max_render_rate` and schedules their summary.
+
+        Args:
+            segments (list): The (text, tag) pairs to be inserted.
+
+        Returns:
+            list: The (text, tag) pairs of the lines that may be rendered, possibly empty.
+        """
+        newlines = sum(text.count("\n") for text, _ in segments)
+        allowed = self._render_budget(newlines)
+        if allowed == newlines:
+            return segments
+        self._suppress_lines(newlines - allowed)
+        return [(text, tag) for text, tag in _drop_lines(segments, newlines - allowed) if text]
+
+    def _suppress_lines(self, count):
+        """
+        Counts suppressed lines and schedules their summary.
+
+        Args:
+            count (int): The number of suppressed lines.
+        """
+        self.helpers.suppressed_lines += count
+        if self.instruments is not None:
+            self.instruments.count("suppressed_lines", count)
+        if self.helpers.summary_job is None:
+            self.helpers.summary_job = self.after(self.suppress_interval, self._write_summary)
+
+    def _summary(self):
+        """Returns the summary of the suppressed lines as an output segment and resets their count."""
+        count = self.helpers.suppressed_lines
+        self.helpers.suppressed_lines = 0
+        return f"[{count} line{'s' if count != 1 else ''} suppressed]\n", "suppressed"
+
+    def _write_summary(self):
+        """Writes the summary of the suppressed lines, unless output is held back, which then starts with it."""
+        self.helpers.summary_job = None
+        if self.helpers.suppressed_lines and not self.helpers.paused_output:
+            self._insert_output([self._summary()], limited=False)
+
+    def _catch_up(self):
+        """Renders the end of the backing store after output was not rendered under `max_render_rate`."""
+        self.helpers.catch_up_job = None
+        if self.helpers.window_stop < len(self.store) and self._follows_output():
+            self._render_window(len(self.store))
             self.text_area.see(tk.END)
 
+    def _pause_output(self, segments):
+        """
+        Holds output segments back while the view is scrolled away from the end, dropping the oldest lines once more
+        than `pause_limit` lines are held back.
+
+        Args:
+            segments (list): The (text, tag) pairs to be held back.
+        """
+        self.helpers.paused_output.extend(segments)
+        self.helpers.paused_lines += sum(text.count("\n") for text, _ in segments)
+        if self.instruments is not None:
+            self.instruments.count("paused_writes")
+        if self.helpers.paused_lines > int(self.pause_limit * (1 + self.trim_slack)):
+            excess = self.helpers.paused_lines - self.pause_limit
+            self.helpers.paused_output = _drop_lines(self.helpers.paused_output, excess)
+            self.helpers.paused_lines -= excess
+            self._suppress_lines(excess)
+
+    def _resume_output(self):
+        """Inserts the output held back while the view was scrolled away from the end."""
+        self.helpers.resume_job = None
+        if not self.helpers.paused_output:
+            return
+        segments = self.helpers.paused_output
+        self.helpers.paused_output = []
+        self.helpers.paused_lines = 0
+        if self.helpers.suppressed_lines:
+            segments.insert(0, self._summary())
+        self._insert_output(segments, limited=False)
+
+    def _uncount_last_line(self, text):
+        """
+        Removes the last line from the byte counts and the search index before it is written anew.
+
+        Args:
+            text (str): The text of the last line.
+        """
+        size = len(text) if text.isascii() else len(text.encode("utf-8"))
+        self.helpers.byte_count -= size
+        self.helpers.partial_line_size = max(0, self.helpers.partial_line_size - size)
+        if self.search_index is not None:
+            self.search_index.clear_last_line()
+
+    def _count_output(self, output):
+        """
+        Updates the line and byte counts of the scrollback with newly written output.
+
+        Args:
+            output (str): The text that was written.
+        """
+        newlines = output.count("\n")
+        size = len(output) if output.isascii() else len(output.encode("utf-8"))
+        self.helpers.line_count += newlines
+        self.helpers.byte_count += size
+        if self.instruments is not None:
+            self.instruments.count("bytes", size)
+            self.instruments.count("lines", newlines)
+        if self.line_times is not None and newlines:
+            self.line_times.extend([time.time()] * newlines)
+        if not self.max_lines and not self.max_bytes:
+            return
+        if not newlines:
+            self.helpers.partial_line_size += size
+            return
+        sizes = [len(line) if line.isascii() else len(line.encode("utf-8")) for line in output.split("\n")]
+        self.helpers.line_sizes.append(self.helpers.partial_line_size + sizes[0] + 1)
+        self.helpers.line_sizes.extend(size + 1 for size in sizes[1:-1])
+        self.helpers.partial_line_size = sizes[-1]
+
+    def _trim_scrollback(self):
+        """
+        Deletes the oldest lines once the scrollback exceeds its limits by more than `trim_slack`.
+
+        Trimming goes back down to the limit in one deletion, so its cost is amortized over many writes.
+        """
+        count = 0
+        if self.max_lines and self.helpers.line_count > int(self.max_lines * (1 + self.trim_slack)):
+            count = self.helpers.line_count - self.max_lines
+        if self.max_bytes and self.helpers.byte_count > int(self.max_bytes * (1 + self.trim_slack)):
+            excess = self.helpers.byte_count - self.max_bytes
+            removed = 0
+            number = 0
+            for number, size in enumerate(self.helpers.line_sizes, 1):
+                removed += size
+                if removed >= excess:
+                    break
+            count = max(count, number)
+        count = min(count, len(self.helpers.line_sizes))
+        if count:
+            self._delete_lines(count)
+
+    def _delete_lines(self, count):
+        """
+        Deletes the given number of lines from the top of the text area while keeping the view on the same text.
+
+        Args:
+            count (int): The number of lines to be deleted.
+        """
+        if self.store is None:
+            self._delete_widget_lines(count)
+        else:
+            self._trim_virtual(count)
+        if self.search_index is not None:
+            self.search_index.trim(count)
+        removed = sum(self.helpers.line_sizes.popleft() for _ in range(count))
+        self.helpers.line_count -= count
+        self.helpers.byte_count -= removed
+        self.helpers.trimmed_lines += count
+        if self.line_times is not None:
+            for _ in range(count):
+                self.line_times.popleft()
+
+    def _delete_widget_lines(self, count):
+        """
+        Deletes the given number of lines from the top of the text area while keeping the view on the same text.
+
+        Args:
+            count (int): The number of lines to be deleted.
+        """
+        top = None
+        if self.text_area.yview()[1] != 1.0:
+            top = int(self.text_area.index("@0,0").split(".")[0])
+        self.text_area.configure(state="normal")
+        self.text_area.delete("1.0", f"{count + 1}.0")
+        self.text_area.configure(state="disabled")
+        if top is not None:
+            self.text_area.yview(f"{max(top - count, 1)}.0")
+
+    def _trim_virtual(self, count):
+        """
+        Removes the given number of lines from the front of the backing store and shifts the rendered window.
+
+        Args:
+            count (int): The number of lines to be removed.
+        """
+        self.store.trim(count)
+        if self.helpers.virtual_selection:
+            (first_line, first_column), (last_line, last_column) = self.helpers.virtual_selection
+            self.helpers.virtual_selection = None
+            if last_line >= count:
+                first = (first_line - count, first_column) if first_line >= count else (0, 0)
+                self.helpers.virtual_selection = (first, (last_line - count, last_column))
+        start = self.helpers.window_start - count
+        stop = self.helpers.window_stop - count
+        if stop <= 0:
+            self.helpers.window_start, self.helpers.window_stop = 0, 0
+            self._render_window(0)
+            return
+        if start < 0:
+            self._delete_widget_lines(-start)
+            start = 0
+        self.helpers.window_start, self.helpers.window_stop = start, stop
+        self._update_virtual_scrollbar()
+
+    def _visible_lines(self):
+        """Returns the number of lines that fit in the text area."""
+        return max(1, self._text_size()[1] // self._line_height())
+
+    def _render_window(self, top):
+        """
+        Renders the lines of the backing store around the given line into the text area, with that line at the top.
+
+        The text area is left untouched while an input entry is embedded in it.
+
+        Args:
+            top (int): The line of `store` to be shown at the top of the text area.
+        """
+        if self.entry is not None:
+            return
+        total = len(self.store)
+        visible = self._visible_lines()
+        top = max(0, min(top, total - visible))
+        start = max(0, top - self.virtual_margin)
+        stop = min(total, top + visible + self.virtual_margin)
+        text = self.store.text(start, stop)
+        if stop < total:
+            text = text[:-1]
+        self._save_virtual_selection()
+        self.text_area.configure(state="normal")
+        self.text_area.delete("1.0", tk.END)
+        self.text_area.insert(tk.END, text)
+        self.text_area.configure(state="disabled")
+        self.helpers.window_start, self.helpers.window_stop = start, stop
+        self.text_area.yview(f"{top - start + 1}.0")
+        self._restore_virtual_selection()
+        self._update_virtual_scrollbar()
+
+    def _rerender_window(self):
+        """Re-renders the window of the backing store around the line at the top of the text area."""
+        self.helpers.render_job = None
+        self._render_window(self.helpers.window_start + int(self.text_area.index("@0,0").split(".")[0]) - 1)
+
+    def _virtual_yscroll(self, first, last):
+        """
+        Maps the view of the text area onto the whole backing store for the scrollbar and re-renders the window when
+        the view gets close to one of its edges. Used as the text area's `yscrollcommand` in virtual mode.
+
+        Args:
+            first (str): The fraction of the rendered lines above the view.
+            last (str): The fraction of the rendered lines above the bottom of the view.
+        """
+        total = len(self.store)
+        start, stop = self.helpers.window_start, self.helpers.window_stop
+        top = start + float(first) * (stop - start)
+        bottom = start + float(last) * (stop - start)
+        self.text_area.vbar.set(top / total, bottom / total)
+        near_start = start > 0 and top - start < self.virtual_margin / 2
+        near_stop = stop < total and stop - bottom < self.virtual_margin / 2
+        if (near_start or near_stop) and self.helpers.render_job is None:
+            self.helpers.render_job = self.after_idle(self._rerender_window)
+
+    def _on_yscroll(self, first, last):
+        """
+        Updates the scrollbar and schedules the highlighting of the visible search matches when the view changes. Used
+        as the text area's `yscrollcommand` in virtual mode and when searching is enabled.
+
+        Args:
+            first (str): The fraction of the text above the view.
+            last (str): The fraction of the text above the bottom of the view.
+        """
+        if self.store is not None:
+            self._virtual_yscroll(first, last)
+        else:
+            self.text_area.vbar.set(first, last)
+        if self.helpers.paused_output and float(last) == 1.0 and self.helpers.resume_job is None:
+            self.helpers.resume_job = self.after_idle(self._resume_output)
+        if self.helpers.search_matches and self.helpers.highlight_job is None:
+            self.helpers.highlight_job = self.after_idle(self._highlight_visible)
+
+    def _update_virtual_scrollbar(self):
+        """Updates the scrollbar after the backing store or the rendered window changed."""
+        self._on_yscroll(*self.text_area.yview())
+
+    def _virtual_yview(self, *args):
+        """
+        Scrolls the view over the whole backing store. Used as the scrollbar's `command` in virtual mode.
+
+        Args:
+            *args: The arguments of the scrollbar command, as for `yview`.
+        """
+        if args[0] == tk.MOVETO:
+            self._render_window(int(float(args[1]) * len(self.store)))
+        else:
+            self.text_area.yview(*args)
+
+    def _store_index(self, index):
+        """
+        Converts an index of the text area into a (line, column) pair of the backing store.
+
+        Args:
+            index (str): An index of the text area.
+
+        Returns:
+            tuple: The line and column in `store`.
+        """
+        line, column = map(int, str(self.text_area.index(index)).split("."))
+        return min(self.helpers.window_start + line - 1, len(self.store) - 1), column
+
+    def _save_virtual_selection(self):
+        """
+        Records the selection of the text area in backing store coordinates.
+
+        A recorded selection outside the rendered window is kept, so that it survives scrolling; one inside the
+        window that is no longer selected has been cleared by the user.
+        """
+        ranges = self.text_area.tag_ranges(tk.SEL)
+        if ranges:
+            self.helpers.virtual_selection = (self._store_index(ranges[0]), self._store_index(ranges[1]))
+        elif self.helpers.virtual_selection:
+            (first_line, _), (last_line, _) = self.helpers.virtual_selection
+            if first_line < self.helpers.window_stop and last_line >= self.helpers.window_start:
+                self.helpers.virtual_selection = None
+
+    def _restore_virtual_selection(self):
+        """Selects the part of the recorded selection that lies in the rendered window."""
+        if not self.helpers.virtual_selection:
+            return
+        (first_line, first_column), (last_line, last_column) = self.helpers.virtual_selection
+        start, stop = self.helpers.window_start, self.helpers.window_stop
+        if last_line < start or first_line >= stop:
+            return
+        first = f"{first_line - start + 1}.{first_column}" if first_line >= start else "1.0"
+        last = f"{last_line - start + 1}.{last_column}" if last_line < stop else tk.END
+        self.text_area.tag_add(tk.SEL, first, last)
+
+    def _virtual_selection_text(self):
+        """Returns the text of the recorded selection from the backing store."""
+        (first_line, first_column), (last_line, last_column) = self.helpers.virtual_selection
+        if first_line == last_line:
+            return self.store.line(first_line)[first_column:last_column]
+        return (self.store.line(first_line)[first_column:] + "\n" + self.store.text(first_line + 1, last_line) +
+                self.store.line(last_line)[:last_column])
+
+    def write_threadsafe(self, output, timeout=None, tag=None):
+        """
+        Writes the given output text from any thread.
+
+        Calls from other threads only push the text into `output_queue`, which the Tkinter thread drains in batches;
+        the console must have been created with `threadsafe=True`. Calls from the Tkinter thread write directly after
+        draining the queue, so they never wait on the queue.
+
+        Args:
+            output (str): The text to be displayed in the console.
+            timeout (float, optional): The maximum number of seconds to wait for room under the "block" policy.
+            tag (str, optional): The text area tag used to style the text, such as "stderr".
+
+        Returns:
+            bool: True if the text was written or queued, False if it was dropped.
+        """
+        if threading.get_ident() == self.helpers.tk_thread_id:
+            self.drain_output()
+            self.write_output(output, tag)
+            return True
+        if self.helpers.drain_job is None:
+            raise RuntimeError("Console must be created with threadsafe=True to be written from other threads")
+        return self.output_queue.put((output, tag), timeout)
+
+    def print_threadsafe(self, *args, **kwargs):
+        """
+        Prints the provided text in the console's text area from any thread.
+
+        Args:
+            *args: Variable number of arguments to be concatenated and printed.
+            **kwargs: Optional keyword arguments for controlling the print behavior.
+
+        Returns:
+            bool: True if the text was written or queued, False if it was dropped.
+        """
+        text = "".join(map(str, args))
+        end = kwargs.get("end", "\n")
+        return self.write_threadsafe(text + end, kwargs.get("timeout"), kwargs.get("tag"))
+
+    def drain_output(self, max_items=None):
+        """
+        Writes queued output from other threads to the console. Must be called from the Tkinter thread.
+
+        Args:
+            max_items (int, optional): The maximum number of queued writes to take. All are taken if omitted.
+
+        Returns:
+            int: The number of queued writes taken.
+        """
+        items = self.output_queue.drain(max_items)
+        if items:
+            self._write_segments(items)
+        return len(items)
+
+    def _drain_loop(self):
+        """Drains the output queue once and schedules the next drain, sooner if the queue is still backed up."""
+        count = self.drain_output(self.drain_batch)
+        self.helpers.drain_job = self.after(1 if count == self.drain_batch else self.drain_interval, self._drain_loop)
+
+    def search(self, query, regex=False, ignore_case=False):
+        """
+        Searches the output for a query, highlights the visible matches and shows the first match at or below the top
+        of the view. Requires a console created with `searchable=True`.
+
+        Args:
+            query (str): The substring or regular expression to be found.
+            regex (bool): Whether the query is a regular expression.
+            ignore_case (bool): Whether the case of letters is ignored.
+
+        Returns:
+            int: The number of matches.
+
+        Raises:
+            re.error: If the query is not a valid regular expression.
+        """
+        starts, ends = self.search_index.find(query, regex, ignore_case)
+        self.helpers.search_matches = (starts, ends) if starts else None
+        if not starts:
+            self._highlight_visible()
+            return 0
+        top = self.search_index.offset(self._visible_range()[0])
+        self.helpers.search_current = min(bisect.bisect_left(starts, top), len(starts) - 1)
+        self._show_match()
+        return len(starts)
+
+    def search_next(self, event=None):
+        """Shows the next match of the current search, wrapping around at the end."""
+        if self.helpers.search_matches:
+            self.helpers.search_current = (self.helpers.search_current + 1) % len(self.helpers.search_matches[0])
+            self._show_match()
+
+    def search_previous(self, event=None):
+        """Shows the previous match of the current search, wrapping around at the beginning."""
+        if self.helpers.search_matches:
+            self.helpers.search_current = (self.helpers.search_current - 1) % len(self.helpers.search_matches[0])
+            self._show_match()
+
+    def clear_search(self, event=None):
+        """Clears the current search and its highlighting, and closes the search bar."""
+        self.helpers.search_matches = None
+        self._highlight_visible()
+        if self.search_bar is not None:
+            self.search_bar.destroy()
+            self.search_bar = None
+            self.text_area.focus_set()
+
+    def show_search_bar(self, event=None):
+        """
+        Shows the search bar, which searches as the query is typed.
+
+        A query in slashes, such as `/err(or)?/`, is a regular expression, and a query without capital letters ignores
+        case. 'Return' and 'Down' show the next match, 'Shift-Return' and 'Up' the previous one, and 'Escape' closes
+        the bar.
+        """
+
+        def on_change():
+            """
+            Search the query shortly after the user stops typing.
+            """
+            if self.helpers.search_job is not None:
+                self.after_cancel(self.helpers.search_job)
+            self.helpers.search_job = self.after(50, search_query)
+
+        def search_query():
+            """
+            Search the query of the search bar.
+            """
+            self.helpers.search_job = None
+            query = query_var.get()
+            regex = len(query) > 2 and query.startswith("/") and query.endswith("/")
+            try:
+                self.search(query[1:-1] if regex else query, regex=regex, ignore_case=query == query.lower())
+                self.search_bar.configure(foreground=self.foreground)
+            except re.error:
+                self.search_bar.configure(foreground=self.error_foreground)
+
+        if self.search_bar is not None:
+            self.search_bar.focus_set()
+            self.search_bar.select_range(0, tk.END)
+            return
+        query_var = tk.StringVar()
+        self.search_bar = tk.Entry(self.text_area, textvariable=query_var, font=self.font, relief=tk.FLAT,
+                                   background=self.background, foreground=self.foreground,
+                                   insertbackground=self.foreground, highlightthickness=1,
+                                   highlightcolor=self.foreground)
+        self.search_bar.place(relx=1.0, x=-4, y=4, anchor="ne", relwidth=0.4)
+        self._scope_bindings(self.search_bar)
+        query_var.trace("w", lambda name, index, mode: on_change())
+        self.search_bar.bind("<Return>", self.search_next)
+        self.search_bar.bind("<KP_Enter>", self.search_next)
+        self.search_bar.bind("<Down>", self.search_next)
+        self.search_bar.bind("<Shift-Return>", self.search_previous)
+        self.search_bar.bind("<Up>", self.search_previous)
+        self.search_bar.bind("<Escape>", self.clear_search)
+        self.search_bar.focus_set()
+
+    def _visible_range(self):
+        """
+        Returns the first and last lines of the output that are visible in the text area.
+
+        Returns:
+            tuple: The zero-based first and last visible lines.
+        """
+        first = int(self.text_area.index("@0,0").split(".")[0]) - 1
+        last = int(self.text_area.index(f"@0,{self._text_size()[1]}").split(".")[0]) - 1
+        if self.store is not None:
+            first += self.helpers.window_start
+            last += self.helpers.window_start
+        return first, last
+
+    def _text_index(self, offset):
+        """
+        Converts a global offset of the search index into an index of the text area.
+
+        Args:
+            offset (int): The global offset.
+
+        Returns:
+            str or None: The index, or None if the offset is not in the text area.
+        """
+        location = self.search_index.locate(offset)
+        if location is None:
+            return None
+        line, column = location
+        if self.store is not None:
+            if not self.helpers.window_start <= line < self.helpers.window_stop:
+                return None
+            line -= self.helpers.window_start
+        return f"{line + 1}.{column}"
+
+    def _show_match(self):
+        """Scrolls the current match into view and highlights the visible matches."""
+        starts, ends = self.helpers.search_matches
+        start = self._text_index(starts[self.helpers.search_current])
+        if start is None and self.store is not None:
+            location = self.search_index.locate(starts[self.helpers.search_current])
+            if location is not None:
+                self._render_window(location[0] - self._visible_lines() // 2)
+                start = self._text_index(starts[self.helpers.search_current])
+        if start is not None:
+            self.text_area.see(start)
+        self._highlight_visible()
+
+    def _highlight_visible(self):
+        """Highlights the matches of the current search in the visible lines only."""
+        self.helpers.highlight_job = None
+        self.text_area.tag_remove("search", "1.0", tk.END)
+        self.text_area.tag_remove("search_current", "1.0", tk.END)
+        if not self.helpers.search_matches:
+            return
+        starts, ends = self.helpers.search_matches
+        first, last = self._visible_range()
+        low = bisect.bisect_left(starts, self.search_index.offset(first))
+        high = bisect.bisect_left(starts, self.search_index.offset(last + 1))
+        for number in range(low, high):
+            start, end = self._text_index(starts[number]), self._text_index(ends[number])
+            if start is not None and end is not None:
+                tag = "search_current" if number == self.helpers.search_current else "search"
+                self.text_area.tag_add(tag, start, end)
+        self.text_area.tag_raise("search")
+        self.text_area.tag_raise("search_current")
+
+    def progress(self, total=None, **kwargs):
+        """
+        Starts a progress bar, or a status line if the total is unknown, that redraws the last line.
+
+        Args:
+            total (int, optional): The value of a complete bar.
+            **kwargs: Keyword arguments for `ProgressBar`, such as `width`, `label` or `min_interval`.
+
+        Returns:
+            ProgressBar: The bar, to be updated with `update` and ended with `close`.
+
+        Raises:
+            RuntimeError: If the console was not created with `rewrite_lines=True`.
+        """
+        if self.line_editor is None:
+            raise RuntimeError("Console must be created with rewrite_lines=True to draw progress bars")
+        return ProgressBar(self, total, **kwargs)
+
+    def run_process(self, argv, **kwargs):
+        """
+        Runs a subprocess and streams its stdout and stderr into the console without blocking the event loop.
+
+        Args:
+            argv (list): The program and its arguments.
+            **kwargs: Keyword arguments for `ConsoleProcess`, such as `merge_stderr`, `chunk_size`, `on_exit` or `cwd`.
+
+        Returns:
+            ConsoleProcess: The running process, which can be cancelled and whose `future` is resolved with the exit
+            code.
+        """
+        return ConsoleProcess(self, argv, **kwargs).start()
+
+    def repl(self, namespace=None, **kwargs):
+        """
+        Runs an interactive Python interpreter in the console, which evaluates statements off the Tkinter thread.
+
+        Args:
+            namespace (dict, optional): The globals the statements are evaluated in.
+            **kwargs: Keyword arguments for `ConsoleRepl`, such as `isolated`, `ps1`, `banner` or `on_exit`.
+
+        Returns:
+            ConsoleRepl: The running REPL, which can be interrupted or stopped and whose `future` is resolved once it
+            has ended.
+
+        Raises:
+            RuntimeError: If the console was not created with `threadsafe=True`.
+        """
+        return ConsoleRepl(self, namespace, **kwargs).start()
+
+    def serve(self, **kwargs):
+        """
+        Listens on a local socket and writes the messages other processes send to it to the console.
+
+        Args:
+            **kwargs: Keyword arguments for `ConsoleServer`, such as `path`, `port`, `framing` or `prefix`.
+
+        Returns:
+            ConsoleServer: The running server, whose `address` is the address it listens on and which can be closed.
+
+        Raises:
+            RuntimeError: If the server is threaded and the console was not created with `threadsafe=True`.
+        """
+        return ConsoleServer(self, **kwargs).start()
+
+    def record(self, path, **kwargs):
+        """
+        Starts recording what is written to the console and the inputs it takes, with their times, until the returned
+        recorder is closed.
+
+        Args:
+            path (str): The path of the recording.
+            **kwargs: Keyword arguments for `SessionRecorder`, such as `compress`.
+
+        Returns:
+            SessionRecorder: The recorder, to be closed to end the recording.
+        """
+        if self.recorder is not None:
+            self.recorder.close()
+        self.recorder = SessionRecorder(path, **kwargs)
+        return self.recorder
+
+    def replay(self, source, **kwargs):
+        """
+        Replays a recording into the console from the event loop.
+
+        Args:
+            source (str or iterable): The path of a recording, or its events as yielded by `read_session`.
+            **kwargs: Keyword arguments for `SessionReplay`, such as `speed` or `on_input`.
+
+        Returns:
+            SessionReplay: The running replay, which can be cancelled and whose `future` is resolved with its summary.
+        """
+        return SessionReplay(self, source, **kwargs).start()
+
+    def save(self, path, **kwargs):
+        """
+        Saves the scrollback to a file in chunks, without freezing the console.
+
+        Args:
+            path (str): The path of the file; paths ending in ".gz" are gzip-compressed.
+            **kwargs: Additional keyword arguments for `ConsoleExport`, such as `timestamps` or `on_progress`.
+
+        Returns:
+            ConsoleExport: The running export, whose `future` is resolved with the number of saved lines.
+        """
+        return ConsoleExport(self, path, **kwargs).start()
+
+    def export_dialog(self, event=None):
+        """Asks for a file name and saves the scrollback to it, as the 'Export...' menu entry does."""
+        path = filedialog.asksaveasfilename(
+            parent=self.parent, title="Export", defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("Gzip files", "*.gz"), ("All files", "*")]
+        )
+        if path:
+            self.save(path, timestamps=self.line_times is not None)
+
     def stop(self):
         """Destroys the parent window, effectively closing the console."""
         self.parent.destroy()
 
+    def _on_destroy(self, event):
+        """
+        Stops the worker threads of the completion engine and closes the history file once the console is destroyed.
+        The entry field and the search bar carry the console's binding tag, so their own <Destroy> events are ignored.
+        """
+        if str(event.widget) != str(self):
+            return
+        if self.completion is not None:
+            self.completion.close()
+        if self.history is not None:
+            self.history.close()
+
     def print(self, *args, **kwargs):
         """
         Prints the provided text in the console's text area.
@@ -159,9 +1416,11 @@ class Console(tk.Frame):
             *args: Variable number of arguments to be concatenated and printed.
             **kwargs: Optional keyword arguments for controlling the print behavior.
         """
+        if self.instruments is not None:
+            self.instruments.count("prints")
         text = "".join(map(str, args))
         end = kwargs.get("end", "\n")
-        self.write_output(text + end)
+        self.write_output(text + end, kwargs.get("tag"))
 
     def show_edit_menu(self, event):
         """Shows the context menu (right-click menu) for copy/paste actions."""
@@ -169,78 +1428,416 @@ class Console(tk.Frame):
         clicked_widget = self.parent.winfo_containing(event.x_root, event.y_root)
         if clicked_widget == self.text_area and self.text_area.tag_ranges(tk.SEL):
             self.edit_menu.add_command(label="Copy", command=self.copy_text, accelerator="Ctrl+Shift+C")
+        if clicked_widget == self.text_area:
+            self.edit_menu.add_command(label="Export...", command=self.export_dialog)
         if clicked_widget == self.entry:
             self.edit_menu.add_command(label="Paste", command=self.paste_text, accelerator="Ctrl+Shift+V")
         if self.edit_menu.index("end") != -1:
             self.edit_menu.post(event.x_root, event.y_root)
-            self.parent.bind("<Button-1>", lambda event: self.edit_menu.unpost())
 
     def copy_text(self, event=None):
         """Copies the selected text to the clipboard."""
-        selected_text = self.text_area.get(tk.SEL_FIRST, tk.SEL_LAST)
+        stats = self.instruments
+        start = time.perf_counter() if stats is not None else 0.0
+        if self.store is None:
+            selected_text = self.text_area.get(tk.SEL_FIRST, tk.SEL_LAST)
+        else:
+            self._save_virtual_selection()
+            selected_text = self._virtual_selection_text() if self.helpers.virtual_selection else ""
         if selected_text:
             self.parent.clipboard_clear()
             self.parent.clipboard_append(selected_text)
+        if stats is not None:
+            stats.count("copies")
+            stats.observe("copy_text", time.perf_counter() - start)
 
     def paste_text(self, event=None):
         """Pastes text from the clipboard into the entry field."""
+        stats = self.instruments
+        start = time.perf_counter() if stats is not None else 0.0
         clipboard_text = self.parent.clipboard_get()
         if clipboard_text:
             self.entry.insert(tk.INSERT, clipboard_text)
+        if stats is not None:
+            stats.count("pastes")
+            stats.observe("paste_text", time.perf_counter() - start)
 
     def input(self, prompt=""):
         """
         Takes user input via the entry field and returns the entered text.
 
+        This method runs a nested event loop until the input is entered; use `input_async` or `ainput` to take input
+        without blocking the caller. A queued input is returned at once, without showing the entry field.
+
         Args:
             prompt (str, optional): A prompt message to be displayed before input.
 
         Returns:
             str: The user-entered text.
         """
+        if self.input_queue:
+            return self._take_queued_input(prompt)
+        self.input_async(prompt)
+        if self.helpers.pooled_entry is not None:
+            self.wait_variable(self.helpers.entry_closed)
+        else:
+            self.parent.wait_window(self.entry)
+        user_input_ = self.helpers.user_input_var.get()
+        return user_input_
 
-        def callback():
-            """
-            Callback function to track the text cursor position in the entry field.
-            """
-            self.helpers.text_cursor_position = self.entry.index(tk.INSERT)
+    def input_async(self, prompt="", callback=None):
+        """
+        Shows the entry field for user input and returns immediately, or returns a resolved future if an input is
+        queued.
 
-        def on_enter(event=None):
-            """
-            Callback function to handle the 'Return' or 'Enter' key press event.
-            """
-            self.print(self.helpers.user_input_var.get())
-            self.entry.destroy()
-            self.parent.unbind("<Button-1>")
-            self.entry = None
+        Must be called from the Tkinter thread, and only while no other input is pending.
+
+        Args:
+            prompt (str, optional): A prompt message to be displayed before input.
+            callback (callable, optional): A function called with the user-entered text once it is entered.
+
+        Returns:
+            concurrent.futures.Future: A future resolved with the user-entered text. Cancelling it removes the entry
+            field.
+        """
 
-        def prevent_text_cursor_movement(event=None):
+        def on_cancel(future):
             """
-            Prevent text cursor movement in the entry field.
+            Remove the entry field when the future is cancelled.
             """
-            self.entry.icursor(self.helpers.text_cursor_position)
+            if future.cancelled() and self.helpers.input_future is future:
+                self._close_entry()
 
+        if self.entry is not None:
+            raise RuntimeError("Another input is already pending")
+        if self.input_queue:
+            future = concurrent.futures.Future()
+            future.set_result(self._take_queued_input(prompt))
+            if callback is not None:
+                callback(future.result())
+            return future
+        stats = self.instruments
+        start = time.perf_counter() if stats is not None else 0.0
+        future = concurrent.futures.Future()
+        self.helpers.input_future = future
+        self.helpers.input_callback = callback
+        self._resume_output()
         if prompt:
             self.print(prompt, end="")
-        self.parent.update_idletasks()
-        yview = round(self.text_area.yview()[1], 1)
-        index = float(self.text_area.index(tk.CURRENT)) // (self.text_area.winfo_height() // self.font.measure("0"))
+        self.flush()
+        if self.store is not None:
+            self.go_to_end(None)
+        follow = self._follows_output()
+        if self.helpers.pooled_entry is not None:
+            self.entry = self.helpers.pooled_entry
+            self.helpers.user_input_var.set("")
+            self.entry.configure(insertwidth=1.5 * self._char_width())
+        else:
+            self._create_entry()
+        if self.helpers.typed_ahead:
+            self.helpers.user_input_var.set(self.helpers.typed_ahead)
+            self.entry.icursor(tk.END)
+            self.helpers.typed_ahead = ""
+        self.text_area.window_create(tk.INSERT, padx=0, pady=0, stretch=1, window=self.entry)
+        if follow:
+            self.text_area.see(tk.END)
+        self.adjust_on_configure(None)
+        self.entry.focus_set()
+        future.add_done_callback(on_cancel)
+        if stats is not None:
+            stats.count("inputs")
+            stats.observe("input_setup", time.perf_counter() - start)
+        return future
+
+    def _create_entry(self):
+        """Creates the entry field with its variable and bindings, and keeps it for reuse if `reuse_entry` is set."""
         self.helpers.user_input_var = tk.StringVar()
         self.entry = tk.Entry(self.text_area, textvariable=self.helpers.user_input_var, font=self.font, relief=tk.FLAT,
                               borderwidth=0, border=0.0, insertborderwidth=0, selectborderwidth=0, highlightthickness=0,
                               background=self.background, foreground=self.foreground, insertbackground=self.foreground,
-                              insertwidth=1.5 * self.font.measure("0"), insertofftime=0
+                              insertwidth=1.5 * self._char_width(), insertofftime=0
                               )
         self.entry.pack(side=tk.LEFT, fill="x", padx=0, pady=0, ipady=0, ipadx=0, expand=True)
-        self.text_area.window_create(tk.INSERT, padx=0, pady=0, stretch=1, window=self.entry)
-        if yview < index or yview == 1.0:
-            self.text_area.see(tk.END)
-        self.adjust_on_configure(None)
-        self.helpers.user_input_var.trace("w", lambda name, index, mode: callback())
-        self.entry.bind("<Return>", on_enter)
-        self.entry.bind("<KP_Enter>", on_enter)
-        self.parent.bind("<Button-1>", prevent_text_cursor_movement)
-        self.entry.focus_set()
-        self.parent.wait_window(self.entry)
-        user_input_ = self.helpers.user_input_var.get()
+        self._scope_bindings(self.entry)
+        self.helpers.user_input_var.trace("w", lambda name, index, mode: self._on_entry_change())
+        self.entry.bind("<Return>", self.submit_input)
+        self.entry.bind("<KP_Enter>", self.submit_input)
+        if self.history is not None:
+            self.entry.bind("<Up>", self.history_previous)
+            self.entry.bind("<Down>", self.history_next)
+            self.entry.bind("<Control-r>", self.history_search)
+            self.entry.bind("<Escape>", self.history_cancel)
+        if self.completion is not None:
+            self.entry.bind("<Tab>", self.complete_input)
+        if self.reuse_entry:
+            self.helpers.pooled_entry = self.entry
+            self.helpers.entry_closed = tk.BooleanVar(self)
+
+    def _on_entry_change(self):
+        """Tracks the text cursor position in the entry field and cancels a running completion when the text changes."""
+        if self.entry is None:
+            return
+        self.helpers.text_cursor_position = self.entry.index(tk.INSERT)
+        if self.completion is not None:
+            self.completion.cancel()
+
+    async def ainput(self, prompt=""):
+        """
+        Takes user input via the entry field without blocking the event loop.
+
+        The Tkinter event loop must run on the same thread as the asyncio event loop, for example with
+        `TkConsole.aio.run`.
+
+        Args:
+            prompt (str, optional): A prompt message to be displayed before input.
+
+        Returns:
+            str: The user-entered text.
+        """
+        return await asyncio.wrap_future(self.input_async(prompt))
+
+    def push_input(self, *values):
+        """
+        Queues inputs for the next calls of `input`, `input_async` and `ainput`, which return them without showing the
+        entry field. May be called from any thread.
+
+        Args:
+            *values (str): The inputs, in the order they are taken.
+        """
+        self.input_queue.extend(values)
+
+    def _take_queued_input(self, prompt):
+        """
+        Takes the next queued input and echoes it after the prompt, as entering it in the entry field does.
+
+        Args:
+            prompt (str): The prompt message displayed before the input.
+
+        Returns:
+            str: The input.
+        """
+        user_input_ = self.input_queue.popleft()
+        self.write_output(f"{prompt}{user_input_}\n")
+        if self.history is not None:
+            self.history.add(user_input_)
+        if self.recorder is not None:
+            self.recorder.input(user_input_)
+        if self.instruments is not None:
+            self.instruments.count("queued_inputs")
         return user_input_
+
+    def _on_type_ahead(self, event):
+        """
+        Records a key typed while no input is pending: printable characters are added to the typed text, 'BackSpace'
+        removes its last character and 'Return' queues it as an input.
+        """
+        if self.entry is not None or self.search_bar is not None:
+            return None
+        if event.keysym in ("Return", "KP_Enter"):
+            self.input_queue.append(self.helpers.typed_ahead)
+            self.helpers.typed_ahead = ""
+        elif event.keysym == "BackSpace":
+            self.helpers.typed_ahead = self.helpers.typed_ahead[:-1]
+        elif event.char and event.char.isprintable():
+            self.helpers.typed_ahead += event.char
+        else:
+            return None
+        return "break"
+
+    def submit_input(self, event=None):
+        """
+        Submits the text of the entry field as the pending input, as pressing 'Return' or 'Enter' does.
+        """
+        if self.entry is None:
+            return
+        user_input_ = self.helpers.user_input_var.get()
+        self.print(user_input_)
+        if self.history is not None:
+            self.history.add(user_input_)
+        if self.recorder is not None:
+            self.recorder.input(user_input_)
+        future, callback = self.helpers.input_future, self.helpers.input_callback
+        self._close_entry()
+        if future is not None and future.set_running_or_notify_cancel():
+            future.set_result(user_input_)
+        if callback is not None:
+            callback(user_input_)
+
+    def history_previous(self, event=None):
+        """
+        Shows the previous history entry that starts with the text typed before navigating, as pressing 'Up' does.
+        """
+        if self.entry is None or self.history is None:
+            return "break"
+        self.helpers.history_search = None
+        text = self.helpers.user_input_var.get()
+        if self.helpers.history_matches is None or text != self.helpers.history_text:
+            self.helpers.history_typed = text
+            self.helpers.history_matches = self.history.matches(text)
+            self.helpers.history_position = -1
+        if self.helpers.history_position + 1 < len(self.helpers.history_matches):
+            self.helpers.history_position += 1
+            self._show_history(self.helpers.history_matches[self.helpers.history_position])
+        return "break"
+
+    def history_next(self, event=None):
+        """
+        Shows the next history entry that starts with the text typed before navigating, or that text after the most
+        recent entry, as pressing 'Down' does.
+        """
+        if self.entry is None or self.helpers.history_matches is None:
+            return "break"
+        if self.helpers.user_input_var.get() != self.helpers.history_text or self.helpers.history_position < 0:
+            return "break"
+        self.helpers.history_position -= 1
+        if self.helpers.history_position < 0:
+            self._show_history(self.helpers.history_typed)
+        else:
+            self._show_history(self.helpers.history_matches[self.helpers.history_position])
+        return "break"
+
+    def history_search(self, event=None):
+        """
+        Shows the most recent history entry that contains the typed text, or an older one on each repetition, as
+        pressing 'Ctrl+R' does.
+        """
+        if self.entry is None or self.history is None:
+            return "break"
+        self.helpers.history_matches = None
+        text = self.helpers.user_input_var.get()
+        if self.helpers.history_search is None or text != self.helpers.history_text:
+            self.helpers.history_typed = text
+            self.helpers.history_search = (text, None)
+        query, before = self.helpers.history_search
+        found = self.history.search(query, before)
+        if found is None:
+            self.entry.bell()
+            return "break"
+        self.helpers.history_search = (query, found[0])
+        self._show_history(found[1])
+        return "break"
+
+    def history_cancel(self, event=None):
+        """Restores the text typed before navigating the history, as pressing 'Escape' does."""
+        if self.entry is None:
+            return "break"
+        if self.helpers.history_typed is not None and self.helpers.user_input_var.get() == self.helpers.history_text:
+            self._show_history(self.helpers.history_typed)
+        self._reset_history()
+        return "break"
+
+    def _show_history(self, text):
+        """Replaces the text of the entry field with a history entry and moves the text cursor to its end."""
+        self.helpers.history_text = text
+        self.helpers.user_input_var.set(text)
+        self.entry.icursor(tk.END)
+        self.entry.xview_moveto(1.0)
+        self.helpers.text_cursor_position = self.entry.index(tk.INSERT)
+
+    def _reset_history(self):
+        """Ends the navigation of the history."""
+        self.helpers.history_typed = None
+        self.helpers.history_text = None
+        self.helpers.history_matches = None
+        self.helpers.history_position = -1
+        self.helpers.history_search = None
+
+    def complete_input(self, event=None):
+        """
+        Completes the token before the text cursor in the entry field, as pressing 'Tab' does.
+
+        A single completion is inserted; otherwise the longest common prefix of the completions is inserted if it
+        extends the token, and the completions are listed in a popup if it does not. Typing while the completers run
+        cancels the completion.
+        """
+        if self.entry is None or self.completion is None:
+            return "break"
+        cursor = self.entry.index(tk.INSERT)
+        text = self.helpers.user_input_var.get()[:cursor]
+        self.completion.request(text, lambda completions: self._show_completions(text, completions))
+        return "break"
+
+    def _show_completions(self, text, completions):
+        """
+        Inserts or lists the completions of a token.
+
+        Args:
+            text (str): The text of the entry field before the text cursor when the completion was requested.
+            completions (list): The (start, candidate) completions.
+        """
+        if self.entry is None:
+            return
+        if not completions:
+            self.entry.bell()
+            return
+        if len(completions) == 1:
+            self._insert_completion(*completions[0])
+            return
+        starts = {start for start, _ in completions}
+        if len(starts) == 1:
+            start = starts.pop()
+            common = os.path.commonprefix([candidate for _, candidate in completions])
+            if len(common) > len(text) - start:
+                self._insert_completion(start, common)
+                return
+        if self.completion_popup is not None:
+            self.completion_popup.close()
+        self.completion_popup = CompletionPopup(self, completions, self._insert_completion, self.completion_page_size)
+
+    def _insert_completion(self, start, candidate):
+        """
+        Replaces the token before the text cursor in the entry field with a completion.
+
+        Args:
+            start (int): The index of the first character of the token.
+            candidate (str): The completion.
+        """
+        if self.entry is None:
+            return
+        self.entry.delete(start, tk.INSERT)
+        self.entry.insert(start, candidate)
+        self.entry.icursor(start + len(candidate))
+        self.helpers.text_cursor_position = self.entry.index(tk.INSERT)
+
+    def _close_entry(self):
+        """Removes the entry field and releases the pending input."""
+        if self.completion is not None:
+            self.completion.cancel()
+        if self.completion_popup is not None:
+            self.completion_popup.close()
+        if self.helpers.pooled_entry is not None:
+            self.text_area.configure(state="normal")
+            self.text_area.delete(str(self.entry))
+            self.text_area.configure(state="disabled")
+        else:
+            self.entry.destroy()
+        self.text_area.focus_set()
+        self.entry = None
+        self.helpers.text_cursor_position = None
+        self.helpers.input_future = None
+        self.helpers.input_callback = None
+        self._reset_history()
+        if self.line_editor is not None:
+            self.line_editor.reset()
+        if self.helpers.entry_closed is not None:
+            self.helpers.entry_closed.set(True)
+
+
+def _drop_lines(segments, count):
+    """
+    Returns output segments without their first lines.
+
+    Args:
+        segments (list): The (text, tag) pairs.
+        count (int): The number of lines to be dropped.
+
+    Returns:
+        list: The (text, tag) pairs after the first `count` newlines.
+    """
+    for position, (text, tag) in enumerate(segments):
+        newlines = text.count("\n")
+        if newlines < count:
+            count -= newlines
+            continue
+        return [(text.split("\n", count)[count], tag)] + segments[position + 1:]
+    return []
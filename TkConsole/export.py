@@ -0,0 +1,183 @@
+"""
+TkConsole Export
+
+This module saves the scrollback of a console to a file without freezing it. The lines are read and written in chunks,
+one chunk per Tkinter tick, from the text area or, in virtual mode, from the backing store, so that the whole
+scrollback is never copied into a single string and the console keeps redrawing and taking input while it is saved.
+
+Classes:
+    ConsoleExport: An export of the scrollback of a console to a plain-text or gzip file.
+"""
+
+import concurrent.futures
+import datetime
+import gzip
+import itertools
+import os
+
+
+class ConsoleExport:
+    """
+    An export of the scrollback of a console to a plain-text or gzip file.
+
+    The lines present when the export starts are saved. Lines trimmed from the scrollback before the export reaches
+    them are skipped and counted in `skipped`.
+
+    Args:
+        console (Console): The console whose scrollback is saved.
+        path (str): The path of the file.
+        compress (bool, optional): Whether the file is gzip-compressed. Defaults to True for paths ending in ".gz".
+        timestamps (bool): Whether every line is prefixed with the time it was written; requires a console created
+            with `timestamps=True`.
+        chunk_lines (int): The number of lines saved per tick.
+        encoding (str): The encoding of the file.
+        on_progress (callable, optional): A function called with the number of saved lines and the total number of
+            lines after every chunk.
+        on_done (callable, optional): A function called with the number of saved lines once the file is complete.
+
+    Attributes:
+        console (Console): The console whose scrollback is saved.
+        path (str): The path of the file.
+        compress (bool): Whether the file is gzip-compressed.
+        timestamps (bool): Whether every line is prefixed with the time it was written.
+        chunk_lines (int): The number of lines saved per tick.
+        total (int): The number of lines to be saved.
+        written (int): The number of lines saved so far.
+        skipped (int): The number of lines trimmed from the scrollback before they were saved.
+        future (concurrent.futures.Future): A future resolved with the number of saved lines, or cancelled with the
+            export.
+    """
+
+    def __init__(self, console, path, compress=None, timestamps=False, chunk_lines=2000, encoding="utf-8",
+                 on_progress=None, on_done=None):
+        """
+        Initialize the export with the console and the file.
+
+        Args:
+            console (Console): The console whose scrollback is saved.
+            path (str): The path of the file.
+            compress (bool, optional): Whether the file is gzip-compressed.
+            timestamps (bool): Whether every line is prefixed with the time it was written.
+            chunk_lines (int): The number of lines saved per tick.
+            encoding (str): The encoding of the file.
+            on_progress (callable, optional): A function called with the number of saved lines and the total number
+                of lines after every chunk.
+            on_done (callable, optional): A function called with the number of saved lines once the file is complete.
+        """
+        if timestamps and console.line_times is None:
+            raise ValueError("Timestamps require a console created with timestamps=True")
+        self.console = console
+        self.path = path
+        self.compress = path.endswith(".gz") if compress is None else compress
+        self.timestamps = timestamps
+        self.chunk_lines = chunk_lines
+        self.encoding = encoding
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.total = 0
+        self.written = 0
+        self.skipped = 0
+        self.future = concurrent.futures.Future()
+        self._file = None
+        self._trimmed = 0
+        self._job = None
+
+    def start(self):
+        """
+        Opens the file and begins saving. Must be called from the Tkinter thread.
+
+        Returns:
+            ConsoleExport: The export itself, which does nothing if its future was cancelled.
+        """
+        if self.future.cancelled():
+            return self
+        self._file = gzip.open(self.path, "wb") if self.compress else open(self.path, "wb")
+        self.console.flush()
+        self.total = self.console.line_count
+        if self.total and not self._text(self.total - 1, self.total):
+            self.total -= 1
+        self._trimmed = self.console.helpers.trimmed_lines
+        self._job = self.console.after_idle(self._step)
+        return self
+
+    def cancel(self):
+        """Stops saving, removes the incomplete file and cancels the future."""
+        self.future.cancel()
+        if self._file is None:
+            return
+        if self._job is not None:
+            self.console.after_cancel(self._job)
+            self._job = None
+        self._close()
+        os.remove(self.path)
+
+    def _step(self):
+        """
+        Saves one chunk of lines and schedules the next one. The future stays pending until the file is complete, so
+        that cancelling it, directly or with `cancel`, stops the export.
+        """
+        self._job = None
+        if self.future.cancelled():
+            self.cancel()
+            return
+        shift = self.console.helpers.trimmed_lines - self._trimmed
+        start = self.written + self.skipped - shift
+        if start < 0:
+            self.skipped -= start
+            start = 0
+        stop = start + max(0, min(self.chunk_lines, self.total - self.written - self.skipped))
+        try:
+            if stop > start:
+                self._file.write(self._chunk(start, stop).encode(self.encoding, errors="replace"))
+        except OSError as error:
+            self._close()
+            self.future.set_exception(error)
+            return
+        self.written += stop - start
+        if self.on_progress is not None:
+            self.on_progress(self.written, self.total)
+            if self._file is None:
+                return
+        if self.written + self.skipped < self.total:
+            self._job = self.console.after(1, self._step)
+            return
+        self._close()
+        if not self.future.set_running_or_notify_cancel():
+            os.remove(self.path)
+            return
+        self.future.set_result(self.written)
+        if self.on_done is not None:
+            self.on_done(self.written)
+
+    def _chunk(self, start, stop):
+        """
+        Returns a range of lines of the scrollback, each terminated with a newline.
+
+        Args:
+            start (int): The zero-based number of the first line.
+            stop (int): The zero-based number of the line after the last one.
+
+        Returns:
+            str: The lines, prefixed with their times if `timestamps` is set.
+        """
+        text = self._text(start, stop)
+        if not text.endswith("\n"):
+            text += "\n"
+        if not self.timestamps:
+            return text
+        times = itertools.islice(self.console.line_times, start, stop)
+        return "".join(
+            f"{datetime.datetime.fromtimestamp(time).isoformat(' ', 'milliseconds')} {line}\n"
+            for time, line in zip(times, text.split("\n"))
+        )
+
+    def _text(self, start, stop):
+        """Returns a range of lines of the scrollback from the backing store or the text area."""
+        if self.console.store is not None:
+            return self.console.store.text(start, stop)
+        return self.console.text_area.get(f"{start + 1}.0", f"{stop}.end")
+
+    def _close(self):
+        """Closes the file."""
+        self._file.close()
+        self._file = None
@@ -0,0 +1,382 @@
+"""
+TkConsole Headless
+
+This module provides a console without a display. It offers the output, input, clipboard and scrolling API of the
+Tkinter console over an in-memory line store and does not import Tkinter, so that the same application code runs on
+servers, in continuous integration and under load tests at the speed of the memory buffer.
+
+Classes:
+    HeadlessConsole: A console that keeps its output in memory and takes its input from a scripted source.
+"""
+
+import asyncio
+import bisect
+import collections
+import concurrent.futures
+import threading
+from .lines import LineEditor, ProgressBar
+from .record import SessionRecorder, SessionReplay
+from .store import LineStore
+
+
+class HeadlessConsole:
+    """
+    A console that keeps its output in memory and takes its input from a scripted source.
+
+    Output may be written from any thread. Tags are accepted for compatibility with `Console` and ignored.
+
+    Args:
+        **kwargs: Keyword arguments for configuring the console.
+
+    Attributes:
+        height (int): The number of lines in the view.
+        max_lines (int or None): The maximum number of lines kept in the scrollback.
+        max_bytes (int or None): The maximum number of bytes kept in the scrollback.
+        trim_slack (float): The fraction by which the scrollback may exceed its limit before it is trimmed.
+        store (LineStore): The scrollback.
+        line_editor (LineEditor or None): The editor of the last line, if `rewrite_lines` is enabled.
+        input_source (iterator or callable): The scripted input, as an iterator of strings or a function called with
+            the prompt.
+        input_queue (collections.deque): The inputs pushed with `push_input`, taken before the scripted input.
+        echo_input (bool): Whether the input is printed after the prompt, as the entry field leaves it in `Console`.
+        top (int): The first line of the view.
+        selection (tuple or None): The selected range as (line, column) pairs of `store`.
+        clipboard (str): The clipboard of the console.
+        entry_text (str): The text pasted into the entry field, which precedes the next input.
+        recorder (SessionRecorder or None): The recording of the output and inputs, while `record` is active.
+        stopped (bool): Whether the console was stopped.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the headless console.
+
+        Args:
+            **kwargs: Keyword arguments for configuring the console.
+
+        Attributes:
+            height (int): The number of lines in the view.
+            max_lines (int or None): The maximum number of lines kept in the scrollback.
+            max_bytes (int or None): The maximum number of bytes kept in the scrollback.
+            trim_slack (float): The fraction by which the scrollback may exceed its limit before it is trimmed.
+            store (LineStore): The scrollback.
+            line_editor (LineEditor or None): The editor of the last line, if `rewrite_lines` is enabled.
+            input_source (iterator or callable): The scripted input.
+            input_queue (collections.deque): The inputs pushed with `push_input`.
+            echo_input (bool): Whether the input is printed after the prompt.
+            top (int): The first line of the view.
+            selection (tuple or None): The selected range as (line, column) pairs of `store`.
+            clipboard (str): The clipboard of the console.
+            entry_text (str): The text pasted into the entry field, which precedes the next input.
+            recorder (SessionRecorder or None): The recording of the output and inputs.
+            stopped (bool): Whether the console was stopped.
+        """
+        self.height = kwargs.get("height", 24)
+        self.max_lines = kwargs.get("max_lines", None)
+        self.max_bytes = kwargs.get("max_bytes", None)
+        self.trim_slack = kwargs.get("trim_slack", 0.1)
+        self.store = LineStore()
+        self.line_editor = LineEditor() if kwargs.get("rewrite_lines", False) else None
+        source = kwargs.get("input_source", ())
+        self.input_source = source if callable(source) else iter(source)
+        self.input_queue = collections.deque()
+        self.echo_input = kwargs.get("echo_input", True)
+        self.top = 0
+        self.selection = None
+        self.clipboard = ""
+        self.entry_text = ""
+        self.recorder = None
+        self.stopped = False
+        self._lock = threading.RLock()
+
+    @property
+    def line_count(self):
+        """int: The number of lines in the scrollback."""
+        return len(self.store)
+
+    @property
+    def byte_count(self):
+        """int: The number of UTF-8 encoded bytes in the scrollback."""
+        return self.store.byte_count
+
+    @property
+    def text(self):
+        """str: The whole scrollback."""
+        return self.store.text(0, len(self.store))
+
+    def visible_text(self):
+        """
+        Returns the lines in the view.
+
+        Returns:
+            str: The lines from `top`, at most `height` of them.
+        """
+        return self.store.text(self.top, min(self.top + self.height, len(self.store)))
+
+    def _bottom(self):
+        """Returns the first line of the view scrolled to the end."""
+        return max(0, len(self.store) - self.height)
+
+    def go_to_home(self, event=None):
+        """Scrolls the view to the top of the scrollback."""
+        self.top = 0
+
+    def go_to_end(self, event=None):
+        """Scrolls the view to the end of the scrollback."""
+        self.top = self._bottom()
+
+    def page_up(self, event=None):
+        """Scrolls the view up by one page."""
+        self.top = max(0, self.top - self.height)
+
+    def page_down(self, event=None):
+        """Scrolls the view down by one page."""
+        self.top = min(self._bottom(), self.top + self.height)
+
+    def write_output(self, output, tag=None):
+        """
+        Writes the given output text to the scrollback, keeping the view at the end if it was there.
+
+        Args:
+            output (str): The text to be written.
+            tag (str, optional): Only recorded; accepted for compatibility with `Console`.
+        """
+        with self._lock:
+            if self.recorder is not None:
+                self.recorder.output(output, tag)
+            follow = self.top >= self._bottom()
+            if self.line_editor is not None:
+                replaced, segments = self.line_editor.feed([(output, None)])
+                if replaced is not None:
+                    self.store.clear_last_line()
+                    output = "".join(text for text, _ in segments)
+            self.store.append(output)
+            self._trim_scrollback()
+            if follow:
+                self.top = self._bottom()
+
+    def _trim_scrollback(self):
+        """Removes the oldest lines once the scrollback exceeds its limits by more than `trim_slack`."""
+        count = 0
+        if self.max_lines and len(self.store) > int(self.max_lines * (1 + self.trim_slack)):
+            count = len(self.store) - self.max_lines
+        if self.max_bytes and self.store.byte_count > int(self.max_bytes * (1 + self.trim_slack)):
+            target = self.store.starts[self.store.first] + self.store.byte_count - self.max_bytes
+            count = max(count, bisect.bisect_left(self.store.starts, target, self.store.first) - self.store.first)
+        count = min(count, len(self.store) - 1)
+        if not count:
+            return
+        self.store.trim(count)
+        self.top = max(0, self.top - count)
+        if self.selection:
+            (first_line, first_column), (last_line, last_column) = self.selection
+            self.selection = None
+            if last_line >= count:
+                first = (first_line - count, first_column) if first_line >= count else (0, 0)
+                self.selection = (first, (last_line - count, last_column))
+
+    def print(self, *args, **kwargs):
+        """
+        Prints the provided text to the scrollback.
+
+        Args:
+            *args: Variable number of arguments to be concatenated and printed.
+            **kwargs: Optional keyword arguments for controlling the print behavior.
+        """
+        text = "".join(map(str, args))
+        end = kwargs.get("end", "\n")
+        self.write_output(text + end, kwargs.get("tag"))
+
+    def progress(self, total=None, **kwargs):
+        """
+        Starts a progress bar, or a status line if the total is unknown, that redraws the last line.
+
+        Args:
+            total (int, optional): The value of a complete bar.
+            **kwargs: Keyword arguments for `ProgressBar`, such as `width`, `label` or `min_interval`.
+
+        Returns:
+            ProgressBar: The bar, to be updated with `update` and ended with `close`.
+
+        Raises:
+            RuntimeError: If the console was not created with `rewrite_lines=True`.
+        """
+        if self.line_editor is None:
+            raise RuntimeError("HeadlessConsole must be created with rewrite_lines=True to draw progress bars")
+        return ProgressBar(self, total, **kwargs)
+
+    def write_threadsafe(self, output, timeout=None, tag=None):
+        """
+        Writes the given output text from any thread.
+
+        Args:
+            output (str): The text to be written.
+            timeout (float, optional): Ignored; accepted for compatibility with `Console`.
+            tag (str, optional): Ignored; accepted for compatibility with `Console`.
+
+        Returns:
+            bool: True, since the text is always written.
+        """
+        self.write_output(output, tag)
+        return True
+
+    def print_threadsafe(self, *args, **kwargs):
+        """
+        Prints the provided text to the scrollback from any thread.
+
+        Args:
+            *args: Variable number of arguments to be concatenated and printed.
+            **kwargs: Optional keyword arguments for controlling the print behavior.
+
+        Returns:
+            bool: True, since the text is always written.
+        """
+        self.print(*args, **kwargs)
+        return True
+
+    def flush(self):
+        """Does nothing, since output is never buffered; accepted for compatibility with `Console`."""
+
+    def drain_output(self, max_items=None):
+        """
+        Does nothing, since output is never queued; accepted for compatibility with `Console`.
+
+        Returns:
+            int: 0, the number of queued writes taken.
+        """
+        return 0
+
+    def select(self, first, last):
+        """
+        Selects a range of the scrollback, as dragging over the text area does.
+
+        Args:
+            first (tuple): The (line, column) where the selection starts.
+            last (tuple): The (line, column) where the selection ends.
+        """
+        self.selection = (tuple(first), tuple(last))
+
+    def copy_text(self, event=None):
+        """Copies the selected text to the clipboard."""
+        if not self.selection:
+            return
+        (first_line, first_column), (last_line, last_column) = self.selection
+        with self._lock:
+            text = self.store.text(first_line, last_line + 1)
+            end = len(self.store.text(first_line, last_line)) + last_column
+        selected_text = text[first_column:end]
+        if selected_text:
+            self.clipboard = selected_text
+
+    def paste_text(self, event=None):
+        """Pastes text from the clipboard into the entry field, in front of the next input."""
+        self.entry_text += self.clipboard
+
+    def input(self, prompt=""):
+        """
+        Takes the next scripted input.
+
+        Args:
+            prompt (str, optional): A prompt message to be displayed before input.
+
+        Returns:
+            str: The pasted text followed by the next queued or scripted input.
+
+        Raises:
+            EOFError: If the scripted input is exhausted.
+        """
+        if prompt:
+            self.print(prompt, end="")
+        if self.input_queue:
+            value = self.input_queue.popleft()
+        elif callable(self.input_source):
+            value = self.input_source(prompt)
+        else:
+            value = next(self.input_source, None)
+        if value is None:
+            raise EOFError("The scripted input is exhausted")
+        user_input_ = self.entry_text + value
+        self.entry_text = ""
+        if self.recorder is not None:
+            self.recorder.input(user_input_)
+        if self.echo_input:
+            self.print(user_input_)
+        return user_input_
+
+    def input_async(self, prompt="", callback=None):
+        """
+        Takes the next scripted input and returns it as a resolved future.
+
+        Args:
+            prompt (str, optional): A prompt message to be displayed before input.
+            callback (callable, optional): A function called with the input.
+
+        Returns:
+            concurrent.futures.Future: A future resolved with the input, or with EOFError if it is exhausted.
+        """
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(self.input(prompt))
+        except EOFError as error:
+            future.set_exception(error)
+            return future
+        if callback is not None:
+            callback(future.result())
+        return future
+
+    def push_input(self, *values):
+        """
+        Queues inputs for the next calls of `input`, ahead of the scripted input. May be called from any thread.
+
+        Args:
+            *values (str): The inputs, in the order they are taken.
+        """
+        self.input_queue.extend(values)
+
+    def record(self, path, **kwargs):
+        """
+        Starts recording what is written to the console and the inputs it takes, with their times, until the returned
+        recorder is closed.
+
+        Args:
+            path (str): The path of the recording.
+            **kwargs: Keyword arguments for `SessionRecorder`, such as `compress`.
+
+        Returns:
+            SessionRecorder: The recorder, to be closed to end the recording.
+        """
+        if self.recorder is not None:
+            self.recorder.close()
+        self.recorder = SessionRecorder(path, **kwargs)
+        return self.recorder
+
+    def replay(self, source, **kwargs):
+        """
+        Replays a recording into the console in the calling thread.
+
+        Args:
+            source (str or iterable): The path of a recording, or its events as yielded by `read_session`.
+            **kwargs: Keyword arguments for `SessionReplay`, such as `speed` or `on_input`.
+
+        Returns:
+            SessionReplay: The finished replay, whose `future` is resolved with its summary.
+        """
+        replay = SessionReplay(self, source, **kwargs)
+        replay.run()
+        return replay
+
+    async def ainput(self, prompt=""):
+        """
+        Takes the next scripted input.
+
+        Args:
+            prompt (str, optional): A prompt message to be displayed before input.
+
+        Returns:
+            str: The input.
+        """
+        return await asyncio.wrap_future(self.input_async(prompt))
+
+    def stop(self):
+        """Stops the console, as closing the window of `Console` does."""
+        self.stopped = True
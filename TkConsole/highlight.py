@@ -0,0 +1,117 @@
+"""
+TkConsole Highlight
+
+This module highlights patterns in the output of a console. The patterns of a rule set are compiled into a single
+alternation of named groups, which is run once over the text of every write; the text is then split at the matches
+and tagged before it is inserted, so highlighting adds no call to the text area and its cost depends only on the size
+of the new text, never on the scrollback.
+
+Constants:
+    DEFAULT_RULES (list): Rules for error and warning lines, IPv4 addresses and durations.
+
+Classes:
+    Highlighter: A set of patterns mapped to styles, matched in one pass over new output.
+"""
+
+import re
+
+DEFAULT_RULES = [
+    (r"^.*\b(?:ERROR|Error|CRITICAL|FATAL|Traceback)\b.*$", {"foreground": "#F14C4C"}),
+    (r"^.*\b(?:WARNING|Warning|WARN)\b.*$", {"foreground": "#E5A50A"}),
+    (r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b", {"foreground": "#3B8EEA"}),
+    (r"\b\d+(?:\.\d+)?\s?(?:ns|us|µs|ms|s|min|h)\b", {"foreground": "#23D18B"}),
+]
+
+
+class Highlighter:
+    """
+    A set of patterns mapped to styles, matched in one pass over new output.
+
+    A rule is a pattern and a style: either the options of a new text area tag, such as {"foreground": "red"}, or the
+    name of an existing tag, such as "stderr". At every position the first rule that matches wins, and empty matches
+    are ignored. Since the patterns are joined into one expression, they may not use numbered backreferences, and
+    their flags apply to all of them; a pattern may use scoped inline flags such as `(?i:...)` instead. Matches do
+    not span two writes, and `^` and `$` match at the starts and ends of the lines of a write.
+
+    Args:
+        rules (list): The (pattern, style) pairs, in order of precedence.
+        flags (int): The flags of the combined expression.
+
+    Attributes:
+        rules (list): The (pattern, style) pairs.
+        regex (re.Pattern): The combined expression, with a group named after the tag of every rule.
+        tags (list): The tag of every rule.
+    """
+
+    def __init__(self, rules, flags=re.MULTILINE):
+        """
+        Initialize the highlighter and compile its rules.
+
+        Args:
+            rules (list): The (pattern, style) pairs, in order of precedence.
+            flags (int): The flags of the combined expression.
+
+        Raises:
+            re.error: If a pattern is invalid.
+        """
+        self.rules = list(rules)
+        self.tags = [style if isinstance(style, str) else f"highlight_{number}"
+                     for number, (_, style) in enumerate(self.rules)]
+        for pattern, _ in self.rules:
+            re.compile(pattern, flags)
+        self.regex = re.compile("|".join(f"(?P<highlight_{number}>{pattern})"
+                                         for number, (pattern, _) in enumerate(self.rules)), flags)
+        self._tags = {f"highlight_{number}": tag for number, tag in enumerate(self.tags)}
+
+    def styles(self):
+        """
+        Returns the tags the highlighter creates and their options.
+
+        Returns:
+            list: The (tag, options) pairs of the rules whose style is a dictionary of options.
+        """
+        return [(tag, style) for tag, (_, style) in zip(self.tags, self.rules) if not isinstance(style, str)]
+
+    def highlight(self, segments):
+        """
+        Splits output segments at the matches of the rules and adds the tag of the matching rule to their text.
+
+        Args:
+            segments (list): The (text, tag) pairs of one write, where tag is a tag name, a tuple of tag names or None.
+
+        Returns:
+            list: The (text, tag) pairs with the matches tagged, or the segments themselves if nothing matched.
+        """
+        text = segments[0][0] if len(segments) == 1 else "".join(text for text, _ in segments)
+        matches = [match for match in self.regex.finditer(text) if match.end() > match.start()]
+        if not matches:
+            return segments
+        highlighted = []
+        position = 0
+        index = 0
+        for segment, tag in segments:
+            end = position + len(segment)
+            cursor = position
+            while index < len(matches) and matches[index].start() < end:
+                match = matches[index]
+                start, stop = max(match.start(), cursor), min(match.end(), end)
+                if start > cursor:
+                    highlighted.append((text[cursor:start], tag))
+                highlighted.append((text[start:stop], _add_tag(tag, self._tags[match.lastgroup])))
+                cursor = stop
+                if match.end() > end:
+                    break
+                index += 1
+            if cursor < end:
+                highlighted.append((text[cursor:end], tag))
+            position = end
+        return highlighted
+
+
+def _add_tag(tag, highlight_tag):
+    """Returns a tag, or tuple of tags, with a highlight tag added."""
+    if tag is None:
+        return highlight_tag
+    if isinstance(tag, tuple):
+        return tag + (highlight_tag,)
+    return tag, highlight_tag
@@ -0,0 +1,251 @@
+"""
+TkConsole History
+
+This module provides the input history of a console. Entries are appended to a history file one line at a time, so
+recording an entry never rewrites the file; the file is read lazily on first use, deduplicated in memory and compacted
+in a background thread once it holds too many duplicates. A sorted copy of the entries serves as the index for prefix
+lookups, so that navigating the history by prefix is a binary search instead of a scan.
+
+Classes:
+    InputHistory: An input history backed by an append-only file.
+"""
+
+import bisect
+import os
+import threading
+
+
+def _escape(entry):
+    """Returns an entry as a single line of the history file."""
+    return entry.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _unescape(line):
+    """Returns the entry stored in a line of the history file."""
+    if "\\" not in line:
+        return line
+    return "\\".join(part.replace("\\n", "\n").replace("\\r", "\r") for part in line.split("\\\\"))
+
+
+class InputHistory:
+    """
+    An input history backed by an append-only file.
+
+    Entries are unique: entering an entry again moves it to the end of the history. Without a path, the history is
+    kept in memory only.
+
+    Args:
+        path (str, optional): The path of the history file.
+        max_entries (int): The maximum number of entries kept; the oldest ones are dropped.
+        compact_ratio (float): The ratio of lines in the history file to entries that triggers a compaction.
+
+    Attributes:
+        path (str or None): The path of the history file.
+        max_entries (int): The maximum number of entries kept.
+        compact_ratio (float): The ratio of lines in the history file to entries that triggers a compaction.
+    """
+
+    def __init__(self, path=None, max_entries=100000, compact_ratio=2.0):
+        """
+        Initialize the history; the history file is not read until the history is first used.
+
+        Args:
+            path (str, optional): The path of the history file.
+            max_entries (int): The maximum number of entries kept.
+            compact_ratio (float): The ratio of lines in the history file to entries that triggers a compaction.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.compact_ratio = compact_ratio
+        self._entries = None
+        self._first = 0
+        self._positions = {}
+        self._sorted = []
+        self._file = None
+        self._file_lines = 0
+        self._lock = threading.Lock()
+        self._compacting = None
+        self._thread = None
+
+    def __len__(self):
+        """Returns the number of entries in the history."""
+        self._load()
+        return len(self._positions)
+
+    def __iter__(self):
+        """Iterates over the entries from the oldest to the most recent one."""
+        self._load()
+        return (entry for entry in self._entries[self._first:] if entry is not None)
+
+    def _load(self):
+        """Reads the history file once, keeping the most recent occurrence of every entry."""
+        if self._entries is not None:
+            return
+        lines = []
+        if self.path is not None and os.path.exists(self.path):
+            with open(self.path, "rb") as file:
+                lines = file.read().decode("utf-8", errors="replace").split("\n")
+            if not lines[-1]:
+                lines.pop()
+        self._file_lines = len(lines)
+        # keeps the most recent occurrence of every line, most recent first
+        recent = list(dict.fromkeys(reversed(lines)))
+        recent.reverse()
+        self._entries = [_unescape(line) for line in recent[-self.max_entries:] if line]
+        self._positions = {entry: position for position, entry in enumerate(self._entries)}
+        self._sorted = sorted(self._entries)
+        self._maybe_compact()
+
+    def add(self, entry):
+        """
+        Records an entry at the end of the history and appends it to the history file.
+
+        Args:
+            entry (str): The entry to be recorded. Empty entries are ignored.
+        """
+        self._load()
+        if not entry or (self._positions and self._entries[-1] == entry):
+            return
+        position = self._positions.pop(entry, None)
+        if position is None:
+            bisect.insort(self._sorted, entry)
+        else:
+            self._entries[position] = None
+        self._positions[entry] = len(self._entries)
+        self._entries.append(entry)
+        while len(self._positions) > self.max_entries:
+            self._drop_oldest()
+        if len(self._entries) - self._first > 2 * len(self._positions):
+            self._rebuild()
+        if self.path is not None:
+            line = _escape(entry) + "\n"
+            with self._lock:
+                if self._compacting is not None:
+                    self._compacting.append(line)
+                if self._file is None:
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(line)
+                self._file.flush()
+                self._file_lines += 1
+            self._maybe_compact()
+
+    def _drop_oldest(self):
+        """Removes the oldest entry from the history."""
+        while self._entries[self._first] is None:
+            self._first += 1
+        entry = self._entries[self._first]
+        self._entries[self._first] = None
+        del self._positions[entry]
+        del self._sorted[bisect.bisect_left(self._sorted, entry)]
+
+    def _rebuild(self):
+        """Removes the slots of moved and dropped entries from the in-memory history."""
+        self._entries = [entry for entry in self._entries[self._first:] if entry is not None]
+        self._first = 0
+        self._positions = {entry: position for position, entry in enumerate(self._entries)}
+
+    def matches(self, prefix):
+        """
+        Returns the entries that start with a prefix.
+
+        Args:
+            prefix (str): The prefix; an empty prefix matches every entry.
+
+        Returns:
+            list: The matching entries, the most recent one first.
+        """
+        self._load()
+        if not prefix:
+            return [entry for entry in reversed(self._entries) if entry is not None]
+        start = bisect.bisect_left(self._sorted, prefix)
+        stop = bisect.bisect_left(self._sorted, prefix + "\U0010FFFF", start)
+        found = self._sorted[start:stop]
+        found.sort(key=self._positions.__getitem__, reverse=True)
+        return found
+
+    def search(self, query, before=None):
+        """
+        Finds the most recent entry that contains a query, as a reverse search does.
+
+        Args:
+            query (str): The text to be found.
+            before (int, optional): Only entries older than this position are searched, to continue a search.
+
+        Returns:
+            tuple or None: The position and the entry of the match, or None if no entry matches.
+        """
+        self._load()
+        stop = len(self._entries) if before is None else before
+        for position in range(stop - 1, self._first - 1, -1):
+            entry = self._entries[position]
+            if entry is not None and query in entry:
+                return position, entry
+        return None
+
+    def _maybe_compact(self):
+        """Compacts the history file in the background once it holds too many duplicate or dropped lines."""
+        if self.path is not None and self._file_lines > max(self.compact_ratio * len(self._positions), 100):
+            self.compact()
+
+    def compact(self, background=True):
+        """
+        Rewrites the history file with one line per entry.
+
+        Entries added while the file is rewritten are appended to both the old and the new file, so none is lost.
+
+        Args:
+            background (bool): Whether the file is rewritten in a background thread.
+
+        Returns:
+            threading.Thread or None: The thread rewriting the file, if it runs in the background.
+        """
+        self._load()
+        if self.path is None:
+            return None
+        with self._lock:
+            if self._compacting is not None:
+                return self._thread
+            self._compacting = []
+        snapshot = list(filter(None, self._entries[self._first:]))
+        if not background:
+            self._rewrite(snapshot)
+            return None
+        self._thread = threading.Thread(target=self._rewrite, args=(snapshot,), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _rewrite(self, snapshot):
+        """
+        Writes the entries to a temporary file and replaces the history file with it.
+
+        Args:
+            snapshot (list): The entries at the start of the compaction, from the oldest to the most recent one.
+        """
+        temporary = self.path + ".tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as file:
+                file.writelines(_escape(entry) + "\n" for entry in snapshot)
+            with self._lock:
+                with open(temporary, "a", encoding="utf-8") as file:
+                    file.writelines(self._compacting)
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                os.replace(temporary, self.path)
+                self._file_lines = len(snapshot) + len(self._compacting)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        finally:
+            with self._lock:
+                self._compacting = None
+
+    def close(self):
+        """Waits for a running compaction and closes the history file."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,264 @@
+"""
+TkConsole Lines
+
+This module rewrites the last line of a console in place, as a terminal does for carriage returns, backspaces and the
+cursor movement and erase-line escape sequences. Only the last, unterminated line is kept as characters, so progress
+output that redraws one line many times leaves one line in the scrollback instead of one per update.
+
+Constants:
+    LINE_EDITS (str): The final characters of the CSI escape sequences that are applied to the last line: "G" moves
+        the cursor to a column, "C" forward and "D" back, and "K" erases the line after, before or around the cursor.
+
+Classes:
+    LineEditor: The last line of a console and its cursor, rewritten by control characters.
+    ProgressBar: A progress bar or status line that redraws the last line of a console.
+"""
+
+import itertools
+import re
+import time
+
+LINE_EDITS = "GKCD"
+
+_CONTROL = re.compile(r"\r|\n|\x08|\x1b\[(\d*)([GKCD])")
+_HAS_CONTROL = re.compile(r"[\r\x08]|\x1b\[\d*[GKCD]")
+
+
+class LineEditor:
+    """
+    The last line of a console and its cursor, rewritten by control characters.
+
+    Text without control characters that is written at the end of the line is passed through; otherwise the last line
+    is rebuilt and has to replace the rendered one.
+
+    Attributes:
+        chars (list): The characters of the last line.
+        tags (list): The tag of every character of the last line.
+        column (int): The column of the cursor in the last line.
+    """
+
+    def __init__(self):
+        """Initialize an empty last line."""
+        self.chars = []
+        self.tags = []
+        self.column = 0
+
+    @property
+    def text(self):
+        """str: The text of the last line."""
+        return "".join(self.chars)
+
+    def reset(self):
+        """Forgets the last line, as if a newline had been written."""
+        self.chars = []
+        self.tags = []
+        self.column = 0
+
+    def rewrites(self, segments):
+        """
+        Returns whether output segments would rewrite the last line instead of being appended.
+
+        Args:
+            segments (list): The (text, tag) pairs to be written.
+
+        Returns:
+            bool: True if the segments contain control characters or the cursor is not at the end of the line.
+        """
+        return self.column != len(self.chars) or any(_HAS_CONTROL.search(text) for text, _ in segments)
+
+    def feed(self, segments):
+        """
+        Applies output segments to the last line.
+
+        Args:
+            segments (list): The (text, tag) pairs to be written.
+
+        Returns:
+            tuple: The text of the last line the segments replace, or None if they are appended to it, and the (text,
+            tag) pairs to be written in place of that line or after it.
+        """
+        if not self.rewrites(segments):
+            for text, tag in segments:
+                newline = text.rfind("\n")
+                if newline != -1:
+                    self.chars = []
+                    self.tags = []
+                    text = text[newline + 1:]
+                self.chars.extend(text)
+                self.tags.extend(itertools.repeat(tag, len(text)))
+            self.column = len(self.chars)
+            return None, segments
+        replaced = self.text
+        output = []
+        for text, tag in segments:
+            position = 0
+            for match in _CONTROL.finditer(text):
+                self._put(text[position:match.start()], tag)
+                position = match.end()
+                control = match.group()
+                if control == "\n":
+                    output.extend(self._runs())
+                    output.append(("\n", tag))
+                    self.reset()
+                elif control == "\r":
+                    self.column = 0
+                elif control == "\x08":
+                    self.column = max(0, self.column - 1)
+                else:
+                    self._edit(int(match.group(1) or 0), match.group(2))
+            self._put(text[position:], tag)
+        output.extend(self._runs())
+        return replaced, output
+
+    def _put(self, text, tag):
+        """Writes text at the cursor, overwriting the characters there."""
+        if not text:
+            return
+        if self.column > len(self.chars):
+            padding = self.column - len(self.chars)
+            self.chars.extend(" " * padding)
+            self.tags.extend(itertools.repeat(None, padding))
+        end = self.column + len(text)
+        self.chars[self.column:end] = text
+        self.tags[self.column:end] = itertools.repeat(tag, len(text))
+        self.column = end
+
+    def _edit(self, number, command):
+        """
+        Applies a cursor movement or erase-line escape sequence.
+
+        Args:
+            number (int): The parameter of the sequence, 0 if it has none.
+            command (str): The final character of the sequence, one of `LINE_EDITS`.
+        """
+        if command == "G":
+            self.column = max(number, 1) - 1
+        elif command == "C":
+            self.column += max(number, 1)
+        elif command == "D":
+            self.column = max(0, self.column - max(number, 1))
+        elif number == 0:
+            del self.chars[self.column:]
+            del self.tags[self.column:]
+        elif number == 1:
+            end = min(self.column + 1, len(self.chars))
+            self.chars[:end] = " " * end
+            self.tags[:end] = itertools.repeat(None, end)
+        else:
+            self.chars = []
+            self.tags = []
+
+    def _runs(self):
+        """Returns the last line as (text, tag) pairs of characters with the same tag."""
+        runs = []
+        position = 0
+        for tag, group in itertools.groupby(self.tags):
+            length = sum(1 for _ in group)
+            runs.append(("".join(self.chars[position:position + length]), tag))
+            position += length
+        return runs
+
+
+class ProgressBar:
+    """
+    A progress bar or status line that redraws the last line of a console.
+
+    The bar is drawn as the label, a bar of `width` characters, the percentage and the counts, or as the label and
+    the count if the total is unknown, followed by an optional message. It is written through `write_threadsafe`, so
+    it may be updated from any thread the console can be written from. Redraws closer than `min_interval` are
+    skipped, except for the last one.
+
+    Args:
+        console (Console): The console the bar is drawn in; it must rewrite lines.
+        total (int, optional): The value of a complete bar. A status line with a count is drawn if omitted.
+        width (int): The number of characters of the bar.
+        label (str): The text in front of the bar.
+        min_interval (float): The minimum number of seconds between redraws.
+
+    Attributes:
+        console (Console): The console the bar is drawn in.
+        total (int or None): The value of a complete bar.
+        width (int): The number of characters of the bar.
+        label (str): The text in front of the bar.
+        min_interval (float): The minimum number of seconds between redraws.
+        value (int): The current value.
+        message (str): The text after the bar.
+        closed (bool): Whether the bar was closed.
+    """
+
+    def __init__(self, console, total=None, width=30, label="", min_interval=0.05):
+        """
+        Initialize the bar and draw it.
+
+        Args:
+            console (Console): The console the bar is drawn in.
+            total (int, optional): The value of a complete bar.
+            width (int): The number of characters of the bar.
+            label (str): The text in front of the bar.
+            min_interval (float): The minimum number of seconds between redraws.
+        """
+        self.console = console
+        self.total = total
+        self.width = width
+        self.label = label
+        self.min_interval = min_interval
+        self.value = 0
+        self.message = ""
+        self.closed = False
+        self._drawn = 0.0
+        self._draw()
+
+    def update(self, value=None, message=None):
+        """
+        Sets the value or the message and redraws the bar.
+
+        Args:
+            value (int, optional): The new value; the value is advanced by one if omitted.
+            message (str, optional): The new text after the bar.
+        """
+        self.value = self.value + 1 if value is None else value
+        if message is not None:
+            self.message = message
+        if self.closed:
+            return
+        finished = self.total is not None and self.value >= self.total
+        if finished or time.monotonic() - self._drawn >= self.min_interval:
+            self._draw()
+
+    def close(self, message=None):
+        """
+        Draws the bar a last time and ends its line.
+
+        Args:
+            message (str, optional): The final text after the bar.
+        """
+        if self.closed:
+            return
+        if message is not None:
+            self.message = message
+        self._draw("\n")
+        self.closed = True
+
+    def render(self):
+        """
+        Returns the text of the bar.
+
+        Returns:
+            str: The label, the bar, the percentage and the counts, or the label and the count, and the message.
+        """
+        parts = [self.label] if self.label else []
+        if self.total:
+            fraction = min(max(self.value / self.total, 0.0), 1.0)
+            filled = int(fraction * self.width)
+            parts.append(f"[{'#' * filled}{'.' * (self.width - filled)}] {int(fraction * 100):3d}%")
+            parts.append(f"{self.value}/{self.total}")
+        else:
+            parts.append(str(self.value))
+        if self.message:
+            parts.append(self.message)
+        return " ".join(parts)
+
+    def _draw(self, end=""):
+        """Redraws the last line of the console with the bar."""
+        self._drawn = time.monotonic()
+        self.console.write_threadsafe(f"\r{self.render()}\x1b[K{end}")
@@ -0,0 +1,209 @@
+"""
+TkConsole Process
+
+This module streams the output of a subprocess into a console while the Tkinter event loop keeps running. Pipes are
+watched with Tkinter file handlers where they are available (POSIX) and read by background threads otherwise; either
+way the output is decoded in large chunks and handed to `Console.write_output`.
+
+Classes:
+    ConsoleProcess: A subprocess whose output is streamed into a console.
+"""
+
+import codecs
+import concurrent.futures
+import os
+import queue
+import subprocess
+import threading
+import tkinter as tk
+
+
+class ConsoleProcess:
+    """
+    A subprocess whose output is streamed into a console.
+
+    Args:
+        console (Console): The console the output is written to.
+        argv (list): The program and its arguments.
+        merge_stderr (bool): Whether stderr is merged into stdout, or read separately and styled with the "stderr" tag.
+        chunk_size (int): The maximum number of bytes read from a pipe at once.
+        encoding (str): The encoding of the output; undecodable bytes are replaced.
+        on_exit (callable, optional): A function called with the exit code once the process has exited.
+        threaded (bool, optional): Whether pipes are read by threads. Defaults to True where Tkinter file handlers are
+            not available.
+        poll_interval (int): The delay in milliseconds between checks on reader threads and on the exit of the process.
+        **popen_kwargs: Additional keyword arguments for `subprocess.Popen`, such as `cwd` or `env`.
+
+    Attributes:
+        console (Console): The console the output is written to.
+        argv (list): The program and its arguments.
+        process (subprocess.Popen or None): The running process, once started.
+        future (concurrent.futures.Future): A future resolved with the exit code.
+        cancelled (bool): Whether the process was cancelled.
+    """
+
+    def __init__(self, console, argv, merge_stderr=True, chunk_size=65536, encoding="utf-8", on_exit=None,
+                 threaded=None, poll_interval=16, **popen_kwargs):
+        """
+        Initialize the process with the console it writes to and its reading settings.
+
+        Args:
+            console (Console): The console the output is written to.
+            argv (list): The program and its arguments.
+            merge_stderr (bool): Whether stderr is merged into stdout.
+            chunk_size (int): The maximum number of bytes read from a pipe at once.
+            encoding (str): The encoding of the output.
+            on_exit (callable, optional): A function called with the exit code once the process has exited.
+            threaded (bool, optional): Whether pipes are read by threads.
+            poll_interval (int): The delay in milliseconds between checks on reader threads and on the exit.
+            **popen_kwargs: Additional keyword arguments for `subprocess.Popen`.
+        """
+        self.console = console
+        self.argv = argv
+        self.merge_stderr = merge_stderr
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.on_exit = on_exit
+        self.threaded = not hasattr(console.tk, "createfilehandler") if threaded is None else threaded
+        self.poll_interval = poll_interval
+        self.popen_kwargs = popen_kwargs
+        self.process = None
+        self.future = concurrent.futures.Future()
+        self.cancelled = False
+        self._open_pipes = 0
+        self._chunks = queue.SimpleQueue()
+        self._kill_job = None
+
+    @property
+    def returncode(self):
+        """int or None: The exit code of the process, or None while it is running."""
+        return self.process.returncode if self.process else None
+
+    def start(self):
+        """
+        Starts the process and begins streaming its output. Must be called from the Tkinter thread.
+
+        Returns:
+            ConsoleProcess: The process itself.
+        """
+        self.process = subprocess.Popen(
+            self.argv, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if self.merge_stderr else subprocess.PIPE, **self.popen_kwargs
+        )
+        pipes = [(self.process.stdout, None)]
+        if not self.merge_stderr:
+            pipes.append((self.process.stderr, "stderr"))
+        self._open_pipes = len(pipes)
+        for pipe, tag in pipes:
+            decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+            if self.threaded:
+                threading.Thread(target=self._read_in_thread, args=(pipe, tag, decoder), daemon=True).start()
+            else:
+                self._watch(pipe, tag, decoder)
+        if self.threaded:
+            self.console.after(self.poll_interval, self._poll)
+        return self
+
+    def cancel(self, grace=2.0):
+        """
+        Terminates the process, and kills it if it is still running after the grace period.
+
+        Args:
+            grace (float): The number of seconds to wait before killing the process.
+        """
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.cancelled = True
+        self.process.terminate()
+        self._kill_job = self.console.after(int(grace * 1000), self._kill)
+
+    def _kill(self):
+        """Kills the process if it is still running."""
+        self._kill_job = None
+        if self.process.poll() is None:
+            self.process.kill()
+
+    def _watch(self, pipe, tag, decoder):
+        """
+        Registers a Tkinter file handler that reads the pipe once it is readable.
+
+        Args:
+            pipe (file): The pipe to be read.
+            tag (str or None): The text area tag used to style the output of the pipe.
+            decoder (codecs.IncrementalDecoder): The decoder of the pipe.
+        """
+        self.console.tk.createfilehandler(pipe, tk.READABLE, lambda file_, mask: self._read_ready(pipe, tag, decoder))
+
+    def _read_ready(self, pipe, tag, decoder):
+        """
+        Reads one chunk from a readable pipe and writes it to the console.
+
+        The file handler is removed while the console redraws and registered again once Tkinter is idle, so that a
+        pipe that is always readable cannot starve the redraws of the window.
+
+        Args:
+            pipe (file): The readable pipe.
+            tag (str or None): The text area tag used to style the output of the pipe.
+            decoder (codecs.IncrementalDecoder): The decoder of the pipe.
+        """
+        self.console.tk.deletefilehandler(pipe)
+        data = os.read(pipe.fileno(), self.chunk_size)
+        text = decoder.decode(data, final=not data)
+        if text:
+            self.console.write_output(text, tag)
+        if data:
+            self.console.after_idle(self._watch, pipe, tag, decoder)
+            return
+        pipe.close()
+        self._pipe_closed()
+
+    def _read_in_thread(self, pipe, tag, decoder):
+        """
+        Reads a pipe until its end in a background thread and passes the decoded chunks to the Tkinter thread.
+
+        Args:
+            pipe (file): The pipe to be read.
+            tag (str or None): The text area tag used to style the output of the pipe.
+            decoder (codecs.IncrementalDecoder): The decoder of the pipe.
+        """
+        with pipe:
+            while True:
+                data = pipe.read1(self.chunk_size)
+                text = decoder.decode(data, final=not data)
+                if text:
+                    self._chunks.put((text, tag))
+                if not data:
+                    break
+        self._chunks.put(None)
+
+    def _poll(self):
+        """Writes the chunks passed by the reader threads to the console and checks whether both pipes are closed."""
+        for _ in range(64):
+            try:
+                chunk = self._chunks.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                self._pipe_closed()
+            else:
+                self.console.write_output(*chunk)
+        if self._open_pipes:
+            self.console.after(self.poll_interval, self._poll)
+
+    def _pipe_closed(self):
+        """Waits for the exit of the process once all of its pipes are closed."""
+        self._open_pipes -= 1
+        if not self._open_pipes:
+            self._wait_exit()
+
+    def _wait_exit(self):
+        """Reports the exit code once the process has exited, checking again later while it is running."""
+        if self.process.poll() is None:
+            self.console.after(self.poll_interval, self._wait_exit)
+            return
+        if self._kill_job is not None:
+            self.console.after_cancel(self._kill_job)
+            self._kill_job = None
+        self.future.set_result(self.process.returncode)
+        if self.on_exit is not None:
+            self.on_exit(self.process.returncode)
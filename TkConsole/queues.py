@@ -0,0 +1,107 @@
+"""
+TkConsole Queues
+
+This module provides the bounded, thread-safe queue that lets any thread hand output to a console. Producers push
+text into the queue and the Tkinter thread drains it in batches, so no widget is ever touched outside the Tkinter
+thread.
+
+Constants:
+    BLOCK (str): Backpressure policy that makes producers wait until there is room in the queue.
+    DROP_OLDEST (str): Backpressure policy that discards the oldest queued item to make room for a new one.
+    DROP_NEWEST (str): Backpressure policy that discards the new item when the queue is full.
+
+Classes:
+    OutputQueue: A bounded queue with a configurable backpressure policy.
+"""
+
+import collections
+import threading
+import time
+
+BLOCK = "block"
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+
+
+class OutputQueue:
+    """
+    A bounded, thread-safe queue with a configurable backpressure policy.
+
+    Args:
+        maxsize (int): The maximum number of items the queue holds.
+        policy (str): The backpressure policy, one of `BLOCK`, `DROP_OLDEST` or `DROP_NEWEST`.
+
+    Attributes:
+        maxsize (int): The maximum number of items the queue holds.
+        policy (str): The backpressure policy applied when the queue is full.
+        dropped (int): The number of items discarded by the backpressure policy.
+    """
+
+    def __init__(self, maxsize=10000, policy=BLOCK):
+        """
+        Initialize the queue with the given capacity and backpressure policy.
+
+        Args:
+            maxsize (int): The maximum number of items the queue holds.
+            policy (str): The backpressure policy, one of `BLOCK`, `DROP_OLDEST` or `DROP_NEWEST`.
+        """
+        if policy not in (BLOCK, DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown backpressure policy: {policy!r}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self._items = collections.deque()
+        self._not_full = threading.Condition(threading.Lock())
+
+    def __len__(self):
+        """Returns the number of queued items."""
+        return len(self._items)
+
+    def put(self, item, timeout=None):
+        """
+        Adds an item to the queue, applying the backpressure policy if the queue is full.
+
+        Args:
+            item: The item to be queued.
+            timeout (float, optional): The maximum number of seconds to wait for room under the `BLOCK` policy.
+
+        Returns:
+            bool: True if the item was queued, False if it was dropped.
+        """
+        with self._not_full:
+            if len(self._items) >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    deadline = None if timeout is None else time.monotonic() + timeout
+                    while len(self._items) >= self.maxsize:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            self.dropped += 1
+                            return False
+                        self._not_full.wait(remaining)
+            self._items.append(item)
+            return True
+
+    def drain(self, max_items=None):
+        """
+        Removes and returns queued items in arrival order.
+
+        Args:
+            max_items (int, optional): The maximum number of items to remove. All items are removed if omitted.
+
+        Returns:
+            list: The removed items.
+        """
+        with self._not_full:
+            count = len(self._items) if max_items is None else min(max_items, len(self._items))
+            items = [self._items.popleft() for _ in range(count)]
+            if items:
+                self._not_full.notify_all()
+            return items
@@ -0,0 +1,318 @@
+"""
+TkConsole Record
+
+This module records what is written to a console, and the inputs it takes, with the time of every event, and replays
+the recording into a console in real time, at a multiple of real time or as fast as possible. The recording is a
+compact binary log, optionally gzip-compressed: a header followed by length-prefixed events, which are appended as
+they happen and read back one at a time, so neither recording nor replay holds a session in memory.
+
+Every event is a 15-byte little-endian header, made of the kind (1 byte), the time in microseconds since the start of
+the recording (8 bytes), the length of the tag (2 bytes) and the length of the text (4 bytes), followed by the tag and
+the text encoded in UTF-8.
+
+Constants:
+    MAGIC (bytes): The header of a recording.
+    OUTPUT (int): The kind of an event that writes text to the console.
+    INPUT (int): The kind of an event that records an input taken by the console.
+
+Classes:
+    SessionRecorder: A recording of the output and input of a console in a binary file.
+    SessionReplay: A replay of a recording into a console.
+
+Functions:
+    read_session(path): Reads the events of a recording.
+"""
+
+import concurrent.futures
+import gzip
+import struct
+import threading
+import time
+
+MAGIC = b"TKCREC1\n"
+OUTPUT = 0
+INPUT = 1
+
+_EVENT = struct.Struct("<BQHI")
+
+
+class SessionRecorder:
+    """
+    A recording of the output and input of a console in a binary file.
+
+    A console records into the recorder set as its `recorder`: every write, as it reaches the console, and every
+    input, once it is entered. Events are appended to a buffered file, which may be written from several threads.
+
+    Args:
+        path (str): The path of the file.
+        compress (bool, optional): Whether the file is gzip-compressed. Defaults to True for paths ending in ".gz".
+        buffer_size (int): The size of the write buffer of an uncompressed file.
+
+    Attributes:
+        path (str): The path of the file.
+        compress (bool): Whether the file is gzip-compressed.
+        started (float): The `time.monotonic` time the recording started.
+        events (int): The number of recorded events.
+        closed (bool): Whether the recording was closed.
+    """
+
+    def __init__(self, path, compress=None, buffer_size=65536):
+        """
+        Initialize the recording and write the header of the file.
+
+        Args:
+            path (str): The path of the file.
+            compress (bool, optional): Whether the file is gzip-compressed.
+            buffer_size (int): The size of the write buffer of an uncompressed file.
+        """
+        self.path = path
+        self.compress = path.endswith(".gz") if compress is None else compress
+        self._file = gzip.open(path, "wb") if self.compress else open(path, "wb", buffering=buffer_size)
+        self._file.write(MAGIC)
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.events = 0
+        self.closed = False
+
+    def record(self, kind, text, tag=None):
+        """
+        Appends an event to the recording, unless it is closed.
+
+        Args:
+            kind (int): `OUTPUT` or `INPUT`.
+            text (str): The written text or the input.
+            tag (str, optional): The text area tag of the written text.
+        """
+        micros = int((time.monotonic() - self.started) * 1e6)
+        data = text.encode("utf-8", errors="surrogatepass")
+        tag_data = tag.encode("utf-8") if tag else b""
+        with self._lock:
+            if self.closed:
+                return
+            self._file.write(_EVENT.pack(kind, micros, len(tag_data), len(data)) + tag_data + data)
+            self.events += 1
+
+    def output(self, text, tag=None):
+        """
+        Records text written to the console.
+
+        Args:
+            text (str): The written text.
+            tag (str, optional): The text area tag of the text.
+        """
+        self.record(OUTPUT, text, tag)
+
+    def input(self, text):
+        """
+        Records an input taken by the console.
+
+        Args:
+            text (str): The input.
+        """
+        self.record(INPUT, text)
+
+    def close(self):
+        """Writes the buffered events and closes the file."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._file.close()
+
+    def __enter__(self):
+        """Returns the recorder."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the recording."""
+        self.close()
+
+
+def read_session(path):
+    """
+    Reads the events of a recording. Compression is detected from the content of the file, and a truncated last
+    event, as left by a process that did not close its recording, ends the events.
+
+    Args:
+        path (str): The path of the file.
+
+    Yields:
+        tuple: The time in seconds since the start of the recording, the kind, the text and the tag of every event.
+
+    Raises:
+        ValueError: If the file is not a recording.
+    """
+    with open(path, "rb") as file:
+        compressed = file.read(2) == b"\x1f\x8b"
+    with (gzip.open(path, "rb") if compressed else open(path, "rb")) as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a session recording: {path}")
+        size = _EVENT.size
+        while True:
+            header = file.read(size)
+            if len(header) < size:
+                return
+            kind, micros, tag_size, text_size = _EVENT.unpack(header)
+            body = file.read(tag_size + text_size)
+            if len(body) < tag_size + text_size:
+                return
+            tag = body[:tag_size].decode("utf-8") if tag_size else None
+            yield micros / 1e6, kind, body[tag_size:].decode("utf-8", errors="surrogatepass"), tag
+
+
+class SessionReplay:
+    """
+    A replay of a recording into a console.
+
+    Output events are written with `write_output` at their recorded times divided by `speed`, or as fast as possible
+    if `speed` is None; input events are passed to `on_input`, since their echo is part of the recorded output. A
+    replay as fast as possible measures the throughput of the console under a real workload.
+
+    `start` replays from the Tkinter event loop and never blocks it: timed events are scheduled with `after`, and a
+    replay as fast as possible writes `batch_events` events per tick, letting the console redraw in between. `run`
+    replays in the calling thread instead, for consoles without an event loop such as `HeadlessConsole`.
+
+    Args:
+        console (Console or HeadlessConsole): The console the recording is replayed into.
+        source (str or iterable): The path of a recording, or its events as yielded by `read_session`.
+        speed (float, optional): The multiple of real time of the replay, or None to replay as fast as possible.
+        on_input (callable, optional): A function called with every recorded input.
+        batch_events (int): The number of events written per tick when replaying as fast as possible from the event
+            loop.
+
+    Attributes:
+        console (Console or HeadlessConsole): The console the recording is replayed into.
+        speed (float or None): The multiple of real time of the replay.
+        on_input (callable or None): The function called with every recorded input.
+        batch_events (int): The number of events written per tick when replaying as fast as possible.
+        events (int): The number of replayed events.
+        bytes (int): The number of UTF-8 encoded bytes of replayed output.
+        elapsed (float): The number of seconds the replay took, once it is done.
+        cancelled (bool): Whether the replay was cancelled.
+        future (concurrent.futures.Future): A future resolved with the summary of the replay.
+    """
+
+    def __init__(self, console, source, speed=1.0, on_input=None, batch_events=1000):
+        """
+        Initialize the replay with the console and the recording.
+
+        Args:
+            console (Console or HeadlessConsole): The console the recording is replayed into.
+            source (str or iterable): The path of a recording, or its events.
+            speed (float, optional): The multiple of real time of the replay, or None for as fast as possible.
+            on_input (callable, optional): A function called with every recorded input.
+            batch_events (int): The number of events written per tick when replaying as fast as possible.
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None to replay as fast as possible")
+        self.console = console
+        self.speed = speed
+        self.on_input = on_input
+        self.batch_events = batch_events
+        self.events = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.cancelled = False
+        self.future = concurrent.futures.Future()
+        self._events = iter(read_session(source) if isinstance(source, str) else source)
+        self._next = next(self._events, None)
+        self._start = 0.0
+        self._job = None
+
+    def summary(self):
+        """
+        Returns the summary of the replay.
+
+        Returns:
+            dict: The number of events and bytes, the seconds the replay took, and the events and megabytes per second.
+        """
+        elapsed = self.elapsed or time.perf_counter() - self._start
+        return {
+            "events": self.events,
+            "bytes": self.bytes,
+            "seconds": elapsed,
+            "events_per_second": self.events / elapsed if elapsed else None,
+            "megabytes_per_second": self.bytes / elapsed / 1e6 if elapsed else None,
+        }
+
+    def run(self):
+        """
+        Replays the whole recording in the calling thread, sleeping until the time of every timed event.
+
+        Returns:
+            dict: The summary of the replay.
+        """
+        self._start = time.perf_counter()
+        while self._next is not None and not self.cancelled:
+            if self.speed is not None:
+                delay = self._due(self._next) - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self._apply(self._next)
+            self._next = next(self._events, None)
+        self.console.flush()
+        return self._done()
+
+    def start(self):
+        """
+        Starts replaying the recording from the Tkinter event loop. Must be called from the Tkinter thread.
+
+        Returns:
+            SessionReplay: The replay itself.
+        """
+        self._start = time.perf_counter()
+        self._job = self.console.after_idle(self._tick)
+        return self
+
+    def cancel(self):
+        """Stops the replay; the future is resolved with the summary of the events replayed so far."""
+        self.cancelled = True
+        if self._job is not None:
+            self.console.after_cancel(self._job)
+            self._job = None
+            self._done()
+
+    def _due(self, event):
+        """Returns the `time.perf_counter` time an event is due."""
+        return self._start + event[0] / self.speed
+
+    def _apply(self, event):
+        """Writes an output event to the console, or passes an input event to `on_input`."""
+        _, kind, text, tag = event
+        self.events += 1
+        if kind == OUTPUT:
+            self.bytes += len(text.encode("utf-8", errors="surrogatepass"))
+            self.console.write_output(text, tag)
+        elif self.on_input is not None:
+            self.on_input(text)
+
+    def _tick(self):
+        """Writes the due events, or the next batch, and schedules the next tick."""
+        self._job = None
+        if self.speed is None:
+            for _ in range(self.batch_events):
+                if self._next is None:
+                    break
+                self._apply(self._next)
+                self._next = next(self._events, None)
+        else:
+            now = time.perf_counter()
+            while self._next is not None and self._due(self._next) <= now:
+                self._apply(self._next)
+                self._next = next(self._events, None)
+        if self._next is None:
+            self.console.flush()
+            self._done()
+        elif self.speed is None:
+            self._job = self.console.after(1, self._tick)
+        else:
+            delay = max(1, int((self._due(self._next) - time.perf_counter()) * 1000))
+            self._job = self.console.after(delay, self._tick)
+
+    def _done(self):
+        """Records the elapsed time and resolves the future with the summary."""
+        self.elapsed = time.perf_counter() - self._start
+        summary = self.summary()
+        if not self.future.done():
+            self.future.set_result(summary)
+        return summary
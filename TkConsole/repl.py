@@ -0,0 +1,476 @@
+"""
+TkConsole REPL
+
+This module runs an interactive Python interpreter in a console. Lines are read with the console's entry field and
+compiled on the Tkinter thread, which only decides whether a statement is complete; complete statements are evaluated
+on a worker thread, or in a child interpreter for isolation, so that long evaluations never block the event loop.
+Their output is handed back through `Console.write_threadsafe`, and a running statement can be interrupted with a
+KeyboardInterrupt.
+
+Classes:
+    ConsoleRepl: An interactive Python interpreter that reads its input from a console and writes its output to it.
+
+Functions:
+    serve(token): Runs the child interpreter of an isolated REPL on the standard streams.
+"""
+
+import code
+import codecs
+import codeop
+import concurrent.futures
+import ctypes
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+from .streams import ConsoleStream
+
+# the signal that interrupts a child interpreter, which has its own process group on Windows
+_INTERRUPT = getattr(signal, "CTRL_BREAK_EVENT", signal.SIGINT)
+
+
+class _Interpreter(code.InteractiveInterpreter):
+    """An interpreter that writes its tracebacks and syntax errors to a console, styled with the "stderr" tag."""
+
+    def __init__(self, console, namespace):
+        """Initialize the interpreter with the console it writes to and its namespace."""
+        super().__init__(namespace)
+        self.console = console
+
+    def write(self, data):
+        """Writes an error message to the console."""
+        self.console.write_threadsafe(data, tag="stderr")
+
+
+class _ThreadRouter:
+    """
+    A stand-in for `sys.stdout` or `sys.stderr` that sends the writes of registered threads to their own streams and
+    those of every other thread to the original stream.
+    """
+
+    def __init__(self, default):
+        """Initialize the router with the original stream."""
+        self.default = default
+        self.streams = {}
+
+    def write(self, s):
+        """Writes text to the stream of the calling thread."""
+        return self.streams.get(threading.get_ident(), self.default).write(s)
+
+    def flush(self):
+        """Flushes the stream of the calling thread."""
+        self.streams.get(threading.get_ident(), self.default).flush()
+
+    def __getattr__(self, name):
+        """Returns the other attributes of the original stream."""
+        return getattr(self.default, name)
+
+
+def _route(name, ident, stream):
+    """Sends the writes of a thread to `sys.stdout` or `sys.stderr` to a stream, installing the router if needed."""
+    router = getattr(sys, name)
+    if not isinstance(router, _ThreadRouter):
+        router = _ThreadRouter(router)
+        setattr(sys, name, router)
+    router.streams[ident] = stream
+
+
+def _unroute(name, ident):
+    """Stops routing the writes of a thread, and restores the original stream once no thread is routed."""
+    router = getattr(sys, name)
+    if isinstance(router, _ThreadRouter):
+        router.streams.pop(ident, None)
+        if not router.streams:
+            setattr(sys, name, router.default)
+
+
+class ConsoleRepl:
+    """
+    An interactive Python interpreter that reads its input from a console and writes its output to it.
+
+    Every line is entered after the primary prompt, or after the secondary prompt while a statement is incomplete, as
+    in the interactive interpreter; complete statements are evaluated on a worker thread, or in a child interpreter
+    if `isolated` is enabled, while the console keeps handling events. `interrupt` raises KeyboardInterrupt in the
+    running statement, or discards the incomplete one, and is bound to Control-c in the console in place of any
+    binding the application made, which is restored when the REPL ends. A thread is interrupted between two bytecode
+    instructions, so a blocking call only sees the interruption once it returns; a child interpreter receives a
+    signal. The REPL ends when `stop` is called or a statement raises SystemExit.
+
+    The console must have been created with `threadsafe=True`.
+
+    Args:
+        console (Console): The console the REPL reads from and writes to.
+        namespace (dict, optional): The globals the statements are evaluated in. A new namespace is used if omitted;
+            an isolated REPL always uses a new namespace in the child interpreter.
+        isolated (bool): Whether statements are evaluated in a child interpreter instead of a worker thread.
+        ps1 (str): The primary prompt.
+        ps2 (str): The secondary prompt, shown while a statement is incomplete.
+        banner (str, optional): The text written when the REPL starts. The version of Python is written if omitted.
+        poll_interval (int): The delay in milliseconds between checks on a running statement.
+        chunk_size (int): The maximum number of bytes read from the output of a child interpreter at once.
+        on_exit (callable, optional): A function called without arguments once the REPL has ended.
+
+    Attributes:
+        console (Console): The console the REPL reads from and writes to.
+        namespace (dict or None): The globals the statements are evaluated in, or None if the REPL is isolated.
+        isolated (bool): Whether statements are evaluated in a child interpreter.
+        ps1 (str): The primary prompt.
+        ps2 (str): The secondary prompt.
+        banner (str): The text written when the REPL starts.
+        poll_interval (int): The delay in milliseconds between checks on a running statement.
+        chunk_size (int): The maximum number of bytes read from the output of a child interpreter at once.
+        on_exit (callable or None): The function called once the REPL has ended.
+        interpreter (code.InteractiveInterpreter or None): The interpreter of the worker thread, if not isolated.
+        process (subprocess.Popen or None): The child interpreter, if isolated and started.
+        buffer (list): The lines of the incomplete statement.
+        running (bool): Whether a statement is being evaluated.
+        closed (bool): Whether the REPL has ended.
+        future (concurrent.futures.Future): A future resolved once the REPL has ended.
+    """
+
+    def __init__(self, console, namespace=None, isolated=False, ps1=">>> ", ps2="... ", banner=None,
+                 poll_interval=16, chunk_size=65536, on_exit=None):
+        """
+        Initialize the REPL with the console it uses and its settings.
+
+        Args:
+            console (Console): The console the REPL reads from and writes to.
+            namespace (dict, optional): The globals the statements are evaluated in.
+            isolated (bool): Whether statements are evaluated in a child interpreter.
+            ps1 (str): The primary prompt.
+            ps2 (str): The secondary prompt.
+            banner (str, optional): The text written when the REPL starts.
+            poll_interval (int): The delay in milliseconds between checks on a running statement.
+            chunk_size (int): The maximum number of bytes read from the output of a child interpreter at once.
+            on_exit (callable, optional): A function called once the REPL has ended.
+
+        Raises:
+            ValueError: If a namespace is given for an isolated REPL.
+        """
+        if isolated and namespace is not None:
+            raise ValueError("An isolated REPL evaluates statements in the namespace of the child interpreter")
+        self.console = console
+        self.namespace = None if isolated else ({"__name__": "__console__", "__doc__": None}
+                                                if namespace is None else namespace)
+        self.isolated = isolated
+        self.ps1 = ps1
+        self.ps2 = ps2
+        if banner is None:
+            banner = f"Python {sys.version} on {sys.platform}\n"
+        self.banner = banner
+        self.poll_interval = poll_interval
+        self.chunk_size = chunk_size
+        self.on_exit = on_exit
+        self.interpreter = None if isolated else _Interpreter(console, self.namespace)
+        self.process = None
+        self.buffer = []
+        self.running = False
+        self.closed = False
+        self.future = concurrent.futures.Future()
+        self._compile = codeop.CommandCompiler() if isolated else self.interpreter.compile
+        self._input = None
+        self._binding = None
+        self._previous_binding = ""
+        self._statements = queue.SimpleQueue()
+        self._results = queue.SimpleQueue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._evaluating = False
+        self._token = os.urandom(8).hex()
+        self._marker = _marker(self._token)
+
+    def start(self):
+        """
+        Writes the banner, starts the worker thread or the child interpreter and shows the first prompt. Must be
+        called from the Tkinter thread.
+
+        Returns:
+            ConsoleRepl: The REPL itself.
+
+        Raises:
+            RuntimeError: If the console was not created with `threadsafe=True`.
+        """
+        if self.console.helpers.drain_job is None:
+            raise RuntimeError("Console must be created with threadsafe=True to run a REPL")
+        if self.banner:
+            self.console.write_output(self.banner)
+        if self.isolated:
+            self._start_process()
+        else:
+            self._worker = threading.Thread(target=self._work, daemon=True)
+            self._worker.start()
+            _route("stdout", self._worker.ident, ConsoleStream(self.console))
+            _route("stderr", self._worker.ident, ConsoleStream(self.console, tag="stderr"))
+        self._previous_binding = self.console.bind("<Control-c>")
+        self._binding = self.console.bind("<Control-c>", self.interrupt)
+        self._prompt()
+        return self
+
+    def _start_process(self):
+        """Starts the child interpreter and the thread reading its output."""
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, (package_root, env.get("PYTHONPATH"))))
+        env["PYTHONIOENCODING"] = "utf-8"
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", "-m", __name__, self._token], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, env=env, creationflags=getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+        )
+        threading.Thread(target=self._read_process, daemon=True).start()
+
+    def push(self, line):
+        """
+        Adds a line to the statement being entered, and evaluates the statement once it is complete.
+
+        Args:
+            line (str): The line, without its newline.
+
+        Returns:
+            bool: True if the statement is incomplete and more lines are needed.
+
+        Raises:
+            RuntimeError: If a statement is already running.
+        """
+        if self.running:
+            raise RuntimeError("A statement is already running")
+        self.buffer.append(line)
+        source = "\n".join(self.buffer)
+        try:
+            compiled = self._compile(source, "<console>", "single")
+        except (OverflowError, SyntaxError, ValueError):
+            self.buffer = []
+            if self.isolated:
+                self._send(source)
+            else:
+                self.interpreter.showsyntaxerror("<console>")
+                self._prompt()
+            return False
+        if compiled is None:
+            self._prompt()
+            return True
+        self.buffer = []
+        if self.isolated:
+            self._send(source)
+        else:
+            self._run()
+            self._statements.put(compiled)
+            self.console.after(self.poll_interval, self._poll)
+        return False
+
+    def _send(self, source):
+        """Sends a statement to the child interpreter, which reports its syntax errors itself."""
+        self._run()
+        try:
+            self.process.stdin.write((json.dumps(source) + "\n").encode("utf-8"))
+            self.process.stdin.flush()
+        except OSError:
+            self._results.put(None)
+        self.console.after(self.poll_interval, self._poll)
+
+    def _run(self):
+        """
+        Marks a statement as running and focuses the text area, since no entry field is shown while it runs and the
+        console's Control-c binding only applies to its focused widgets.
+        """
+        self.running = True
+        self.console.text_area.focus_set()
+
+    def interrupt(self, event=None):
+        """
+        Raises KeyboardInterrupt in the running statement, or discards the incomplete statement and shows the primary
+        prompt again.
+
+        Returns:
+            str: "break" to stop the event from being handled further.
+        """
+        if self.closed:
+            return None
+        if self.running:
+            if self.isolated:
+                self.process.send_signal(_INTERRUPT)
+            else:
+                with self._lock:
+                    if self._evaluating:
+                        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(self._worker.ident),
+                                                                   ctypes.py_object(KeyboardInterrupt))
+            return "break"
+        if self._input is not None:
+            self._input.cancel()
+        self.buffer = []
+        self.console.write_output("\nKeyboardInterrupt\n", "stderr")
+        self._prompt()
+        return "break"
+
+    def stop(self):
+        """Ends the REPL: the pending input is cancelled and the worker thread or the child interpreter is stopped."""
+        if self.closed:
+            return
+        if self.running:
+            self.interrupt()
+        if self.isolated:
+            self.process.stdin.close()
+        else:
+            self._statements.put(None)
+        self._finish()
+
+    def _prompt(self):
+        """
+        Takes the next line with the primary or secondary prompt. A queued input is pushed before `input_async`
+        returns, and the pending input is then the one taken by the prompts it led to.
+        """
+        self._input = None
+        if not self.closed:
+            future = self.console.input_async(self.ps2 if self.buffer else self.ps1, callback=self.push)
+            if not future.done():
+                self._input = future
+
+    def _poll(self):
+        """Shows the next prompt once the running statement is done, checking again later while it runs."""
+        if self.closed:
+            return
+        try:
+            done = self._results.get_nowait()
+        except queue.Empty:
+            self.console.after(self.poll_interval, self._poll)
+            return
+        self.running = False
+        self.console.drain_output()
+        if done is None:
+            self._finish()
+        else:
+            self._prompt()
+
+    def _finish(self):
+        """Marks the REPL as ended and restores the streams and bindings it changed."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._input is not None:
+            self._input.cancel()
+            self._input = None
+        if self._binding is not None:
+            self.console.bind("<Control-c>", self._previous_binding)
+            self.console.deletecommand(self._binding)
+        if self._worker is not None:
+            _unroute("stdout", self._worker.ident)
+            _unroute("stderr", self._worker.ident)
+        self.future.set_result(None)
+        if self.on_exit is not None:
+            self.on_exit()
+
+    def _work(self):
+        """
+        Evaluates the statements of the REPL on the worker thread until it is stopped or a statement exits.
+
+        `interrupt` raises KeyboardInterrupt only while `_evaluating` is set, and checks it under `_lock`; the worker
+        clears the flag under the same lock and discards an interruption that is still pending, so that none reaches
+        the next statement or the wait for it.
+        """
+        ident = ctypes.c_ulong(threading.get_ident())
+        done = True
+        while done:
+            compiled = self._statements.get()
+            if compiled is None:
+                break
+            try:
+                with self._lock:
+                    self._evaluating = True
+                try:
+                    self.interpreter.runcode(compiled)
+                except SystemExit:
+                    done = None
+                self._settle(ident)
+            except KeyboardInterrupt:
+                # an interruption that arrived after the statement was done
+                self._settle(ident)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            self._results.put(done)
+
+    def _settle(self, ident):
+        """Clears `_evaluating` and discards a KeyboardInterrupt raised too late to reach the statement."""
+        with self._lock:
+            self._evaluating = False
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ident, None)
+
+    def _read_process(self):
+        """
+        Reads the output of the child interpreter until its end in a background thread and writes it to the console.
+
+        The child writes `_marker` after every statement; the text before a marker is written, and the marker reports
+        the statement as done. A partial marker at the end of a chunk is held back until the next chunk.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        marker = self._marker
+        pending = ""
+        with self.process.stdout as pipe:
+            while True:
+                data = pipe.read1(self.chunk_size)
+                pending += decoder.decode(data, final=not data)
+                index = pending.find(marker)
+                while index != -1:
+                    if index:
+                        self.console.write_threadsafe(pending[:index])
+                    self._results.put(True)
+                    pending = pending[index + len(marker):]
+                    index = pending.find(marker)
+                held = len(pending)
+                if data:
+                    start = pending.find("\x00", max(0, len(pending) - len(marker) + 1))
+                    while start != -1 and not marker.startswith(pending[start:]):
+                        start = pending.find("\x00", start + 1)
+                    if start != -1:
+                        held = start
+                if held:
+                    self.console.write_threadsafe(pending[:held])
+                pending = pending[held:]
+                if not data:
+                    break
+        self.process.wait()
+        self._results.put(None)
+
+
+def _marker(token):
+    """Returns the text a child interpreter writes after every statement."""
+    return f"\x00{token}\x00"
+
+
+def serve(token):
+    """
+    Runs the child interpreter of an isolated REPL on the standard streams.
+
+    Every line of stdin is a statement encoded as a JSON string. The output of the statement, and its syntax error or
+    traceback, are written to stdout and stderr, followed by a marker made of the token between two NUL characters on
+    stdout. The interpreter ends at the end of stdin or when a statement raises SystemExit; a KeyboardInterrupt only
+    interrupts the running statement.
+
+    Args:
+        token (str): The token of the marker written after every statement.
+    """
+    marker = _marker(token)
+    if hasattr(signal, "SIGBREAK"):
+        signal.signal(signal.SIGBREAK, signal.default_int_handler)
+    interpreter = code.InteractiveInterpreter({"__name__": "__console__", "__doc__": None})
+    while True:
+        try:
+            line = sys.stdin.readline()
+        except KeyboardInterrupt:
+            continue
+        if not line:
+            break
+        try:
+            interpreter.runsource(json.loads(line), "<console>", "single")
+        except SystemExit:
+            break
+        except KeyboardInterrupt:
+            interpreter.write("\nKeyboardInterrupt\n")
+        sys.stderr.flush()
+        sys.stdout.write(marker)
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
@@ -0,0 +1,205 @@
+"""
+TkConsole Search
+
+This module provides the search index of a console. The index is built as output is written: it keeps the text as one
+contiguous string with an array of line offsets, so that a query is a single scan in C over the whole scrollback and
+every match is mapped to its line by binary search instead of asking the Tkinter text widget to search itself.
+
+Classes:
+    SearchIndex: An incrementally built index for substring and regular expression searches over console output.
+"""
+
+from array import array
+import bisect
+import re
+
+
+class SearchIndex:
+    """
+    An incrementally built index for substring and regular expression searches over console output.
+
+    Offsets returned by `find` are global: they stay valid when lines are trimmed from the front of the index, and
+    `locate` returns None for those that point into trimmed lines.
+
+    Args:
+        max_matches (int): The maximum number of matches returned by a search.
+        refine_limit (int): The maximum number of occurrences of a query, overlapping ones included, that are kept so
+            that they are filtered, instead of scanning the whole text again, when the next query extends it.
+
+    Attributes:
+        max_matches (int): The maximum number of matches returned by a search.
+        refine_limit (int): The maximum number of occurrences of a query that are kept for an extended query.
+        version (int): A counter incremented whenever text is appended or trimmed.
+    """
+
+    def __init__(self, max_matches=100000, refine_limit=10000):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_matches (int): The maximum number of matches returned by a search.
+            refine_limit (int): The maximum number of occurrences of a query that are kept for an extended query.
+        """
+        self.max_matches = max_matches
+        self.refine_limit = refine_limit
+        self.version = 0
+        self._text = ""
+        self._pieces = []
+        self._length = 0
+        self._base = 0
+        self._starts = array("q", [0])
+        self._first = 0
+        self._last = None
+
+    def __len__(self):
+        """Returns the number of lines in the index."""
+        return len(self._starts) - self._first
+
+    @property
+    def text(self):
+        """str: The indexed text, possibly preceded by trimmed text that has not been compacted yet."""
+        if self._pieces:
+            self._pieces.insert(0, self._text)
+            self._text = "".join(self._pieces)
+            self._pieces = []
+        return self._text
+
+    def append(self, text):
+        """
+        Adds written text to the index.
+
+        Args:
+            text (str): The text to be added.
+        """
+        base = self._length
+        position = text.find("\n")
+        while position != -1:
+            self._starts.append(base + position + 1)
+            position = text.find("\n", position + 1)
+        self._pieces.append(text)
+        self._length += len(text)
+        self.version += 1
+
+    def clear_last_line(self):
+        """Removes the text of the last line, which is still being written, so that it can be added anew."""
+        cut = self._length - self._starts[-1]
+        if not cut:
+            return
+        self._length -= cut
+        while cut and self._pieces:
+            piece = self._pieces.pop()
+            if len(piece) > cut:
+                self._pieces.append(piece[:-cut])
+                cut = 0
+            else:
+                cut -= len(piece)
+        if cut:
+            self._text = self._text[:-cut]
+        self.version += 1
+
+    def trim(self, count):
+        """
+        Removes lines from the front of the index; the text is compacted once more than half of it is trimmed.
+
+        Args:
+            count (int): The number of lines to be removed. The last line is never removed.
+        """
+        self._first += min(count, len(self) - 1)
+        self.version += 1
+        if self._first > len(self._starts) // 2:
+            offset = self._starts[self._first]
+            self._text = self.text[offset:]
+            self._length -= offset
+            self._base += offset
+            self._starts = array("q", (start - offset for start in self._starts[self._first:]))
+            self._first = 0
+
+    def find(self, query, regex=False, ignore_case=False):
+        """
+        Finds the matches of a query in the index.
+
+        Args:
+            query (str): The substring or regular expression to be found.
+            regex (bool): Whether the query is a regular expression.
+            ignore_case (bool): Whether the case of letters is ignored.
+
+        Returns:
+            tuple: The global start offsets and end offsets of the matches, as two arrays in ascending order.
+
+        Raises:
+            re.error: If the query is not a valid regular expression.
+        """
+        starts, ends = array("q"), array("q")
+        if not query:
+            return starts, ends
+        text = self.text
+        position = self._starts[self._first]
+        base = self._base
+        last = self._last
+        if not regex and not ignore_case:
+            if last is not None and last[0] == self.version and query.startswith(last[1]) and last[2] is not None:
+                # every occurrence of the extended query starts at an occurrence of the previous one
+                occurrences = array("q", (start for start in last[2] if text.startswith(query, start - base)))
+            else:
+                occurrences = array("q")
+                position = text.find(query, position)
+                while position != -1 and len(occurrences) < self.refine_limit:
+                    occurrences.append(position + base)
+                    position = text.find(query, position + 1)
+                if position != -1:
+                    occurrences = None
+            if occurrences is not None:
+                end = None
+                for start in occurrences:
+                    if end is None or start >= end:
+                        starts.append(start)
+                        end = start + len(query)
+                        if len(starts) >= self.max_matches:
+                            break
+            else:
+                position = text.find(query, self._starts[self._first])
+                while position != -1 and len(starts) < self.max_matches:
+                    starts.append(position + base)
+                    position = text.find(query, position + len(query))
+            ends.extend(start + len(query) for start in starts)
+            self._last = (self.version, query, occurrences)
+            return starts, ends
+        self._last = None
+        pattern = re.compile(query if regex else re.escape(query), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+        for match in pattern.finditer(text, position):
+            if match.end() > match.start():
+                starts.append(match.start() + base)
+                ends.append(match.end() + base)
+                if len(starts) >= self.max_matches:
+                    break
+        return starts, ends
+
+    def locate(self, offset):
+        """
+        Returns the line and column of a global offset.
+
+        Args:
+            offset (int): The global offset.
+
+        Returns:
+            tuple or None: The zero-based line and the column, or None if the offset points into trimmed lines.
+        """
+        offset -= self._base
+        if offset < self._starts[self._first]:
+            return None
+        line = bisect.bisect_right(self._starts, offset, self._first) - 1
+        return line - self._first, offset - self._starts[line]
+
+    def offset(self, line):
+        """
+        Returns the global offset of the start of a line.
+
+        Args:
+            line (int): The zero-based line; the number of lines gives the offset of the end of the index.
+
+        Returns:
+            int: The global offset.
+        """
+        if line >= len(self):
+            return self._length + self._base
+        return self._starts[self._first + line] + self._base
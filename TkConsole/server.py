@@ -0,0 +1,366 @@
+"""
+TkConsole Server
+
+This module lets other processes stream output into a console over a local socket, a Unix domain socket or a TCP port
+on the loopback interface. Messages are newline-delimited or length-prefixed, and every connection carries a label:
+output from a connection is prefixed with it in a console, or written to the channel of that name in a channel
+console. Sockets are read without blocking, by Tkinter file handlers where they are available (POSIX) or by a selector
+thread otherwise, and the messages of one read are handed to the console in one write.
+
+Constants:
+    LINES (str): Framing in which every message is a line ended by a newline.
+    LENGTH (str): Framing in which every message is preceded by its length in bytes, as a 4-byte big-endian integer.
+
+Classes:
+    ConsoleServer: A local socket server that writes the messages it receives to a console.
+"""
+
+import itertools
+import os
+import selectors
+import socket
+import threading
+
+LINES = "lines"
+LENGTH = "length"
+
+
+def _writable_from_threads(console):
+    """Returns whether `write_threadsafe` may be called on a console from a thread other than its Tkinter thread."""
+    if not hasattr(console, "write_threadsafe"):
+        return False
+    if hasattr(console, "add_channel"):
+        return console._drain_job is not None
+    helpers = getattr(console, "helpers", None)
+    return helpers is None or helpers.drain_job is not None
+
+
+class _Connection:
+    """
+    A client connection and the bytes received from it that do not form a whole message yet.
+
+    Args:
+        sock (socket.socket): The socket of the connection.
+        label (str or None): The label of the connection, or None if its first message names it.
+
+    Attributes:
+        socket (socket.socket): The socket of the connection.
+        label (str or None): The label of the connection.
+        buffer (bytearray): The bytes received after the last whole message.
+        error (str or None): Why the connection has to be closed, if it sent a message longer than allowed.
+    """
+
+    def __init__(self, sock, label):
+        """Initialize the connection with its socket and label."""
+        self.socket = sock
+        self.label = label
+        self.buffer = bytearray()
+        self.error = None
+
+    def feed(self, data, framing, max_message):
+        """
+        Adds received bytes to the buffer and takes the whole messages out of it.
+
+        Args:
+            data (bytes): The received bytes, empty at the end of the connection.
+            framing (str): `LINES` or `LENGTH`.
+            max_message (int): The maximum size of a message in bytes. Longer lines are cut; a longer length-prefixed
+                message sets `error`, and the messages before it are returned.
+
+        Returns:
+            list: The messages as bytes, without their newlines or length prefixes.
+        """
+        buffer = self.buffer
+        buffer += data
+        messages = []
+        if framing == LINES:
+            end = buffer.rfind(b"\n")
+            if end != -1:
+                messages = bytes(buffer[:end]).split(b"\n")
+                del buffer[:end + 1]
+            while len(buffer) > max_message:
+                messages.append(bytes(buffer[:max_message]))
+                del buffer[:max_message]
+            if not data and buffer:
+                messages.append(bytes(buffer))
+                buffer.clear()
+            return messages
+        position = 0
+        while len(buffer) - position >= 4:
+            size = int.from_bytes(buffer[position:position + 4], "big")
+            if size > max_message:
+                self.error = f"Message of {size} bytes exceeds the limit of {max_message} bytes"
+                break
+            if len(buffer) - position - 4 < size:
+                break
+            messages.append(bytes(buffer[position + 4:position + 4 + size]))
+            position += 4 + size
+        del buffer[:position]
+        return messages
+
+
+class ConsoleServer:
+    """
+    A local socket server that writes the messages it receives to a console.
+
+    The server listens on a Unix domain socket if `path` is given, or on a TCP port of `host` otherwise. The first
+    message of every connection is its label if `named` is enabled; connections are labelled by their number
+    otherwise. In a `ChannelConsole`, the messages of a connection are written to the channel named by its label,
+    which is added if needed; in other consoles, every message is written on its own line after `prefix`, formatted
+    with the label.
+
+    Reads never outpace the console. With Tkinter file handlers, a connection's handler is removed after every read
+    and registered again once Tkinter is idle, so output is read no faster than it is rendered. With the selector
+    thread, the messages are handed over through `write_threadsafe`, which waits for room under the "block" policy of
+    the console's output queue; either way, unread data stays in the socket buffers and the clients' writes block
+    until the console catches up.
+
+    Args:
+        console (Console, ChannelConsole or HeadlessConsole): The console the messages are written to.
+        path (str, optional): The path of a Unix domain socket to listen on. An existing socket file is replaced.
+        host (str): The address of the TCP port to listen on, if no path is given.
+        port (int): The TCP port to listen on; a free port is chosen if 0.
+        framing (str): `LINES` for newline-delimited messages or `LENGTH` for length-prefixed messages.
+        named (bool): Whether the first message of every connection is its label.
+        prefix (str): The text written before every message in consoles without channels, formatted with the label;
+            nothing is written before messages if empty.
+        encoding (str): The encoding of the messages; undecodable bytes are replaced.
+        chunk_size (int): The maximum number of bytes read from a connection at once.
+        max_message (int): The maximum size of a message in bytes.
+        threaded (bool, optional): Whether the sockets are read by a selector thread, which requires a console
+            created with `threadsafe=True`. Defaults to True where Tkinter file handlers are not available.
+
+    Attributes:
+        console (Console, ChannelConsole or HeadlessConsole): The console the messages are written to.
+        path (str or None): The path of the Unix domain socket.
+        framing (str): The framing of the messages.
+        named (bool): Whether the first message of every connection is its label.
+        prefix (str): The text written before every message in consoles without channels.
+        encoding (str): The encoding of the messages.
+        chunk_size (int): The maximum number of bytes read from a connection at once.
+        max_message (int): The maximum size of a message in bytes.
+        threaded (bool): Whether the sockets are read by a selector thread.
+        address (str or tuple or None): The address the server listens on, once started.
+        connections (dict): The open connections by socket.
+        messages (int): The number of messages received.
+        closed (bool): Whether the server was closed.
+    """
+
+    def __init__(self, console, path=None, host="127.0.0.1", port=0, framing=LINES, named=True, prefix="[{label}] ",
+                 encoding="utf-8", chunk_size=65536, max_message=1048576, threaded=None):
+        """
+        Initialize the server with the console it writes to and its socket settings.
+
+        Args:
+            console (Console, ChannelConsole or HeadlessConsole): The console the messages are written to.
+            path (str, optional): The path of a Unix domain socket to listen on.
+            host (str): The address of the TCP port to listen on.
+            port (int): The TCP port to listen on.
+            framing (str): `LINES` or `LENGTH`.
+            named (bool): Whether the first message of every connection is its label.
+            prefix (str): The text written before every message in consoles without channels.
+            encoding (str): The encoding of the messages.
+            chunk_size (int): The maximum number of bytes read from a connection at once.
+            max_message (int): The maximum size of a message in bytes.
+            threaded (bool, optional): Whether the sockets are read by a selector thread.
+        """
+        if framing not in (LINES, LENGTH):
+            raise ValueError(f"Unknown framing: {framing!r}")
+        self.console = console
+        self.path = path
+        self.framing = framing
+        self.named = named
+        self.prefix = prefix
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.max_message = max_message
+        self.threaded = not hasattr(getattr(console, "tk", None), "createfilehandler") if threaded is None else threaded
+        self.address = None
+        self.connections = {}
+        self.messages = 0
+        self.closed = False
+        self._host = host
+        self._port = port
+        self._listener = None
+        self._numbers = itertools.count(1)
+        self._channels = hasattr(console, "add_channel")
+        self._selector = None
+        self._wakeup = None
+        self._thread = None
+
+    def start(self):
+        """
+        Starts listening and reading connections. Must be called from the Tkinter thread unless the server is
+        threaded.
+
+        Returns:
+            ConsoleServer: The server itself.
+
+        Raises:
+            RuntimeError: If the server is threaded and the console cannot be written from other threads.
+        """
+        if self.threaded and not _writable_from_threads(self.console):
+            raise RuntimeError("A threaded server needs a console created with threadsafe=True")
+        if self.path is not None:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._listener.bind(self.path)
+        else:
+            self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._listener.bind((self._host, self._port))
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self.address = self._listener.getsockname()
+        if self.threaded:
+            self._selector = selectors.DefaultSelector()
+            self._wakeup = socket.socketpair()
+            self._selector.register(self._listener, selectors.EVENT_READ)
+            self._selector.register(self._wakeup[0], selectors.EVENT_READ)
+            self._thread = threading.Thread(target=self._serve, daemon=True)
+            self._thread.start()
+        else:
+            self._watch(self._listener, self._accept)
+        return self
+
+    def close(self):
+        """Stops listening and closes every connection. Must be called from the Tkinter thread unless threaded."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.threaded:
+            self._wakeup[1].send(b"\0")
+            self._thread.join()
+            return
+        self.console.tk.deletefilehandler(self._listener)
+        for connection in list(self.connections.values()):
+            self.console.tk.deletefilehandler(connection.socket)
+            self._close_connection(connection)
+        self._close_listener()
+
+    def _close_listener(self):
+        """Closes the listening socket and removes the socket file."""
+        self._listener.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _watch(self, sock, handler):
+        """Registers a Tkinter file handler that calls the handler once the socket is readable."""
+        # imported here, since this module is imported by the package even where only the headless console runs
+        import tkinter as tk
+        self.console.tk.createfilehandler(sock, tk.READABLE, lambda file_, mask: handler(sock))
+
+    def _accept(self, listener):
+        """Accepts a pending connection and starts reading it."""
+        connection = self._accept_connection()
+        if connection is not None:
+            if self.threaded:
+                self._selector.register(connection.socket, selectors.EVENT_READ)
+            else:
+                self._watch(connection.socket, self._read_ready)
+
+    def _accept_connection(self):
+        """
+        Accepts a pending connection.
+
+        Returns:
+            _Connection or None: The new connection, or None if no connection was pending.
+        """
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return None
+        sock.setblocking(False)
+        connection = _Connection(sock, None if self.named else f"connection {next(self._numbers)}")
+        self.connections[sock] = connection
+        return connection
+
+    def _read_ready(self, sock):
+        """
+        Reads one chunk from a readable connection and writes its messages to the console.
+
+        The file handler is removed while the console redraws and registered again once Tkinter is idle, as for the
+        pipes of `ConsoleProcess`.
+        """
+        self.console.tk.deletefilehandler(sock)
+        if self._read(self.connections[sock]):
+            self.console.after_idle(self._rewatch, sock)
+
+    def _rewatch(self, sock):
+        """Registers the file handler of a connection again, unless it was closed meanwhile."""
+        if sock in self.connections:
+            self._watch(sock, self._read_ready)
+
+    def _read(self, connection):
+        """
+        Reads one chunk from a connection and writes its messages to the console, closing the connection at its end.
+
+        Args:
+            connection (_Connection): The readable connection.
+
+        Returns:
+            bool: True if the connection is still open.
+        """
+        try:
+            data = connection.socket.recv(self.chunk_size)
+        except BlockingIOError:
+            return True
+        except OSError:
+            data = b""
+        messages = connection.feed(data, self.framing, self.max_message)
+        if messages:
+            self._write(connection, messages)
+        if data and connection.error is None:
+            return True
+        self._close_connection(connection)
+        return False
+
+    def _close_connection(self, connection):
+        """Closes a connection and forgets it."""
+        self.connections.pop(connection.socket, None)
+        if self.threaded:
+            self._selector.unregister(connection.socket)
+        connection.socket.close()
+
+    def _write(self, connection, messages):
+        """
+        Writes the messages of one read to the console in one write.
+
+        Args:
+            connection (_Connection): The connection the messages came from.
+            messages (list): The messages as bytes.
+        """
+        texts = [message.decode(self.encoding, errors="replace") for message in messages]
+        if connection.label is None:
+            connection.label = texts.pop(0)
+            if not texts:
+                return
+        self.messages += len(texts)
+        if self._channels:
+            output = "\n".join(texts) + "\n"
+            if self.threaded:
+                self.console.write_threadsafe(connection.label, output)
+            else:
+                self.console.write(connection.label, output)
+            return
+        prefix = self.prefix.format(label=connection.label)
+        output = "".join(f"{prefix}{text}\n" for text in texts)
+        if self.threaded:
+            self.console.write_threadsafe(output)
+        else:
+            self.console.write_output(output)
+
+    def _serve(self):
+        """Reads the connections in the selector thread until the server is closed."""
+        while not self.closed:
+            for key, _ in self._selector.select():
+                if key.fileobj is self._listener:
+                    self._accept(self._listener)
+                elif key.fileobj in self.connections:
+                    self._read(self.connections[key.fileobj])
+        for connection in list(self.connections.values()):
+            self._close_connection(connection)
+        self._selector.close()
+        for sock in self._wakeup:
+            sock.close()
+        self._close_listener()
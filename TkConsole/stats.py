@@ -0,0 +1,137 @@
+"""
+TkConsole Stats
+
+This module provides the instrumentation of a console: counters of events such as writes, flushes and Tkinter calls,
+and timers that keep the count, total, maximum and a power-of-two histogram of their durations. A console only creates
+its instrumentation when asked to, and its hot paths skip every measurement otherwise.
+
+Classes:
+    ConsoleStats: Counters and timing histograms of a console's hot paths.
+    TkCallProxy: A stand-in for the Tcl interpreter of a widget that counts and times the calls made through it.
+"""
+
+import collections
+import time
+
+BUCKETS = 32
+
+
+class ConsoleStats:
+    """
+    Counters and timing histograms of a console's hot paths.
+
+    Durations are sorted into buckets by powers of two of microseconds: bucket 0 holds durations below 1 µs and bucket
+    n those from 2 ** (n - 1) µs to below 2 ** n µs; the last bucket also holds longer ones.
+
+    Args:
+        hook (callable, optional): A function called with the name and the amount of every count, and with the name
+            and the duration in seconds of every timing.
+
+    Attributes:
+        hook (callable or None): The function called with every count and timing.
+        counters (collections.Counter): The counters by name.
+        started (float): The `time.monotonic` time the stats were started or last reset.
+    """
+
+    def __init__(self, hook=None):
+        """
+        Initialize empty stats.
+
+        Args:
+            hook (callable, optional): A function called with every count and timing.
+        """
+        self.hook = hook
+        self.counters = collections.Counter()
+        self.started = time.monotonic()
+        self._timers = {}
+
+    def count(self, name, amount=1):
+        """
+        Increments a counter.
+
+        Args:
+            name (str): The name of the counter.
+            amount (int): The increment.
+        """
+        self.counters[name] += amount
+        if self.hook is not None:
+            self.hook(name, amount)
+
+    def observe(self, name, seconds):
+        """
+        Records a duration in a timer.
+
+        Args:
+            name (str): The name of the timer.
+            seconds (float): The duration in seconds.
+        """
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = [0, 0.0, 0.0, [0] * BUCKETS]
+        timer[0] += 1
+        timer[1] += seconds
+        if seconds > timer[2]:
+            timer[2] = seconds
+        timer[3][min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+        if self.hook is not None:
+            self.hook(name, seconds)
+
+    def snapshot(self):
+        """
+        Returns the current values of the counters and timers.
+
+        Returns:
+            dict: The counters by name, the timers by name, each with its count, total, mean and maximum in seconds
+            and its histogram as a dictionary from the upper bound of a bucket in microseconds to its count, and the
+            number of seconds the stats cover.
+        """
+        timers = {}
+        for name, (count, total, maximum, buckets) in self._timers.items():
+            timers[name] = {
+                "count": count,
+                "total": total,
+                "mean": total / count,
+                "max": maximum,
+                "histogram": {2 ** bucket: number for bucket, number in enumerate(buckets) if number},
+            }
+        return {"counters": dict(self.counters), "timers": timers, "seconds": time.monotonic() - self.started}
+
+    def reset(self):
+        """Clears the counters and timers."""
+        self.counters.clear()
+        self._timers.clear()
+        self.started = time.monotonic()
+
+
+class TkCallProxy:
+    """
+    A stand-in for the Tcl interpreter of a widget that counts and times the calls made through it.
+
+    Args:
+        interpreter (tkapp): The Tcl interpreter of the widget.
+        stats (ConsoleStats): The stats the calls are recorded in.
+    """
+
+    def __init__(self, interpreter, stats):
+        """
+        Initialize the proxy.
+
+        Args:
+            interpreter (tkapp): The Tcl interpreter of the widget.
+            stats (ConsoleStats): The stats the calls are recorded in.
+        """
+        self._interpreter = interpreter
+        self._stats = stats
+
+    def call(self, *args):
+        """Calls a Tcl command, recording it as a "tk_calls" count and a "tk_call" timing."""
+        start = time.perf_counter()
+        try:
+            return self._interpreter.call(*args)
+        finally:
+            self._stats.observe("tk_call", time.perf_counter() - start)
+            self._stats.count("tk_calls")
+
+    def __getattr__(self, name):
+        """Returns the other attributes of the interpreter."""
+        return getattr(self._interpreter, name)
@@ -0,0 +1,112 @@
+"""
+TkConsole Store
+
+This module provides the compact backing store used by a console in virtual mode. The whole scrollback is kept as one
+contiguous UTF-8 buffer plus an array of line offsets, so that the Tkinter text widget only has to hold the lines
+that are actually on screen.
+
+Classes:
+    LineStore: An append-only line store with trimming from the front.
+"""
+
+from array import array
+
+
+class LineStore:
+    """
+    An append-only line store backed by a single bytearray and an array of line start offsets.
+
+    The store always holds at least one line; the last line is the one that is still being written and has no
+    terminating newline.
+
+    Attributes:
+        data (bytearray): The UTF-8 encoded text of the store, possibly preceded by trimmed bytes.
+        starts (array.array): The offsets of the line starts in `data`, possibly preceded by trimmed lines.
+        first (int): The number of trimmed entries at the front of `starts`.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.data = bytearray()
+        self.starts = array("q", [0])
+        self.first = 0
+
+    def __len__(self):
+        """Returns the number of lines in the store."""
+        return len(self.starts) - self.first
+
+    @property
+    def byte_count(self):
+        """int: The number of UTF-8 encoded bytes in the store."""
+        return len(self.data) - self.starts[self.first]
+
+    def append(self, text):
+        """
+        Appends text to the store.
+
+        Args:
+            text (str): The text to be appended.
+        """
+        data = text.encode("utf-8")
+        base = len(self.data)
+        self.data += data
+        position = data.find(b"\n")
+        while position != -1:
+            self.starts.append(base + position + 1)
+            position = data.find(b"\n", position + 1)
+
+    def _end(self, number):
+        """Returns the offset just past the given line, including its newline."""
+        index = self.first + number + 1
+        return self.starts[index] if index < len(self.starts) else len(self.data)
+
+    def line(self, number):
+        """
+        Returns a line of the store.
+
+        Args:
+            number (int): The zero-based number of the line.
+
+        Returns:
+            str: The line without its terminating newline.
+        """
+        start = self.starts[self.first + number]
+        end = self._end(number)
+        if number < len(self) - 1:
+            end -= 1
+        return self.data[start:end].decode("utf-8")
+
+    def text(self, start, stop):
+        """
+        Returns a range of lines of the store.
+
+        Args:
+            start (int): The zero-based number of the first line.
+            stop (int): The zero-based number of the line after the last one.
+
+        Returns:
+            str: The lines joined with their terminating newlines.
+        """
+        if start >= stop:
+            return ""
+        return self.data[self.starts[self.first + start]:self._end(stop - 1)].decode("utf-8")
+
+    def clear_last_line(self):
+        """Removes the text of the last line, which is still being written, so that it can be written anew."""
+        del self.data[self.starts[-1]:]
+
+    def trim(self, count):
+        """
+        Removes lines from the front of the store.
+
+        The underlying buffer is compacted once more than half of it is trimmed, so trimming is amortized.
+
+        Args:
+            count (int): The number of lines to be removed. The last line is never removed.
+        """
+        self.first += min(count, len(self) - 1)
+        if self.first > len(self.starts) // 2:
+            offset = self.starts[self.first]
+            del self.data[:offset]
+            self.starts = array("q", (start - offset for start in self.starts[self.first:]))
+            self.first = 0
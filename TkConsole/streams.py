@@ -0,0 +1,185 @@
+"""
+TkConsole Streams
+
+This module provides a file-like writer bound to a console, so that `sys.stdout`, `sys.stderr` or any library that
+writes to a text stream can send its output to a console. Writes are collected in the stream and handed to the console
+in one call per line or per block instead of one widget round-trip per `write()` call.
+
+Constants:
+    LINE (str): Buffering mode that hands the text to the console at every newline.
+    BLOCK (str): Buffering mode that hands the text to the console whenever the buffer is full.
+
+Classes:
+    ConsoleStream: A text stream that writes to a console.
+
+Functions:
+    redirect(console, stdout=True, stderr=True, buffering="line"): A context manager that redirects `sys.stdout` and
+    `sys.stderr` to a console.
+"""
+
+import contextlib
+import io
+import sys
+import threading
+
+LINE = "line"
+BLOCK = "block"
+
+
+class ConsoleStream(io.TextIOBase):
+    """
+    A text stream that writes to a console.
+
+    The stream may be written from any thread; its buffer is handed to the console through `Console.write_threadsafe`,
+    so writing from threads other than the Tkinter thread requires a console created with `threadsafe=True`. Flushed
+    text is handed over by one thread at a time, in the order it left the buffer: a flush that finds another thread
+    handing text over leaves its text to that thread and returns, so it never waits on the console's output queue.
+
+    Args:
+        console (Console): The console the stream writes to.
+        tag (str, optional): The text area tag used to style the text, such as "stderr".
+        buffering (str): "line" to hand the text over at every newline, or "block" to hand it over every
+            `buffer_size` characters.
+        buffer_size (int): The number of buffered characters that triggers a flush.
+
+    Attributes:
+        console (Console): The console the stream writes to.
+        tag (str or None): The text area tag used to style the text.
+        buffering (str): The buffering mode, "line" or "block".
+        buffer_size (int): The number of buffered characters that triggers a flush.
+    """
+
+    def __init__(self, console, tag=None, buffering=LINE, buffer_size=8192):
+        """
+        Initialize the stream with the console it writes to and its buffering settings.
+
+        Args:
+            console (Console): The console the stream writes to.
+            tag (str, optional): The text area tag used to style the text, such as "stderr".
+            buffering (str): "line" or "block".
+            buffer_size (int): The number of buffered characters that triggers a flush.
+        """
+        super().__init__()
+        if buffering not in (LINE, BLOCK):
+            raise ValueError(f"Unknown buffering mode: {buffering!r}")
+        self.console = console
+        self.tag = tag
+        self.buffering = buffering
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._size = 0
+        self._chunks = []
+        self._flushing = False
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self):
+        """str: The encoding of the stream."""
+        return "utf-8"
+
+    @property
+    def errors(self):
+        """str: The error handling scheme of the stream."""
+        return "strict"
+
+    def writable(self):
+        """Returns True, since the stream can be written."""
+        return True
+
+    def isatty(self):
+        """Returns False, since the stream is not a terminal."""
+        return False
+
+    def write(self, s):
+        """
+        Writes text to the stream's buffer and flushes it if the buffering mode requires.
+
+        Args:
+            s (str): The text to be written.
+
+        Returns:
+            int: The number of characters written.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed stream")
+        if not isinstance(s, str):
+            raise TypeError(f"write() argument must be str, not {type(s).__name__}")
+        with self._lock:
+            self._buffer.append(s)
+            self._size += len(s)
+            full = self._size >= self.buffer_size or (self.buffering == LINE and "\n" in s)
+        if full:
+            self.flush()
+        return len(s)
+
+    def writelines(self, lines):
+        """
+        Writes an iterable of strings to the stream as a single write.
+
+        Args:
+            lines (iterable): The strings to be written.
+        """
+        self.write("".join(lines))
+
+    def flush(self):
+        """Hands the buffered text to the console, or to the thread that is handing text over already."""
+        with self._lock:
+            if self._buffer:
+                self._chunks.append("".join(self._buffer))
+                self._buffer = []
+                self._size = 0
+            if self._flushing or not self._chunks:
+                return
+            self._flushing = True
+        while True:
+            with self._lock:
+                if not self._chunks:
+                    self._flushing = False
+                    return
+                text = "".join(self._chunks)
+                self._chunks = []
+            try:
+                self.console.write_threadsafe(text, tag=self.tag)
+            except BaseException:
+                with self._lock:
+                    self._flushing = False
+                raise
+
+    def close(self):
+        """Flushes the buffered text and closes the stream."""
+        if not self.closed:
+            self.flush()
+        super().close()
+
+
+@contextlib.contextmanager
+def redirect(console, stdout=True, stderr=True, buffering=LINE):
+    """
+    A context manager that redirects `sys.stdout` and `sys.stderr` to a console.
+
+    Text written to `sys.stderr` is styled with the "stderr" tag. The original streams are restored and the console
+    streams are flushed when the context exits.
+
+    Args:
+        console (Console): The console the output goes to.
+        stdout (bool): Whether `sys.stdout` is redirected.
+        stderr (bool): Whether `sys.stderr` is redirected.
+        buffering (str): The buffering mode of the streams, "line" or "block".
+
+    Yields:
+        tuple: The streams replacing `sys.stdout` and `sys.stderr`, or None for those not redirected.
+    """
+    out = ConsoleStream(console, buffering=buffering) if stdout else None
+    err = ConsoleStream(console, tag="stderr", buffering=buffering) if stderr else None
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    if out is not None:
+        sys.stdout = out
+    if err is not None:
+        sys.stderr = err
+    try:
+        yield out, err
+    finally:
+        sys.stdout, sys.stderr = original_stdout, original_stderr
+        for stream in (out, err):
+            if stream is not None:
+                stream.close()
@@ -0,0 +1,7 @@
+"""
+TkConsole Benchmark Package
+
+This package contains the benchmark suite of the TkConsole library. It measures output throughput, input latency,
+resize cost and memory growth of the Tkinter console, which needs a display such as Xvfb, or of the headless console,
+and writes the results as JSON so that they can be compared between releases.
+"""
@@ -0,0 +1,71 @@
+"""
+TkConsole Benchmarks
+
+This module serves as the entry point for running the TkConsole benchmark suite. It runs every benchmark, prints the
+report as JSON or writes it to a file, and exits with status 1 if a measure regressed against a baseline report.
+
+Functions:
+    main(argv=None): Entry point for running the TkConsole benchmark suite.
+
+Usage:
+    python -m benchmarks --backend tk --output results.json
+    python -m benchmarks --backend headless --baseline results.json --threshold 0.15
+    python -m benchmarks --option virtual=True --option max_lines=100000
+    python -m benchmarks --session production.rec.gz
+"""
+
+import argparse
+import ast
+import json
+import sys
+from .suite import run, compare
+
+
+def main(argv=None):
+    """
+    Entry point for running the TkConsole benchmark suite.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: 1 if a measure regressed against the baseline, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Runs the TkConsole benchmarks.")
+    parser.add_argument("--backend", choices=("tk", "headless"), default="tk",
+                        help="the Tkinter console, which needs a display such as Xvfb, or the headless console")
+    parser.add_argument("--option", action="append", default=[], metavar="NAME=VALUE",
+                        help="a keyword argument for the consoles, such as buffered=True")
+    parser.add_argument("--lines", type=int, default=100000, help="the number of lines printed")
+    parser.add_argument("--repeats", type=int, default=50, help="the number of inputs taken")
+    parser.add_argument("--events", type=int, default=1000, help="the number of resize events")
+    parser.add_argument("--session", help="a recorded session replayed as fast as possible")
+    parser.add_argument("--output", help="the file the JSON report is written to instead of stdout")
+    parser.add_argument("--baseline", help="a JSON report to compare the results with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="the relative change that counts as a regression")
+    args = parser.parse_args(argv)
+    options = {}
+    for option in args.option:
+        name, _, value = option.partition("=")
+        try:
+            options[name] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            options[name] = value
+    report = run(args.backend, options, args.lines, args.repeats, args.events, args.session)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        regressions = compare(report, json.load(file), args.threshold)
+    for name, old, new in regressions:
+        print(f"regression: {name} {old:.6g} -> {new:.6g}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
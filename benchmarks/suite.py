@@ -0,0 +1,357 @@
+"""
+TkConsole Benchmark Suite
+
+This module contains the benchmarks of the TkConsole library. Every benchmark takes a console factory and returns a
+list of results, each a dictionary with the name, value and unit of one measure; benchmarks that do not apply to a
+backend return results with a value of None.
+
+Functions:
+    tk_factory(options): Returns a factory of Tkinter consoles.
+    headless_factory(options): Returns a factory of headless consoles.
+    bench_print(factory, lines, width): Measures the output throughput of `print`.
+    bench_input(factory, repeats): Measures the latency of `input`.
+    bench_resize(factory, events): Measures the cost of layout adjustments under a storm of resize events.
+    bench_memory(factory, lines, width): Measures the memory growth per million printed lines.
+    bench_replay(factory, session): Measures the throughput of replaying a recorded session as fast as possible.
+    run(backend, options, lines, repeats, events, session): Runs every benchmark and returns the report.
+    compare(report, baseline, threshold): Returns the measures that regressed against a baseline report.
+"""
+
+import datetime
+import gc
+import os
+import platform
+import statistics
+import sys
+import time
+import TkConsole
+from TkConsole import HeadlessConsole, SessionReplay, read_session
+
+# measures where a higher value is better; lower is better for the others
+HIGHER_IS_BETTER = ("print_lines_per_second", "print_megabytes_per_second", "replay_events_per_second",
+                    "replay_megabytes_per_second")
+
+
+def _result(name, value, unit):
+    """Returns a benchmark result."""
+    return {"name": name, "value": value, "unit": unit}
+
+
+def tk_factory(options):
+    """
+    Returns a factory of Tkinter consoles.
+
+    Args:
+        options (dict): Keyword arguments for the consoles.
+
+    Returns:
+        callable: A function returning a new console, with its root window as the `root` attribute.
+    """
+    import tkinter as tk
+
+    def factory():
+        root = tk.Tk()
+        root.geometry("800x600")
+        console = TkConsole.Console(root, **options)
+        console.root = root
+        root.update()
+        return console
+
+    return factory
+
+
+def headless_factory(options):
+    """
+    Returns a factory of headless consoles.
+
+    Args:
+        options (dict): Keyword arguments for the consoles.
+
+    Returns:
+        callable: A function returning a new console, with None as the `root` attribute.
+    """
+    def factory():
+        console = HeadlessConsole(**options)
+        console.root = None
+        return console
+
+    return factory
+
+
+def _close(console):
+    """Destroys the root window of a console, if it has one."""
+    if console.root is not None:
+        console.root.destroy()
+
+
+def _settle(console):
+    """Processes the pending events of a console, so that its output is rendered."""
+    console.flush()
+    if console.root is not None:
+        console.root.update()
+
+
+def bench_print(factory, lines=100000, width=80):
+    """
+    Measures the output throughput of `print`, including rendering.
+
+    Args:
+        factory (callable): The console factory.
+        lines (int): The number of lines printed.
+        width (int): The number of characters per line.
+
+    Returns:
+        list: The lines per second and megabytes per second.
+    """
+    console = factory()
+    line = "x" * (width - 8)
+    start = time.perf_counter()
+    for number in range(lines):
+        console.print(f"{number:7d} {line}")
+        if number % 1000 == 999:
+            _settle(console)
+    _settle(console)
+    elapsed = time.perf_counter() - start
+    _close(console)
+    return [
+        _result("print_lines_per_second", lines / elapsed, "lines/s"),
+        _result("print_megabytes_per_second", lines * width / elapsed / 1e6, "MB/s"),
+    ]
+
+
+def bench_input(factory, repeats=50):
+    """
+    Measures the latency of `input`: until the entry field takes keys, and until the entered value is returned.
+
+    Args:
+        factory (callable): The console factory.
+        repeats (int): The number of inputs taken.
+
+    Returns:
+        list: The median and 95th percentile of both latencies, in milliseconds.
+    """
+    console = factory()
+    appeared, returned = [], []
+    if console.root is None:
+        console.input_source = iter(["value"] * repeats)
+    for _ in range(repeats):
+        marks = {}
+
+        def submit():
+            marks["appeared"] = time.perf_counter()
+            console.helpers.user_input_var.set("value")
+            marks["submitted"] = time.perf_counter()
+            console.submit_input()
+
+        if console.root is not None:
+            console.root.after_idle(submit)
+        start = time.perf_counter()
+        console.input("> ")
+        end = time.perf_counter()
+        if console.root is not None:
+            appeared.append((marks["appeared"] - start) * 1000)
+            returned.append((end - marks["submitted"]) * 1000)
+        else:
+            returned.append((end - start) * 1000)
+    _close(console)
+    results = []
+    for name, samples in (("input_appear", appeared), ("input_return", returned)):
+        results.append(_result(f"{name}_median_ms", statistics.median(samples) if samples else None, "ms"))
+        results.append(_result(f"{name}_p95_ms", _percentile(samples, 95) if samples else None, "ms"))
+    return results
+
+
+def _percentile(samples, percent):
+    """Returns a percentile of samples by the nearest-rank method."""
+    ordered = sorted(samples)
+    return ordered[max(0, -(-len(ordered) * percent // 100) - 1)]
+
+
+def bench_resize(factory, events=1000):
+    """
+    Measures the cost of layout adjustments under a storm of resize events.
+
+    Args:
+        factory (callable): The console factory.
+        events (int): The number of <Configure> events in the storm.
+
+    Returns:
+        list: The time per event, the time until the layout settles, the number of adjustments made and the time of
+        one adjustment.
+    """
+    console = factory()
+    if console.root is None:
+        return [_result(name, None, unit) for name, unit in (
+            ("resize_event_us", "us"), ("resize_settle_ms", "ms"), ("resize_adjustments", "calls"),
+            ("adjust_on_configure_us", "us"))]
+    import tkinter as tk
+    for number in range(200):
+        console.print(f"line {number}")
+    console.input_async("> ")
+    _settle(console)
+    adjust = console.adjust_on_configure
+    calls = []
+
+    def counting_adjust(event):
+        calls.append(event)
+        adjust(event)
+
+    console.adjust_on_configure = counting_adjust
+    start = time.perf_counter()
+    for number in range(events):
+        event = tk.Event()
+        event.width, event.height = 600 + number % 200, 400 + number % 100
+        console._on_configure(event)
+    dispatched = time.perf_counter()
+    while console.helpers.resize_job is not None:
+        console.root.update()
+    settled = time.perf_counter()
+    console.adjust_on_configure = adjust
+    start_adjust = time.perf_counter()
+    for _ in range(100):
+        console.adjust_on_configure(None)
+    adjusted = time.perf_counter()
+    console.submit_input()
+    _close(console)
+    return [
+        _result("resize_event_us", (dispatched - start) / events * 1e6, "us"),
+        _result("resize_settle_ms", (settled - start) * 1000, "ms"),
+        _result("resize_adjustments", len(calls), "calls"),
+        _result("adjust_on_configure_us", (adjusted - start_adjust) / 100 * 1e6, "us"),
+    ]
+
+
+def _memory():
+    """Returns the resident memory of the process in bytes, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def bench_memory(factory, lines=200000, width=80):
+    """
+    Measures the memory growth per million printed lines.
+
+    Args:
+        factory (callable): The console factory.
+        lines (int): The number of lines printed.
+        width (int): The number of characters per line.
+
+    Returns:
+        list: The growth of the resident memory, in megabytes per million lines.
+    """
+    console = factory()
+    gc.collect()
+    before = _memory()
+    line = "x" * (width - 8)
+    for number in range(lines):
+        console.print(f"{number:7d} {line}")
+        if number % 10000 == 9999:
+            _settle(console)
+    _settle(console)
+    gc.collect()
+    after = _memory()
+    _close(console)
+    # bytes per line are megabytes per million lines
+    growth = None if before is None or after is None else (after - before) / lines
+    return [_result("memory_megabytes_per_million_lines", growth, "MB")]
+
+
+def bench_replay(factory, session):
+    """
+    Measures the throughput of replaying a recorded session as fast as possible, including rendering. The events are
+    read before the replay starts, so that reading the file is not measured.
+
+    Args:
+        factory (callable): The console factory.
+        session (str): The path of a recording made with `Console.record`.
+
+    Returns:
+        list: The events per second and megabytes per second.
+    """
+    events = list(read_session(session))
+    console = factory()
+    replay = SessionReplay(console, events, speed=None)
+    if console.root is None:
+        replay.run()
+    else:
+        replay.start()
+        while not replay.future.done():
+            console.root.update()
+        _settle(console)
+    summary = replay.future.result()
+    _close(console)
+    return [
+        _result("replay_events_per_second", summary["events_per_second"], "events/s"),
+        _result("replay_megabytes_per_second", summary["megabytes_per_second"], "MB/s"),
+    ]
+
+
+def run(backend="tk", options=None, lines=100000, repeats=50, events=1000, session=None):
+    """
+    Runs every benchmark and returns the report.
+
+    Args:
+        backend (str): "tk" for the Tkinter console or "headless" for the headless console.
+        options (dict, optional): Keyword arguments for the consoles.
+        lines (int): The number of lines printed by the throughput and memory benchmarks.
+        repeats (int): The number of inputs taken by the latency benchmark.
+        events (int): The number of resize events of the resize benchmark.
+        session (str, optional): The path of a recorded session replayed by the replay benchmark, which is skipped if
+            omitted.
+
+    Returns:
+        dict: The report, with the environment and the results.
+    """
+    options = options or {}
+    factory = tk_factory(options) if backend == "tk" else headless_factory(options)
+    results = []
+    results.extend(bench_print(factory, lines))
+    results.extend(bench_input(factory, repeats))
+    results.extend(bench_resize(factory, events))
+    results.extend(bench_memory(factory, lines))
+    if session is not None:
+        results.extend(bench_replay(factory, session))
+    return {
+        "version": TkConsole.__version__,
+        "backend": backend,
+        "options": {name: repr(value) for name, value in options.items()},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=0.1):
+    """
+    Returns the measures that regressed against a baseline report.
+
+    Args:
+        report (dict): The report of the current run.
+        baseline (dict): The report to compare with.
+        threshold (float): The relative change that counts as a regression.
+
+    Returns:
+        list: The (name, baseline value, current value) of every regressed measure.
+    """
+    previous = {result["name"]: result["value"] for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old, new = previous.get(result["name"]), result["value"]
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if result["name"] in HIGHER_IS_BETTER:
+            change = -change
+        if change > threshold:
+            regressions.append((result["name"], old, new))
+    return regressions
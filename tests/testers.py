@@ -6,14 +6,46 @@ and its methods using the unittest framework and mocking.
 
 Classes:
     ConsoleTester (class): Unit tests for the Console class.
+    OutputQueueTester (class): Unit tests for the OutputQueue class.
+    LineStoreTester (class): Unit tests for the LineStore class.
+    AnsiParserTester (class): Unit tests for the AnsiParser class.
+    SearchIndexTester (class): Unit tests for the SearchIndex class.
+    InputHistoryTester (class): Unit tests for the InputHistory class.
+    CompletionTester (class): Unit tests for the Trie class and the completers.
+    HeadlessConsoleTester (class): Unit tests for the HeadlessConsole class.
+    BenchmarkTester (class): Unit tests for the benchmark suite.
+    ConsoleStatsTester (class): Unit tests for the ConsoleStats class.
+    ChannelConsoleTester (class): Unit tests for the ChannelConsole class and the scoped bindings.
+    LineEditorTester (class): Unit tests for the LineEditor and ProgressBar classes.
+    ReplTester (class): Unit tests for the child interpreter of the REPL.
+    ServerTester (class): Unit tests for the ConsoleServer class.
+    HighlighterTester (class): Unit tests for the Highlighter class.
+    SessionTester (class): Unit tests for the SessionRecorder and SessionReplay classes.
+    ConsoleStreamTester (class): Unit tests for the ConsoleStream class.
 """
 
+import asyncio
+import concurrent.futures
+import gzip
+import json
 import os
+import random
+import socket
+import subprocess
 from subprocess import Popen
+import sys
+import tempfile
+import threading
+import time
+import types
 import unittest
 from unittest.mock import patch
 import tkinter as tk
-from TkConsole import Console
+from TkConsole import Console, OutputQueue, LineStore, AnsiParser, SearchIndex, InputHistory, HeadlessConsole, \
+    ConsoleStats, ChannelConsole, LineEditor, ConsoleServer, Highlighter, DEFAULT_RULES, SessionReplay, read_session, \
+    ConsoleStream, redirect
+from benchmarks.suite import run, compare
+from TkConsole.completion import Trie, WordCompleter, PathCompleter, AttributeCompleter
 from .patches import FakeTk, FakeScrolledText
 
 
@@ -33,15 +65,44 @@ class ConsoleTester(unittest.TestCase):
         copy_text_tester(self, text=None, text_to_copy=None, tag_start=None, tag_end=None): Tester function for the
         copy_text method's functionality.
         paste_text_tester(self, clipboard_text): Tester function for the paste_text method's functionality.
+        buffered_print_tester(self, prints=None, expected_output=None): Tester function for the print method in
+        buffered mode.
+        threadsafe_print_tester(self, lines=None): Tester function for printing to the console from another thread.
+        scrollback_tester(self, max_lines=None, count=None): Tester function for the bounded scrollback.
+        virtual_copy_tester(self, count=None): Tester function for copying from the backing store in virtual mode.
+        redirect_tester(self, output=None, error=None): Tester function for redirecting sys.stdout and sys.stderr.
+        input_async_tester(self, prompt=None, value=None): Tester function for the input_async and ainput methods.
+        run_process_tester(self, threaded=None): Tester function for streaming the output of a subprocess.
+        ansi_tester(self, max_ansi_tags=None): Tester function for styling output with ANSI escape sequences.
+        search_tester(self, count=None, query=None): Tester function for searching the output.
+        resize_tester(self, sizes=None): Tester function for the debounced resize handling.
+        history_tester(self, entries=None): Tester function for navigating the input history from the entry field.
+        completion_tester(self, words=None): Tester function for tab completion in the entry field.
+        save_tester(self, count=None, virtual=None, compress=None): Tester function for saving the scrollback to a
+        file in chunks.
+        stats_tester(self, count=None): Tester function for the instrumentation of the hot paths.
+        render_rate_tester(self, rate=None, count=None): Tester function for limiting the render rate.
+        pause_tester(self, count=None): Tester function for holding output back while the view is scrolled away from
+        the end.
+        reuse_entry_tester(self, values=None): Tester function for reusing one entry field for every input.
+        rewrite_tester(self, updates=None, virtual=None): Tester function for rewriting the last line in place.
+        type_ahead_tester(self, script=None, typed=None): Tester function for taking queued and typed-ahead inputs.
+        repl_tester(self, isolated=None): Tester function for the interactive Python interpreter.
+        server_tester(self, clients=None, lines=None): Tester function for streaming messages from local clients.
+        highlight_tester(self, count=None): Tester function for highlighting patterns in new output.
+        record_tester(self, count=None): Tester function for recording a session and replaying it.
     """
 
-    def setUp(self):
+    def setUp(self, **kwargs):
         """
         Set up the test environment.
 
         This method creates a Tkinter root window and initializes a Console instance for testing.
         It also initializes attributes for accessing the text area, entry widget, and user_input_var.
 
+        Args:
+            **kwargs: Keyword arguments passed on to the Console instance.
+
         Returns:
             None
         """
@@ -49,7 +110,7 @@ class ConsoleTester(unittest.TestCase):
             with Popen(["/usr/bin/Xvfb", ":1", "-screen", "0", "1600x1200x16", "&"]):
                 os.environ["DISPLAY"] = ":1.0"
         self.root = FakeTk()
-        self.console = Console(self.root)
+        self.console = Console(self.root, **kwargs)
         self.console.text_area = FakeScrolledText(
             self.console.parent, wrap=tk.WORD, font=self.console.font, background=self.console.background,
             foreground=self.console.foreground, padx=0,
@@ -148,3 +209,1561 @@ class ConsoleTester(unittest.TestCase):
         self.root.update_idletasks()
         self.tearDown()
         self.root = None
+
+    def buffered_print_tester(self, prints=None, expected_output=None):
+        """
+        Tester function for the print method in buffered mode.
+
+        This method tests whether buffered output stays out of the text area until it is flushed and is then written
+        in full.
+
+        Returns:
+            None
+        """
+        self.setUp(buffered=True, flush_interval=1000)
+        for item in prints:
+            self.console.print(item)
+        self.assertEqual(self.text_area.get("1.0", tk.END), "\n")
+        self.console.flush()
+        self.assertEqual(self.text_area.get("1.0", tk.END), expected_output)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def threadsafe_print_tester(self, lines=None):
+        """
+        Tester function for printing to the console from another thread.
+
+        This method tests whether output printed from a worker thread is queued and written by the Tkinter thread.
+
+        Returns:
+            None
+        """
+        self.setUp(threadsafe=True)
+        worker = threading.Thread(target=lambda: [self.console.print_threadsafe(line) for line in lines])
+        worker.start()
+        worker.join()
+        self.assertEqual(self.text_area.get("1.0", tk.END), "\n")
+        self.console.drain_output()
+        self.assertEqual(self.text_area.get("1.0", tk.END), "".join(line + "\n" for line in lines) + "\n")
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def scrollback_tester(self, max_lines=None, count=None):
+        """
+        Tester function for the bounded scrollback.
+
+        This method tests whether the oldest lines are trimmed once the scrollback grows beyond its line limit.
+
+        Returns:
+            None
+        """
+        self.setUp(max_lines=max_lines, trim_slack=0.5)
+        for number in range(count):
+            self.console.print(f"line {number}")
+        self.assertLessEqual(self.console.line_count, int(max_lines * 1.5))
+        self.assertEqual(int(self.text_area.index("end-1c").split(".")[0]), self.console.line_count)
+        self.assertEqual(len(self.text_area.get("1.0", "end-1c").encode("utf-8")), self.console.byte_count)
+        self.assertEqual(self.text_area.get("end-2l", "end-1c"), f"line {count - 1}\n")
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def virtual_copy_tester(self, count=None):
+        """
+        Tester function for copying from the backing store in virtual mode.
+
+        This method tests whether only a window of the output is rendered and whether a selection is still copied
+        after it has been scrolled out of the rendered window.
+
+        Returns:
+            None
+        """
+        self.setUp(virtual=True, virtual_margin=5)
+        for number in range(count):
+            self.console.print(f"line {number}")
+        self.console.go_to_home(None)
+        self.assertEqual(self.text_area.get("1.0", "2.0"), "line 0\n")
+        self.assertLess(int(self.text_area.index("end-1c").split(".")[0]), count)
+        self.text_area.tag_add(tk.SEL, "1.5", "3.0")
+        self.console.go_to_end(None)
+        self.assertEqual(self.text_area.get("end-2l", "end-1c"), f"line {count - 1}\n")
+        self.console.copy_text()
+        self.assertEqual(self.console.parent.clipboard_get(), "0\nline 1\n")
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def redirect_tester(self, output=None, error=None):
+        """
+        Tester function for redirecting sys.stdout and sys.stderr.
+
+        This method tests whether printed text reaches the text area and whether text written to sys.stderr is styled
+        with the "stderr" tag.
+
+        Returns:
+            None
+        """
+        self.setUp()
+        with redirect(self.console):
+            print(output, end="")
+            self.assertEqual(self.text_area.get("1.0", tk.END), "\n")
+            print()
+            print(error, file=sys.stderr)
+        self.assertEqual(self.text_area.get("1.0", tk.END), f"{output}\n{error}\n\n")
+        self.assertEqual(self.text_area.get(*self.text_area.tag_ranges("stderr")), f"{error}\n")
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def input_async_tester(self, prompt=None, value=None):
+        """
+        Tester function for the input_async and ainput methods.
+
+        This method tests whether submitting the entry resolves the future, calls the callback and echoes the input,
+        and whether ainput can be awaited while the entry is filled in.
+
+        Returns:
+            None
+        """
+
+        async def take_input():
+            """
+            Await ainput while the entry is filled in and submitted.
+            """
+            task = asyncio.ensure_future(self.console.ainput())
+            await asyncio.sleep(0)
+            self.console.entry.insert(0, value)
+            self.console.submit_input()
+            return await task
+
+        self.setUp()
+        entered = []
+        future = self.console.input_async(prompt, callback=entered.append)
+        self.assertFalse(future.done())
+        self.console.entry.insert(0, value)
+        self.console.submit_input()
+        self.assertEqual(future.result(), value)
+        self.assertEqual(entered, [value])
+        self.assertIsNone(self.console.entry)
+        self.assertEqual(self.text_area.get("1.0", tk.END), f"{prompt}{value}\n\n")
+        self.assertEqual(asyncio.run(take_input()), value)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def run_process_tester(self, threaded=None):
+        """
+        Tester function for streaming the output of a subprocess.
+
+        This method runs a Python subprocess that writes to stdout and stderr and exits with a non-zero code, and
+        processes Tkinter events until the exit code is reported.
+
+        Returns:
+            None
+        """
+        self.setUp()
+        code = "import sys; print('x' * 100000); print('error', file=sys.stderr); sys.exit(3)"
+        process = self.console.run_process([sys.executable, "-c", code], merge_stderr=False, chunk_size=4096,
+                                           threaded=threaded)
+        while not process.future.done():
+            self.root.update()
+        self.assertEqual(process.future.result(), 3)
+        self.assertEqual(process.returncode, 3)
+        self.assertEqual(self.text_area.get("1.0", tk.END).count("x"), 100000)
+        self.assertEqual(self.text_area.get(*self.text_area.tag_ranges("stderr")), "error\n")
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def ansi_tester(self, max_ansi_tags=None):
+        """
+        Tester function for styling output with ANSI escape sequences.
+
+        This method tests whether escape sequences are removed, whether styled text is tagged, whether a style reuses
+        its tag and whether the number of tags stays within the pool size.
+
+        Returns:
+            None
+        """
+        self.setUp(ansi=True, max_ansi_tags=max_ansi_tags)
+        self.console.print("plain \x1b[1;3", end="")
+        self.console.print("1mred\x1b[0m plain \x1b[31mred again\x1b[0m")
+        self.assertEqual(self.text_area.get("1.0", tk.END), "plain red plain red again\n\n")
+        tag = self.console.ansi_tags.tag(("#CD3131", None, True, False, False, False, False))
+        self.assertEqual(self.text_area.get(*self.text_area.tag_ranges(tag)), "red")
+        for number in range(max_ansi_tags * 2):
+            self.console.print(f"\x1b[38;5;{number}mcolor {number}\x1b[0m")
+        self.assertEqual(len(self.console.ansi_tags), max_ansi_tags)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def search_tester(self, count=None, query=None):
+        """
+        Tester function for searching the output.
+
+        This method tests whether the matches are counted, whether only the visible matches are highlighted and
+        whether navigating to the next match highlights it as the current one.
+
+        Returns:
+            None
+        """
+        self.setUp(searchable=True)
+        for number in range(count):
+            self.console.print(f"line {number}")
+        self.console.go_to_home(None)
+        self.assertEqual(self.console.search(query, regex=True), count // 10)
+        highlighted = self.text_area.tag_ranges("search") + self.text_area.tag_ranges("search_current")
+        self.assertLess(len(highlighted) // 2, count // 10)
+        self.assertEqual(str(self.text_area.tag_ranges("search_current")[0]), "6.5")
+        self.console.search_next()
+        self.assertEqual(str(self.text_area.tag_ranges("search_current")[0]), "16.6")
+        self.assertEqual(self.console.search("LINE", ignore_case=True), count)
+        self.console.clear_search()
+        self.assertEqual(self.text_area.tag_ranges("search"), ())
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def resize_tester(self, sizes=None):
+        """
+        Tester function for the debounced resize handling.
+
+        This method tests whether a burst of <Configure> events adjusts the layout once, with the last size, and
+        whether the font metrics are measured once until they are invalidated.
+
+        Returns:
+            None
+        """
+        self.setUp(resize_delay=0)
+        with patch.object(self.console, "adjust_on_configure") as adjust:
+            for width, height in sizes:
+                event = tk.Event()
+                event.width, event.height = width, height
+                self.console._on_configure(event)
+            self.root.update()
+            adjust.assert_called_once()
+            self.assertEqual(self.console.helpers.settled_size, sizes[-1])
+            self.console._on_configure(event)
+            self.root.update()
+            adjust.assert_called_once()
+        with patch.object(self.console.font, "measure", return_value=7) as measure:
+            self.console.helpers.font_metrics = None
+            self.assertEqual(self.console._char_width(), 7)
+            self.console._char_width()
+            measure.assert_called_once()
+            self.console.configure_font(size=14)
+            self.console._char_width()
+            self.assertEqual(measure.call_count, 2)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def history_tester(self, entries=None):
+        """
+        Tester function for navigating the input history from the entry field.
+
+        This method tests whether submitted inputs are recorded, whether 'Up' and 'Down' navigate the entries that
+        start with the typed text, whether 'Ctrl+R' finds the entries that contain it and whether the history file is
+        closed with the console.
+
+        Returns:
+            None
+        """
+        self.setUp(history=True)
+        for entry in entries:
+            self.console.input_async()
+            self.console.helpers.user_input_var.set(entry)
+            self.console.submit_input()
+        self.assertEqual(list(self.console.history), entries)
+        self.console.input_async()
+        self.console.helpers.user_input_var.set(entries[0][:2])
+        self.console.history_previous()
+        self.assertEqual(self.console.helpers.user_input_var.get(), entries[-1])
+        self.console.history_previous()
+        self.assertEqual(self.console.helpers.user_input_var.get(), entries[0])
+        self.console.history_next()
+        self.console.history_next()
+        self.assertEqual(self.console.helpers.user_input_var.get(), entries[0][:2])
+        self.console.helpers.user_input_var.set(entries[1][-3:])
+        self.console.history_search()
+        self.assertEqual(self.console.helpers.user_input_var.get(), entries[1])
+        self.console.history_cancel()
+        self.assertEqual(self.console.helpers.user_input_var.get(), entries[1][-3:])
+        self.console.submit_input()
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+        with tempfile.TemporaryDirectory() as directory:
+            self.setUp(history=os.path.join(directory, "history"))
+            for entry in entries:
+                self.console.input_async()
+                self.console.helpers.user_input_var.set(entry)
+                self.console.submit_input()
+            self.assertIsNotNone(self.console.history._file)
+            self.root.update_idletasks()
+            self.tearDown()
+            self.root = None
+            self.assertIsNone(self.console.history._file)
+
+    def completion_tester(self, words=None):
+        """
+        Tester function for tab completion in the entry field.
+
+        This method tests whether a unique completion is inserted, whether the common prefix of several completions
+        is inserted, whether the completions of a threaded completer are listed in a paged popup, whether typing
+        cancels a pending completion and whether the worker threads are stopped with the console.
+
+        Returns:
+            None
+        """
+        def complete(text):
+            self.console.helpers.user_input_var.set(text)
+            self.console.entry.icursor(tk.END)
+            self.console.complete_input()
+            deadline = time.monotonic() + 5
+            while self.console.completion._callback is not None and time.monotonic() < deadline:
+                self.root.update()
+            return self.console.helpers.user_input_var.get()
+
+        self.setUp(completers=[WordCompleter(words), PathCompleter()], completion_page_size=2)
+        self.console.input_async()
+        self.assertEqual(complete(f"run {words[0][:-1]}"), f"run {words[0]}")
+        self.assertEqual(complete("run " + os.path.commonprefix(words)[:1]), "run " + os.path.commonprefix(words))
+        self.assertIsNone(self.console.completion_popup)
+        directory = os.path.dirname(os.path.abspath(__file__)) + os.sep
+        complete(directory)
+        self.assertIsNotNone(self.console.completion_popup)
+        self.assertEqual(self.console.completion_popup.listbox.size(), 2)
+        self.console.completion_popup.show_page(1)
+        self.console.completion_popup.accept()
+        self.assertIsNone(self.console.completion_popup)
+        self.assertTrue(self.console.helpers.user_input_var.get().startswith(directory))
+        self.console.helpers.user_input_var.set(directory)
+        self.console.complete_input()
+        self.console.helpers.user_input_var.set("typed")
+        self.assertIsNone(self.console.completion._callback)
+        self.console.submit_input()
+        self.assertIsNotNone(self.console.completion._executor)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+        self.assertIsNone(self.console.completion._executor)
+
+    def save_tester(self, count=None, virtual=None, compress=None):
+        """
+        Tester function for saving the scrollback to a file in chunks.
+
+        This method tests whether the saved file holds every line with its timestamp, whether progress is reported per
+        chunk, whether the file is compressed when requested and whether a cancelled export resolves its future and
+        removes its file.
+
+        Returns:
+            None
+        """
+        self.setUp(virtual=virtual, timestamps=True)
+        for number in range(count):
+            self.console.print(f"line {number}")
+        progress = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "console.txt.gz" if compress else "console.txt")
+            export = self.console.save(path, timestamps=True, chunk_lines=count // 4,
+                                       on_progress=lambda written, total: progress.append(written))
+            deadline = time.monotonic() + 5
+            while not export.future.done() and time.monotonic() < deadline:
+                self.root.update()
+            self.assertEqual(export.future.result(), count)
+            self.assertEqual(progress, [count // 4 * number for number in range(1, 5)])
+            with (gzip.open if compress else open)(path, "rt", encoding="utf-8") as file:
+                lines = file.read().splitlines()
+            cancelled = self.console.save(path, chunk_lines=count // 4,
+                                          on_progress=lambda written, total: cancelled.cancel())
+            deadline = time.monotonic() + 5
+            while not cancelled.future.done() and time.monotonic() < deadline:
+                self.root.update()
+            self.assertTrue(cancelled.future.cancelled())
+            self.assertRaises(concurrent.futures.CancelledError, cancelled.future.result)
+            self.assertEqual(cancelled.written, count // 4)
+            self.assertFalse(os.path.exists(path))
+        self.assertEqual(len(lines), count)
+        self.assertTrue(lines[-1].endswith(f" line {count - 1}"))
+        self.assertRegex(lines[0], r"^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\.\d{3} line 0$")
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def stats_tester(self, count=None):
+        """
+        Tester function for the instrumentation of the hot paths.
+
+        This method tests whether writes, bytes, lines, inserts and autoscroll decisions are counted, whether the
+        input and layout adjustments are timed, whether the hook sees every count and whether a console without
+        instrumentation reports empty stats.
+
+        Returns:
+            None
+        """
+        events = []
+        self.setUp(stats_hook=lambda name, value: events.append(name))
+        for number in range(count):
+            self.console.print(f"line {number}")
+        self.console.input_async()
+        self.console.adjust_on_configure(None)
+        self.console.submit_input()
+        stats = self.console.stats(reset=True)
+        self.assertEqual(stats["counters"]["prints"], count + 1)
+        self.assertEqual(stats["counters"]["writes"], count + 1)
+        self.assertEqual(stats["counters"]["inserts"], count + 1)
+        self.assertEqual(stats["counters"]["lines"], count + 1)
+        self.assertEqual(stats["counters"]["autoscroll_checks"], count + 1)
+        self.assertEqual(stats["counters"]["inputs"], 1)
+        self.assertGreaterEqual(stats["timers"]["adjust_on_configure"]["count"], 1)
+        self.assertEqual(stats["timers"]["insert_output"]["count"], count + 1)
+        self.assertEqual(events.count("prints"), count + 1)
+        self.assertEqual(self.console.stats()["counters"], {})
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+        self.setUp()
+        self.console.print("line")
+        self.assertEqual(self.console.stats(), {"counters": {}, "timers": {}, "seconds": 0.0})
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def render_rate_tester(self, rate=None, count=None):
+        """
+        Tester function for limiting the render rate.
+
+        This method floods the console with more lines than the render rate allows and tests whether the excess lines
+        are suppressed, whether their summary is written, and whether the last lines are kept.
+
+        Returns:
+            None
+        """
+        self.setUp(max_render_rate=rate)
+        for number in range(count):
+            self.console.print(f"line {number}")
+        self.console.write_output("".join(f"chunk {number}\n" for number in range(count)))
+        self.assertLess(self.console.line_count, 2 * count)
+        self.assertGreater(self.console.helpers.suppressed_lines, 0)
+        self.assertNotIn(f"chunk {count - rate - 1}\n", self.text_area.get("1.0", tk.END))
+        self.console._write_summary()
+        text = self.text_area.get("1.0", tk.END)
+        self.assertRegex(text, r"\[\d+ lines suppressed\]\n$")
+        self.assertEqual(self.console.helpers.suppressed_lines, 0)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def pause_tester(self, count=None):
+        """
+        Tester function for holding output back while the view is scrolled away from the end.
+
+        This method scrolls the view to the top, writes output and tests whether the output is held back until the
+        view returns to the end.
+
+        Returns:
+            None
+        """
+        self.setUp(pause_scrolled=True)
+        for number in range(count):
+            self.console.print(f"line {number}")
+        self.root.update()
+        self.text_area.yview_moveto(0)
+        self.root.update()
+        self.console.print("held back")
+        self.assertNotIn("held back", self.text_area.get("1.0", tk.END))
+        self.assertEqual(self.console.helpers.paused_lines, 1)
+        self.console.go_to_end(None)
+        self.assertIn("held back", self.text_area.get("1.0", tk.END))
+        self.assertEqual(self.console.helpers.paused_output, [])
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def rewrite_tester(self, updates=None, virtual=None):
+        """
+        Tester function for rewriting the last line in place.
+
+        This method writes many carriage return updates and a progress bar, and tests that they are coalesced into
+        single lines of the text area and that the line and byte counts stay consistent.
+
+        Returns:
+            None
+        """
+        self.setUp(rewrite_lines=True, ansi=True, virtual=virtual)
+        self.console.print("start")
+        for number in range(updates):
+            self.console.write_output(f"\r\x1b[32m{number}\x1b[0m%")
+        self.console.flush()
+        self.console.write_output("\x1b[K\n")
+        bar = self.console.progress(updates, width=4, min_interval=0)
+        for _ in range(updates):
+            bar.update()
+        bar.close()
+        self.console.flush()
+        self.assertEqual(self.text_area.get("1.0", "end-1c"),
+                         f"start\n{updates - 1}%\n[####] 100% {updates}/{updates}\n")
+        self.assertEqual(self.console.line_count, 4)
+        self.assertEqual(self.console.byte_count, len(self.text_area.get("1.0", "end-1c")))
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def reuse_entry_tester(self, values=None):
+        """
+        Tester function for reusing one entry field for every input.
+
+        This method takes several inputs and tests whether they are entered through the same entry field, which stays
+        alive between inputs without leaving embedded windows in the text area, and whether the input method returns
+        them.
+
+        Returns:
+            None
+        """
+        self.setUp(reuse_entry=True)
+        entries = []
+        for value in values:
+            future = self.console.input_async("> ")
+            entries.append(self.console.entry)
+            self.assertEqual(len(self.text_area.window_names()), 1)
+            self.assertEqual(self.console.helpers.user_input_var.get(), "")
+            self.console.helpers.user_input_var.set(value)
+            self.console.submit_input()
+            self.assertEqual(future.result(timeout=0), value)
+            self.assertIsNone(self.console.entry)
+            self.assertEqual(self.text_area.window_names(), ())
+        self.assertEqual(len(set(map(str, entries))), 1)
+        self.assertTrue(entries[0].winfo_exists())
+        self.root.after_idle(lambda: (self.console.helpers.user_input_var.set("last"), self.console.submit_input()))
+        self.assertEqual(self.console.input("> "), "last")
+        text = self.text_area.get("1.0", tk.END)
+        for value in values:
+            self.assertIn(f"> {value}\n", text)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def type_ahead_tester(self, script=None, typed=None):
+        """
+        Tester function for taking queued and typed-ahead inputs.
+
+        This method queues a script and types a line while no input is pending, and tests whether the inputs are
+        returned in order and echoed without showing the entry field, and whether an unfinished line is carried into
+        the entry field of the next input.
+
+        Returns:
+            None
+        """
+        self.setUp(type_ahead=True, input_script=script[:1])
+        self.console.push_input(*script[1:])
+
+        def type_keys(text):
+            for char in text:
+                event = tk.Event()
+                event.keysym = "Return" if char == "\n" else char
+                event.char = char
+                self.console._on_type_ahead(event)
+
+        type_keys(typed + "\n" + typed)
+        self.assertEqual(self.console.input("> "), script[0])
+        for value in script[1:]:
+            self.assertEqual(self.console.input_async("> ").result(timeout=0), value)
+        self.assertEqual(self.console.input("> "), typed)
+        self.assertIsNone(self.console.entry)
+        text = self.text_area.get("1.0", tk.END)
+        for value in script + [typed]:
+            self.assertIn(f"> {value}\n", text)
+        future = self.console.input_async("> ")
+        self.assertEqual(self.console.helpers.user_input_var.get(), typed)
+        self.console.submit_input()
+        self.assertEqual(future.result(timeout=0), typed)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def repl_tester(self, isolated=None):
+        """
+        Tester function for the interactive Python interpreter.
+
+        This method enters a multi-line statement, an expression and an endless loop, processes Tkinter events while
+        they run, interrupts the loop with Control-c and tests the output of every statement, the end of the REPL on
+        SystemExit and the restored Control-c binding of the application.
+
+        Returns:
+            None
+        """
+        self.setUp(threadsafe=True)
+        stdout = sys.stdout
+        pressed = []
+        self.console.bind("<Control-c>", pressed.append)
+        self.console.push_input("def answer():", "    return 41 + 1", "", "print(answer())", "while True: pass",
+                                "")
+        repl = self.console.repl(None if isolated else {"__name__": "__console__"}, isolated=isolated, banner="")
+        deadline = time.monotonic() + 10
+        while not (repl.running and "42\n" in self.text_area.get("1.0", tk.END)) and time.monotonic() < deadline:
+            self.root.update()
+        self.assertTrue(repl.running)
+        time.sleep(0.2)
+        self.assertIs(self.root.focus_lastfor(), self.text_area)
+        self.text_area.event_generate("<Control-c>")
+        while repl.running and time.monotonic() < deadline:
+            self.root.update()
+        self.assertIsNotNone(self.console.entry)
+        self.console.helpers.user_input_var.set("raise SystemExit")
+        self.console.submit_input()
+        while not repl.future.done() and time.monotonic() < deadline:
+            self.root.update()
+        self.assertTrue(repl.closed)
+        text = self.text_area.get("1.0", tk.END)
+        self.assertIn(">>> def answer():\n...     return 41 + 1\n... \n>>> print(answer())\n42\n", text)
+        self.assertIn("KeyboardInterrupt", text)
+        self.assertIs(sys.stdout, stdout)
+        self.assertEqual(pressed, [])
+        self.text_area.event_generate("<Control-c>")
+        self.assertEqual(len(pressed), 1)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def server_tester(self, clients=None, lines=None):
+        """
+        Tester function for streaming messages from local clients.
+
+        This method connects several clients that name themselves and write lines from threads, processes Tkinter
+        events until every line is written and tests that each line is written whole after the label of its client.
+
+        Returns:
+            None
+        """
+        self.setUp()
+        server = self.console.serve()
+
+        def client(number):
+            with socket.create_connection(server.address) as sock:
+                sock.sendall(f"client {number}\n".encode())
+                for line in range(lines):
+                    sock.sendall(f"line {line}\n".encode())
+
+        threads = [threading.Thread(target=client, args=(number,)) for number in range(clients)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 10
+        while (server.messages < clients * lines or server.connections) and time.monotonic() < deadline:
+            self.root.update()
+        for thread in threads:
+            thread.join()
+        server.close()
+        text = self.text_area.get("1.0", tk.END)
+        for number in range(clients):
+            self.assertIn(f"[client {number}] line {lines - 1}\n", text)
+        self.assertEqual(text.count("] line "), clients * lines)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def highlight_tester(self, count=None):
+        """
+        Tester function for highlighting patterns in new output.
+
+        This method prints lines with errors, addresses and durations, some of them styled with ANSI escape sequences,
+        and tests whether the matches are tagged with the tags of their rules, and whether a write takes as many calls
+        to the text area with a long scrollback as with an empty one.
+
+        Returns:
+            None
+        """
+        self.setUp(ansi=True, instrument=True, highlight_rules=DEFAULT_RULES + [(r"\bpending\b", "stderr")])
+        self.console.print("\x1b[1mERROR\x1b[0m: connection to 10.0.0.12 lost after 250 ms")
+        ranges = self.text_area.tag_ranges("highlight_0")
+        self.assertEqual(self.text_area.get(*ranges[:2]), "ERROR: connection to 10.0.0.12 lost after 250 ms")
+        self.assertEqual(self.text_area.tag_ranges("highlight_3"), ())
+        self.console.print("request from 192.168.1.7 took 1.5 s, pending")
+        self.assertEqual(self.text_area.get(*self.text_area.tag_ranges("highlight_2")[:2]), "192.168.1.7")
+        self.assertEqual(self.text_area.get(*self.text_area.tag_ranges("highlight_3")[:2]), "1.5 s")
+        self.assertEqual(self.text_area.get(*self.text_area.tag_ranges("stderr")[:2]), "pending")
+
+        def calls_per_write():
+            self.console.stats(reset=True)
+            self.console.print("WARNING: retrying 10.0.0.1 in 20 ms")
+            return self.console.stats()["counters"]["tk_calls"]
+
+        before = calls_per_write()
+        for number in range(count):
+            self.console.print(f"WARNING: line {number} from 10.0.0.{number % 256} took {number} ms")
+        self.assertEqual(calls_per_write(), before)
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+    def record_tester(self, count=None):
+        """
+        Tester function for recording a session and replaying it.
+
+        This method records output, styled output and an input, replays the recording into the console from the event
+        loop as fast as possible and at a multiple of real time, and tests that the replayed output repeats the
+        recorded one.
+
+        Returns:
+            None
+        """
+        self.setUp()
+        inputs = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.rec.gz")
+            recorder = self.console.record(path)
+            for number in range(count):
+                self.console.print(f"line {number}")
+            self.console.write_output("error\n", "stderr")
+            self.console.push_input("value")
+            self.assertEqual(self.console.input("> "), "value")
+            recorder.close()
+            recorded = self.text_area.get("1.0", "end-1c")
+            for speed in (None, 100.0):
+                self.console.text_area.configure(state="normal")
+                self.console.text_area.delete("1.0", tk.END)
+                self.console.text_area.configure(state="disabled")
+                replay = self.console.replay(path, speed=speed, on_input=inputs.append)
+                deadline = time.monotonic() + 10
+                while not replay.future.done() and time.monotonic() < deadline:
+                    self.root.update()
+                self.assertTrue(replay.future.done())
+                self.assertEqual(self.text_area.get("1.0", "end-1c"), recorded)
+                self.assertEqual(replay.future.result()["events"], recorder.events)
+        self.assertEqual(inputs, ["value", "value"])
+        self.root.update_idletasks()
+        self.tearDown()
+        self.root = None
+
+
+class OutputQueueTester(unittest.TestCase):
+    """
+    OutputQueueTester class
+
+    This class contains unit tests for the OutputQueue class of the TkConsole package.
+
+    Methods:
+        backpressure_tester(self, policy=None, items=None, maxsize=None, expected_items=None, expected_dropped=None):
+        Tester function for the backpressure policies of the queue.
+    """
+
+    def backpressure_tester(self, policy=None, items=None, maxsize=None, expected_items=None, expected_dropped=None):
+        """
+        Tester function for the backpressure policies of the queue.
+
+        This method fills a queue beyond its capacity without waiting and checks which items were kept.
+
+        Returns:
+            None
+        """
+        output_queue = OutputQueue(maxsize, policy)
+        for item in items:
+            output_queue.put(item, timeout=0)
+        self.assertEqual(output_queue.drain(), expected_items)
+        self.assertEqual(output_queue.dropped, expected_dropped)
+
+
+class LineStoreTester(unittest.TestCase):
+    """
+    LineStoreTester class
+
+    This class contains unit tests for the LineStore class of the TkConsole package.
+
+    Methods:
+        lines_tester(self, writes=None, trim=None, expected_lines=None): Tester function for appending, reading and
+        trimming lines.
+    """
+
+    def lines_tester(self, writes=None, trim=None, expected_lines=None):
+        """
+        Tester function for appending, reading and trimming lines.
+
+        This method appends the given writes, trims the given number of lines and checks the remaining lines.
+
+        Returns:
+            None
+        """
+        store = LineStore()
+        for text in writes:
+            store.append(text)
+        store.trim(trim)
+        self.assertEqual([store.line(number) for number in range(len(store))], expected_lines)
+        self.assertEqual(store.text(0, len(store)), "\n".join(expected_lines))
+        self.assertEqual(store.byte_count, len("\n".join(expected_lines).encode("utf-8")))
+
+
+class AnsiParserTester(unittest.TestCase):
+    """
+    AnsiParserTester class
+
+    This class contains unit tests for the AnsiParser class of the TkConsole package.
+
+    Methods:
+        feed_tester(self, chunks=None, expected_segments=None): Tester function for parsing text in chunks.
+    """
+
+    def feed_tester(self, chunks=None, expected_segments=None):
+        """
+        Tester function for parsing text in chunks.
+
+        This method feeds the given chunks to a parser and compares the (text, foreground color) pairs of the resulting
+        segments.
+
+        Returns:
+            None
+        """
+        parser = AnsiParser()
+        segments = [(text, style[0]) for chunk in chunks for text, style in parser.feed(chunk)]
+        self.assertEqual(segments, expected_segments)
+
+
+class SearchIndexTester(unittest.TestCase):
+    """
+    SearchIndexTester class
+
+    This class contains unit tests for the SearchIndex class of the TkConsole package.
+
+    Methods:
+        find_tester(self, lines=None, trim=None, queries=None): Tester function for finding and locating matches.
+    """
+
+    def find_tester(self, lines=None, trim=None, queries=None):
+        """
+        Tester function for finding and locating matches.
+
+        This method indexes the given lines, trims the given number of lines and checks the (line, column) locations of
+        the matches of each (query, regex, ignore_case, expected_locations) entry.
+
+        Returns:
+            None
+        """
+        index = SearchIndex()
+        for line in lines:
+            index.append(line + "\n")
+        index.trim(trim)
+        for query, regex, ignore_case, expected_locations in queries:
+            starts, _ = index.find(query, regex, ignore_case)
+            self.assertEqual([index.locate(start) for start in starts], expected_locations)
+
+
+class InputHistoryTester(unittest.TestCase):
+    """
+    InputHistoryTester class
+
+    This class contains unit tests for the InputHistory class of the TkConsole package.
+
+    Methods:
+        file_tester(self, entries=None, max_entries=None): Tester function for the history file, its deduplication
+        and its compaction.
+    """
+
+    def file_tester(self, entries=None, max_entries=None):
+        """
+        Tester function for the history file, its deduplication and its compaction.
+
+        This method records the entries, reads the history file back with a new history, compacts it and checks that
+        every entry is kept once, in the order of its most recent use, and that prefix lookups find the most recent
+        entries first.
+
+        Returns:
+            None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history")
+            history = InputHistory(path, max_entries=max_entries)
+            for entry in entries:
+                history.add(entry)
+            history.close()
+            expected = list(dict.fromkeys(reversed(entries)))[::-1][-max_entries:]
+            self.assertEqual(list(history), expected)
+            history = InputHistory(path, max_entries=max_entries)
+            self.assertEqual(list(history), expected)
+            history.compact(background=False)
+            history.close()
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(len(file.readlines()), len(expected))
+            self.assertEqual(list(InputHistory(path, max_entries=max_entries)), expected)
+            prefix = expected[-1][:1]
+            expected_matches = [entry for entry in reversed(expected) if entry.startswith(prefix)]
+            self.assertEqual(history.matches(prefix), expected_matches)
+            self.assertEqual(history.search(expected[0])[1], expected[0])
+
+
+class CompletionTester(unittest.TestCase):
+    """
+    CompletionTester class
+
+    This class contains unit tests for the Trie class and the completers of the TkConsole package.
+
+    Methods:
+        trie_tester(self, words=None, prefix=None, limit=None): Tester function for the prefix lookups of the Trie
+        class.
+        completers_tester(self): Tester function for the path and attribute completers.
+    """
+
+    def trie_tester(self, words=None, prefix=None, limit=None):
+        """
+        Tester function for the prefix lookups of the Trie class.
+
+        This method checks the words found for a prefix against a scan of the vocabulary.
+
+        Returns:
+            None
+        """
+        trie = Trie(words)
+        self.assertEqual(len(trie), len(set(words)))
+        expected = sorted(word for word in set(words) if word.startswith(prefix))
+        self.assertEqual(trie.complete(prefix, limit), expected[:limit])
+        self.assertTrue(all(word in trie for word in words))
+
+    def completers_tester(self):
+        """
+        Tester function for the path and attribute completers.
+
+        This method completes paths in a temporary directory, hiding hidden entries until the token starts with a dot,
+        and completes names and attributes without evaluating expressions.
+
+        Returns:
+            None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, "logs"))
+            for name in ("log.txt", ".hidden"):
+                with open(os.path.join(directory, name), "w", encoding="utf-8"):
+                    pass
+            completer = PathCompleter()
+            token = os.path.join(directory, "lo")
+            self.assertEqual(completer.complete(token),
+                             [os.path.join(directory, "log.txt"), os.path.join(directory, "logs") + os.sep])
+            self.assertEqual(completer.complete(os.path.join(directory, "")), completer.complete(token))
+            self.assertEqual(completer.complete(os.path.join(directory, ".")), [os.path.join(directory, ".hidden")])
+        completer = AttributeCompleter({"os": os})
+        self.assertEqual(completer.start("print(os.pa"), 6)
+        self.assertIn("os.path", completer.complete("os.pa"))
+        self.assertNotIn("os._exit", completer.complete("os."))
+        self.assertIn("os._exit", completer.complete("os._"))
+        self.assertEqual(completer.complete("os.missing.attribute"), [])
+        self.assertIn("print", completer.complete("pri"))
+
+
+class HeadlessConsoleTester(unittest.TestCase):
+    """
+    HeadlessConsoleTester class
+
+    This class contains unit tests for the HeadlessConsole class of the TkConsole package.
+
+    Methods:
+        output_tester(self, count=None, height=None, max_lines=None): Tester function for the output, the bounded
+        scrollback and scrolling.
+        input_tester(self, inputs=None): Tester function for scripted input, copying and pasting.
+        import_tester(self): Tester function for importing the headless console without Tkinter.
+    """
+
+    def output_tester(self, count=None, height=None, max_lines=None):
+        """
+        Tester function for the output, the bounded scrollback and scrolling.
+
+        This method writes from several threads and tests whether every line is kept within the limit, whether the
+        view follows the output and whether paging scrolls the view.
+
+        Returns:
+            None
+        """
+        console = HeadlessConsole(height=height, max_lines=max_lines)
+        threads = [threading.Thread(target=lambda: [console.print_threadsafe("line") for _ in range(count)])
+                   for _ in range(4)]
+        for thread_ in threads:
+            thread_.start()
+        for thread_ in threads:
+            thread_.join()
+        self.assertLessEqual(console.line_count, int(max_lines * (1 + console.trim_slack)) + 1)
+        self.assertEqual(console.visible_text(), "line\n" * (height - 1))
+        console.go_to_home()
+        self.assertEqual(console.top, 0)
+        console.page_down()
+        self.assertEqual(console.top, height)
+        console.print("more")
+        self.assertEqual(console.top, height)
+        console.go_to_end()
+        self.assertTrue(console.visible_text().endswith("more\n"))
+
+    def input_tester(self, inputs=None):
+        """
+        Tester function for scripted input, copying and pasting.
+
+        This method tests whether inputs are taken in order and echoed after their prompts, whether copied text is
+        pasted in front of the next input and whether an exhausted script raises EOFError.
+
+        Returns:
+            None
+        """
+        console = HeadlessConsole(input_source=inputs)
+        self.assertEqual(console.input("> "), inputs[0])
+        self.assertEqual(console.text, f"> {inputs[0]}\n")
+        console.select((0, 2), (0, 2 + len(inputs[0])))
+        console.copy_text()
+        self.assertEqual(console.clipboard, inputs[0])
+        console.paste_text()
+        self.assertEqual(console.input_async().result(), inputs[0] + inputs[1])
+        self.assertEqual(asyncio.run(console.ainput()), inputs[2])
+        with self.assertRaises(EOFError):
+            console.input()
+
+    def import_tester(self):
+        """
+        Tester function for importing the headless console without Tkinter.
+
+        This method runs an interpreter in which Tkinter cannot be imported and uses the headless console in it.
+
+        Returns:
+            None
+        """
+        code = ("import sys; sys.modules['tkinter'] = None\n"
+                "from TkConsole import HeadlessConsole\n"
+                "console = HeadlessConsole(input_source=['ok'])\n"
+                "print(console.input())")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(result.stdout, "ok\n")
+
+
+class BenchmarkTester(unittest.TestCase):
+    """
+    BenchmarkTester class
+
+    This class contains unit tests for the benchmark suite of the TkConsole package.
+
+    Methods:
+        report_tester(self, lines=None): Tester function for the report of the benchmark suite and its comparison with
+        a baseline.
+        replay_tester(self, lines=None): Tester function for the replay benchmark.
+    """
+
+    def report_tester(self, lines=None):
+        """
+        Tester function for the report of the benchmark suite and its comparison with a baseline.
+
+        This method runs the suite on the headless console and tests whether the report is JSON serializable, whether
+        it is not a regression of itself and whether slower throughput and higher latency count as regressions.
+
+        Returns:
+            None
+        """
+        report = run("headless", {"max_lines": lines}, lines=lines, repeats=10, events=10)
+        values = {result["name"]: result["value"] for result in report["results"]}
+        self.assertGreater(values["print_lines_per_second"], 0)
+        self.assertIsNone(values["resize_event_us"])
+        self.assertEqual(json.loads(json.dumps(report)), report)
+        self.assertEqual(compare(report, report), [])
+        baseline = json.loads(json.dumps(report))
+        for result in baseline["results"]:
+            if result["name"] == "print_lines_per_second":
+                result["value"] *= 2
+            elif result["name"] == "input_return_median_ms":
+                result["value"] /= 2
+        self.assertEqual({name for name, _, _ in compare(report, baseline)},
+                         {"print_lines_per_second", "input_return_median_ms"})
+
+    def replay_tester(self, lines=None):
+        """
+        Tester function for the replay benchmark.
+
+        This method records a session on the headless console and runs the suite with it, and tests whether the
+        replay throughput is reported.
+
+        Returns:
+            None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.rec")
+            console = HeadlessConsole()
+            with console.record(path):
+                for number in range(lines):
+                    console.print(f"line {number}")
+            report = run("headless", {}, lines=10, repeats=10, events=10, session=path)
+            values = {result["name"]: result["value"] for result in report["results"]}
+            self.assertGreater(values["replay_events_per_second"], 0)
+            self.assertGreater(values["replay_megabytes_per_second"], 0)
+
+
+class ConsoleStatsTester(unittest.TestCase):
+    """
+    ConsoleStatsTester class
+
+    This class contains unit tests for the ConsoleStats class of the TkConsole package.
+
+    Methods:
+        histogram_tester(self, durations=None, expected_histogram=None): Tester function for the counters and the
+        timing histograms.
+    """
+
+    def histogram_tester(self, durations=None, expected_histogram=None):
+        """
+        Tester function for the counters and the timing histograms.
+
+        This method records durations and tests the count, total, maximum and histogram of the timer, the hook calls
+        and the reset.
+
+        Returns:
+            None
+        """
+        calls = []
+        stats = ConsoleStats(hook=lambda name, value: calls.append((name, value)))
+        for duration in durations:
+            stats.observe("timer", duration)
+        stats.count("counter", 3)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["counters"], {"counter": 3})
+        self.assertEqual(snapshot["timers"]["timer"]["count"], len(durations))
+        self.assertAlmostEqual(snapshot["timers"]["timer"]["total"], sum(durations))
+        self.assertEqual(snapshot["timers"]["timer"]["max"], max(durations))
+        self.assertEqual(snapshot["timers"]["timer"]["histogram"], expected_histogram)
+        self.assertEqual(len(calls), len(durations) + 1)
+        stats.reset()
+        self.assertEqual(stats.snapshot()["timers"], {})
+
+
+class ChannelConsoleTester(unittest.TestCase):
+    """
+    ChannelConsoleTester class
+
+    This class contains unit tests for the ChannelConsole class and the scoped bindings of the TkConsole package.
+
+    Methods:
+        channels_tester(self, count=None): Tester function for writing to channels and switching between their tabs.
+        bindings_tester(self): Tester function for the key bindings of several consoles in one window.
+    """
+
+    def channels_tester(self, count=None):
+        """
+        Tester function for writing to channels and switching between their tabs.
+
+        This method writes to the selected channel and to a background channel, and tests that only the selected
+        channel is rendered, that the unread count is kept, and that selecting the tab renders the channel's end.
+
+        Returns:
+            None
+        """
+        root = FakeTk()
+        channels = ChannelConsole(root, channels=("main", "log"), max_lines=count)
+        channels.pack(expand=True, fill="both")
+        root.update()
+        channels.print("main", "shown")
+        for number in range(count * 2):
+            channels.print("log", f"line {number}")
+        text_area = channels.console.text_area
+        self.assertEqual(text_area.get("1.0", "end-1c"), "shown\n")
+        self.assertEqual(channels.channels["log"].unread, count * 2)
+        self.assertLessEqual(len(channels.channels["log"].store), int(count * 1.1))
+        channels.print("new", "added")
+        self.assertEqual(list(channels.channels), ["main", "log", "new"])
+        channels.select("log")
+        root.update()
+        self.assertEqual(channels.channels["log"].unread, 0)
+        self.assertEqual(channels.console.line_count, len(channels.channels["log"].store))
+        self.assertIn(f"line {count * 2 - 1}\n", text_area.get("1.0", tk.END))
+        self.assertNotIn("shown", text_area.get("1.0", tk.END))
+        channels.print("log", "more")
+        channels.select("main")
+        self.assertEqual(text_area.get("1.0", "end-1c"), "shown\n")
+        channels.console.input_async("> ")
+        with self.assertRaises(RuntimeError):
+            channels.select("log")
+        channels.console.submit_input()
+        channels.remove_channel("log")
+        self.assertEqual(list(channels.channels), ["main", "new"])
+        root.update_idletasks()
+        root.destroy()
+
+    def bindings_tester(self):
+        """
+        Tester function for the key bindings of several consoles in one window.
+
+        This method creates two consoles in one window, sends key events to their text areas after an input is done
+        and tests that the text area keeps the focus, that each console handles its own keys and that none is bound
+        on the window.
+
+        Returns:
+            None
+        """
+        root = FakeTk()
+        first, second = Console(root), Console(root)
+        self.assertEqual(root.bind("<Home>"), "")
+        for number in range(200):
+            first.print(f"line {number}")
+            second.print(f"line {number}")
+        second.input_async("> ")
+        second.helpers.user_input_var.set("value")
+        second.submit_input()
+        root.update()
+        self.assertIs(root.focus_lastfor(), second.text_area)
+        second.text_area.event_generate("<Home>")
+        root.update()
+        self.assertEqual(second.text_area.yview()[0], 0.0)
+        self.assertEqual(first.text_area.yview()[1], 1.0)
+        second.text_area.event_generate("<End>")
+        root.update()
+        self.assertEqual(second.text_area.yview()[1], 1.0)
+        first.text_area.focus_set()
+        first.text_area.event_generate("<Prior>")
+        root.update()
+        self.assertLess(first.text_area.yview()[1], 1.0)
+        self.assertEqual(second.text_area.yview()[1], 1.0)
+        root.update_idletasks()
+        root.destroy()
+
+
+class LineEditorTester(unittest.TestCase):
+    """
+    LineEditorTester class
+
+    This class contains unit tests for the LineEditor and ProgressBar classes of the TkConsole package.
+
+    Methods:
+        feed_tester(self, chunks=None, expected_line=None): Tester function for rewriting the last line.
+        progress_tester(self, updates=None): Tester function for drawing a progress bar in a headless console.
+    """
+
+    def feed_tester(self, chunks=None, expected_line=None):
+        """
+        Tester function for rewriting the last line.
+
+        This method feeds chunks to the editor and to a search index, replacing the last line of the index whenever
+        the editor rewrites it, and tests the last line and the indexed text.
+
+        Returns:
+            None
+        """
+        editor = LineEditor()
+        index = SearchIndex()
+        written = ""
+        for chunk in chunks:
+            replaced, segments = editor.feed([(chunk, None)])
+            if replaced is not None:
+                index.clear_last_line()
+                written = written[:len(written) - len(replaced)]
+            text = "".join(text for text, _ in segments)
+            index.append(text)
+            written += text
+        self.assertEqual(editor.text, expected_line)
+        self.assertEqual(index.text, written)
+        self.assertTrue(written.endswith(expected_line))
+        self.assertNotIn("\r", written)
+
+    def progress_tester(self, updates=None):
+        """
+        Tester function for drawing a progress bar in a headless console.
+
+        This method updates a progress bar many times and tests that the scrollback grows by one line only, and that a
+        console without line rewriting refuses to draw it.
+
+        Returns:
+            None
+        """
+        console = HeadlessConsole(rewrite_lines=True)
+        console.print("before")
+        bar = console.progress(updates, label="copy", width=10, min_interval=0)
+        for _ in range(updates):
+            bar.update()
+        size = console.byte_count
+        bar.close("done")
+        self.assertEqual(console.text, f"before\ncopy [##########] 100% {updates}/{updates} done\n")
+        self.assertLess(size, 100)
+        status = console.progress(label="items", min_interval=0)
+        status.update(7, "working")
+        self.assertEqual(console.store.line(len(console.store) - 1), "items 7 working")
+        with self.assertRaises(RuntimeError):
+            HeadlessConsole().progress(10)
+
+
+class ReplTester(unittest.TestCase):
+    """
+    ReplTester class
+
+    This class contains unit tests for the child interpreter of an isolated REPL of the TkConsole package.
+
+    Methods:
+        serve_tester(self, statements=None, expected_outputs=None): Tester function for evaluating statements in the
+        child interpreter.
+    """
+
+    def serve_tester(self, statements=None, expected_outputs=None):
+        """
+        Tester function for evaluating statements in the child interpreter.
+
+        This method sends statements to the child interpreter of a REPL and tests the output of every statement,
+        which the child ends with a marker, and the exit of the child on SystemExit.
+
+        Returns:
+            None
+        """
+        marker = "\x00token\x00"
+        process = Popen([sys.executable, "-u", "-m", "TkConsole.repl", "token"], stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                        env=dict(os.environ, PYTHONIOENCODING="utf-8"))
+        source = "".join(json.dumps(statement) + "\n" for statement in statements + ["raise SystemExit", "1"])
+        output, _ = process.communicate(source.encode("utf-8"), timeout=30)
+        outputs = output.decode("utf-8").split(marker)
+        self.assertEqual(len(outputs), len(statements) + 1)
+        self.assertEqual(outputs[-1], "")
+        for output, expected_output in zip(outputs, expected_outputs):
+            self.assertIn(expected_output, output)
+        self.assertEqual(process.returncode, 0)
+
+
+class ServerTester(unittest.TestCase):
+    """
+    ServerTester class
+
+    This class contains unit tests for the ConsoleServer class of the TkConsole package, reading its sockets with the
+    selector thread and writing to a headless console.
+
+    Methods:
+        lines_tester(self, chunks=None, expected_text=None): Tester function for newline-delimited messages.
+        length_tester(self, messages=None, max_message=None): Tester function for length-prefixed messages.
+        threadsafe_tester(self): Tester function for refusing a console that cannot be written from other threads.
+    """
+
+    @staticmethod
+    def _wait(condition):
+        """Waits up to ten seconds for a condition to hold."""
+        deadline = time.monotonic() + 10
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def lines_tester(self, chunks=None, expected_text=None):
+        """
+        Tester function for newline-delimited messages.
+
+        This method sends chunks that split lines at arbitrary points from two named TCP clients, and tests that the
+        lines are written whole after their labels, including the unterminated last line of a closed connection.
+
+        Returns:
+            None
+        """
+        console = HeadlessConsole()
+        server = ConsoleServer(console, threaded=True).start()
+        first = socket.create_connection(server.address)
+        first.sendall(b"first\n")
+        for chunk in chunks:
+            first.sendall(chunk)
+            time.sleep(0.01)
+        with socket.create_connection(server.address) as second:
+            second.sendall(b"second\nonly line\n")
+            self._wait(lambda: "[second]" in console.text)
+        first.close()
+        self._wait(lambda: not server.connections)
+        server.close()
+        self.assertEqual(console.text.replace("[second] only line\n", ""), expected_text)
+        self.assertIn("[second] only line\n", console.text)
+
+    def length_tester(self, messages=None, max_message=None):
+        """
+        Tester function for length-prefixed messages.
+
+        This method sends messages over a Unix domain socket, or over TCP where there are none, followed by the
+        header of a message longer than allowed, and tests that the messages before it are written and that the
+        server closes the connection.
+
+        Returns:
+            None
+        """
+        console = HeadlessConsole()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "console.sock") if hasattr(socket, "AF_UNIX") else None
+            server = ConsoleServer(console, path=path, framing="length", named=False, prefix="",
+                                   max_message=max_message, threaded=True).start()
+            family = socket.AF_UNIX if path is not None else socket.AF_INET
+            with socket.socket(family, socket.SOCK_STREAM) as client:
+                client.connect(server.address)
+                for message in messages:
+                    data = message.encode("utf-8")
+                    client.sendall(len(data).to_bytes(4, "big") + data)
+                client.sendall((max_message + 1).to_bytes(4, "big"))
+                self.assertEqual(client.recv(1), b"")
+            server.close()
+            self.assertEqual(console.text, "".join(message + "\n" for message in messages))
+            self.assertEqual(server.messages, len(messages))
+            if path is not None:
+                self.assertFalse(os.path.exists(path))
+
+    def threadsafe_tester(self):
+        """
+        Tester function for refusing a console that cannot be written from other threads.
+
+        This method starts a threaded server with a console that has no `write_threadsafe` method and tests that it
+        raises a RuntimeError before listening.
+
+        Returns:
+            None
+        """
+        console = types.SimpleNamespace(write_output=lambda output, tag=None: None)
+        server = ConsoleServer(console, threaded=True)
+        with self.assertRaises(RuntimeError):
+            server.start()
+        self.assertIsNone(server.address)
+
+
+class HighlighterTester(unittest.TestCase):
+    """
+    HighlighterTester class
+
+    This class contains unit tests for the Highlighter class of the TkConsole package.
+
+    Methods:
+        highlight_tester(self, rules=None, segments=None, expected_segments=None): Tester function for splitting and
+        tagging output segments at the matches of the rules.
+    """
+
+    def highlight_tester(self, rules=None, segments=None, expected_segments=None):
+        """
+        Tester function for splitting and tagging output segments at the matches of the rules.
+
+        This method highlights output segments and tests the tagged segments, that the text is kept and that
+        segments without matches are returned as they are.
+
+        Returns:
+            None
+        """
+        highlighter = Highlighter(rules)
+        highlighted = highlighter.highlight(segments)
+        self.assertEqual(highlighted, expected_segments)
+        self.assertEqual("".join(text for text, _ in highlighted), "".join(text for text, _ in segments))
+        plain = [("no match here", None)]
+        self.assertIs(highlighter.highlight(plain), plain)
+
+
+class SessionTester(unittest.TestCase):
+    """
+    SessionTester class
+
+    This class contains unit tests for the SessionRecorder and SessionReplay classes of the TkConsole package.
+
+    Methods:
+        replay_tester(self, compress=None, count=None): Tester function for recording a headless session and
+        replaying it.
+        truncated_tester(self): Tester function for reading a truncated recording and a file that is not one.
+    """
+
+    def replay_tester(self, compress=None, count=None):
+        """
+        Tester function for recording a headless session and replaying it.
+
+        This method records output, including text that is not ASCII, and inputs, and replays the recording as fast as
+        possible and at a multiple of real time, testing the replayed text, the passed inputs and the timing.
+
+        Returns:
+            None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.rec")
+            console = HeadlessConsole(input_source=["first", "second"])
+            with console.record(path, compress=compress) as recorder:
+                for number in range(count):
+                    console.print(f"line {number} ✓")
+                time.sleep(0.1)
+                console.input("> ")
+                console.write_output("error\n", "stderr")
+                console.input("> ")
+            console.print("not recorded")
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(2) == b"\x1f\x8b", compress)
+            events = list(read_session(path))
+            self.assertEqual(len(events), recorder.events)
+            self.assertIn((0, "error\n", "stderr"), [event[1:] for event in events])
+            self.assertGreaterEqual(events[-1][0], 0.1)
+            for speed in (None, 4.0):
+                replayed = HeadlessConsole()
+                inputs = []
+                start = time.perf_counter()
+                replay = replayed.replay(path, speed=speed, on_input=inputs.append)
+                elapsed = time.perf_counter() - start
+                self.assertEqual(replayed.text, console.text.replace("not recorded\n", ""))
+                self.assertEqual(inputs, ["first", "second"])
+                self.assertEqual(replay.future.result()["events"], len(events))
+                if speed is None:
+                    self.assertLess(elapsed, events[-1][0])
+                else:
+                    self.assertGreaterEqual(elapsed, events[-1][0] / speed)
+
+    def truncated_tester(self):
+        """
+        Tester function for reading a truncated recording and a file that is not one.
+
+        This method cuts the last event of a recording short and tests that the events before it are read, and that
+        reading a file without the header of a recording raises a ValueError.
+
+        Returns:
+            None
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.rec")
+            console = HeadlessConsole()
+            with console.record(path):
+                console.print("complete")
+                console.print("cut short")
+            with open(path, "rb+") as file:
+                file.truncate(os.path.getsize(path) - 3)
+            self.assertEqual([text for _, _, text, _ in read_session(path)], ["complete\n"])
+            with open(path, "wb") as file:
+                file.write(b"plain text\n")
+            with self.assertRaises(ValueError):
+                list(read_session(path))
+        replay = SessionReplay(console, [(0.0, 0, "replayed\n", None)], speed=None)
+        self.assertEqual(replay.run()["events"], 1)
+        self.assertTrue(console.text.endswith("replayed\n"))
+
+
+class ConsoleStreamTester(unittest.TestCase):
+    """
+    ConsoleStreamTester class
+
+    This class contains unit tests for the ConsoleStream class of the TkConsole package.
+
+    Methods:
+        order_tester(self, threads=None, lines=None): Tester function for flushing from several threads.
+    """
+
+    def order_tester(self, threads=None, lines=None):
+        """
+        Tester function for flushing from several threads.
+
+        This method writes numbered lines from several threads, in a global order, and flushes after every line into a
+        console that takes a random time to accept each chunk, and tests that the console receives the lines in the
+        order they were written.
+
+        Returns:
+            None
+        """
+        received = []
+
+        class SlowConsole:
+            """A console that takes up to a millisecond to accept every chunk."""
+
+            @staticmethod
+            def write_threadsafe(output, timeout=None, tag=None):
+                """Records a chunk after a random delay."""
+                time.sleep(random.random() / 1000)
+                received.append(output)
+                return True
+
+        stream = ConsoleStream(SlowConsole(), buffering="block", buffer_size=1 << 30)
+        lock = threading.Lock()
+        numbers = iter(range(threads * lines))
+
+        def work():
+            for _ in range(lines):
+                with lock:
+                    stream.write(f"{next(numbers)}\n")
+                stream.flush()
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        stream.flush()
+        self.assertEqual("".join(received), "".join(f"{number}\n" for number in range(threads * lines)))
@@ -6,7 +6,12 @@ ensure that they work as expected. The tests cover printing output, taking user
 and other interactive features provided by the Console class.
 """
 
-from .testers import ConsoleTester
+import os
+from TkConsole import DEFAULT_RULES
+from .testers import ConsoleTester, OutputQueueTester, LineStoreTester, AnsiParserTester, SearchIndexTester, \
+    InputHistoryTester, CompletionTester, HeadlessConsoleTester, \
+    BenchmarkTester, ConsoleStatsTester, ChannelConsoleTester, LineEditorTester, ReplTester, \
+    ServerTester, HighlighterTester, SessionTester, ConsoleStreamTester
 
 
 def test_print():
@@ -60,3 +65,627 @@ def test_paste_text():
     """
     tester = ConsoleTester()
     tester.paste_text_tester(clipboard_text="Pasted text.")
+
+
+def test_buffered_print():
+    """
+    Test the print method of the Console class in buffered mode.
+
+    This function uses the ConsoleTester class to test that buffered output is written on flush.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.buffered_print_tester(prints=["first", "second"], expected_output="first\nsecond\n\n")
+
+
+def test_threadsafe_print():
+    """
+    Test the print_threadsafe method of the Console class.
+
+    This function uses the ConsoleTester class to test printing from a worker thread.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.threadsafe_print_tester(lines=[f"line {number}" for number in range(100)])
+
+
+def test_output_queue_backpressure():
+    """
+    Test the backpressure policies of the OutputQueue class.
+
+    This function uses the OutputQueueTester class to test the block, drop-oldest and drop-newest policies.
+
+    Returns:
+        None
+    """
+    tester = OutputQueueTester()
+    tester.backpressure_tester(policy="block", items="abcd", maxsize=2, expected_items=["a", "b"], expected_dropped=2)
+    tester.backpressure_tester(policy="drop-oldest", items="abcd", maxsize=2, expected_items=["c", "d"],
+                               expected_dropped=2)
+    tester.backpressure_tester(policy="drop-newest", items="abcd", maxsize=2, expected_items=["a", "b"],
+                               expected_dropped=2)
+
+
+def test_scrollback():
+    """
+    Test the bounded scrollback of the Console class.
+
+    This function uses the ConsoleTester class to test trimming of the oldest lines.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.scrollback_tester(max_lines=20, count=500)
+
+
+def test_virtual_copy():
+    """
+    Test copying in the virtual mode of the Console class.
+
+    This function uses the ConsoleTester class to test rendering a window of the output and copying a selection that
+    was scrolled out of it.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.virtual_copy_tester(count=500)
+
+
+def test_redirect():
+    """
+    Test redirecting sys.stdout and sys.stderr to the Console class.
+
+    This function uses the ConsoleTester class to test the ConsoleStream class and the redirect context manager.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.redirect_tester(output="Hello from print.", error="Hello from stderr.")
+
+
+def test_input_async():
+    """
+    Test the input_async and ainput methods of the Console class.
+
+    This function uses the ConsoleTester class to test taking input without a nested event loop.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.input_async_tester(prompt="Name: ", value="Ada")
+
+
+def test_run_process():
+    """
+    Test the run_process method of the Console class.
+
+    This function uses the ConsoleTester class to test streaming a subprocess with file handlers and with threads.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    if os.name != "nt":
+        tester.run_process_tester(threaded=False)
+    tester.run_process_tester(threaded=True)
+
+
+def test_line_store():
+    """
+    Test the LineStore class.
+
+    This function uses the LineStoreTester class to test appending, reading and trimming lines.
+
+    Returns:
+        None
+    """
+    tester = LineStoreTester()
+    tester.lines_tester(writes=["ab", "c\nd\n", "\u00e9\nx"], trim=0, expected_lines=["abc", "d", "\u00e9", "x"])
+    tester.lines_tester(writes=["a\nb\nc\nd"], trim=3, expected_lines=["d"])
+    tester.lines_tester(writes=["a\nb\n"], trim=5, expected_lines=[""])
+
+
+def test_ansi():
+    """
+    Test styling output with ANSI escape sequences in the Console class.
+
+    This function uses the ConsoleTester class to test the tagging of styled output and the bounded tag pool.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.ansi_tester(max_ansi_tags=16)
+
+
+def test_ansi_parser():
+    """
+    Test the AnsiParser class.
+
+    This function uses the AnsiParserTester class to test SGR sequences, including sequences split across chunks, and
+    the removal of other escape sequences such as charset selections.
+
+    Returns:
+        None
+    """
+    tester = AnsiParserTester()
+    tester.feed_tester(chunks=["a\x1b[3", "1mb\x1b[0mc"],
+                       expected_segments=[("a", None), ("b", "#CD3131"), ("c", None)])
+    tester.feed_tester(chunks=["\x1b[38;5;196mx\x1b[38;2;1;2;3my\x1b[39mz"],
+                       expected_segments=[("x", "#FF0000"), ("y", "#010203"), ("z", None)])
+    tester.feed_tester(chunks=["\x1b[2Ka\x1b]0;title\x07b\x1b"], expected_segments=[("a", None), ("b", None)])
+    tester.feed_tester(chunks=["x\x1b(B y\x1b)0z\x1b#8"], expected_segments=[("x", None), (" y", None), ("z", None)])
+    tester.feed_tester(chunks=["a\x1b(", "Bb\x1b", "(0c"], expected_segments=[("a", None), ("b", None), ("c", None)])
+
+
+def test_search():
+    """
+    Test searching the output of the Console class.
+
+    This function uses the ConsoleTester class to test searching, highlighting and navigating matches.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.search_tester(count=1000, query="5$")
+
+
+def test_search_index():
+    """
+    Test the SearchIndex class.
+
+    This function uses the SearchIndexTester class to test substring, extended, case-insensitive and regular
+    expression queries, including after trimming and extended queries whose matches overlap those of the previous one.
+
+    Returns:
+        None
+    """
+    tester = SearchIndexTester()
+    lines = ["alpha beta", "Beta gamma", "delta beta beta"]
+    tester.find_tester(lines=lines, trim=0, queries=[
+        ("beta", False, False, [(0, 6), (2, 6), (2, 11)]),
+        ("beta b", False, False, [(2, 6)]),
+        ("BETA", False, True, [(0, 6), (1, 0), (2, 6), (2, 11)]),
+        (r"^[a-z]+a\b", True, False, [(0, 0), (2, 0)]),
+    ])
+    tester.find_tester(lines=lines, trim=1, queries=[("beta", False, False, [(1, 6), (1, 11)])])
+    tester.find_tester(lines=["aaab", "aaaa"], trim=0, queries=[
+        ("aa", False, False, [(0, 0), (1, 0), (1, 2)]),
+        ("aab", False, False, [(0, 1)]),
+        ("a", False, False, [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (1, 3)]),
+        ("aa", False, False, [(0, 0), (1, 0), (1, 2)]),
+    ])
+
+
+def test_resize():
+    """
+    Test the debounced resize handling of the Console class.
+
+    This function uses the ConsoleTester class to test that a burst of resize events adjusts the layout once and that
+    the font metrics are cached.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.resize_tester(sizes=[(400, 300), (420, 310), (440, 320), (460, 330)])
+
+
+def test_history():
+    """
+    Test navigating the input history of the Console class.
+
+    This function uses the ConsoleTester class to test prefix navigation with 'Up' and 'Down' and reverse search with
+    'Ctrl+R'.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.history_tester(entries=["git status", "make test", "git commit -m 'first\nsecond'"])
+
+
+def test_input_history():
+    """
+    Test the InputHistory class.
+
+    This function uses the InputHistoryTester class to test the history file, its deduplication, the limit on the
+    number of entries and the compaction.
+
+    Returns:
+        None
+    """
+    tester = InputHistoryTester()
+    entries = [f"command {number % 7} \\path\n" for number in range(50)] + ["command 3 \\path\n", "ls"]
+    tester.file_tester(entries=entries, max_entries=100)
+    tester.file_tester(entries=entries, max_entries=5)
+
+
+def test_completion():
+    """
+    Test tab completion in the Console class.
+
+    This function uses the ConsoleTester class to test completing from a vocabulary and from the file system.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.completion_tester(words=["zq-deploy", "zq-describe", "zq-destroy"])
+
+
+def test_completers():
+    """
+    Test the Trie class and the completers.
+
+    This function uses the CompletionTester class to test prefix lookups in a trie and the path and attribute
+    completers.
+
+    Returns:
+        None
+    """
+    tester = CompletionTester()
+    words = [f"{prefix}{number}" for prefix in ("get", "gem", "set") for number in range(300)]
+    tester.trie_tester(words=words, prefix="ge", limit=None)
+    tester.trie_tester(words=words, prefix="get1", limit=20)
+    tester.trie_tester(words=words, prefix="x", limit=None)
+    tester.completers_tester()
+
+
+def test_save():
+    """
+    Test saving the scrollback of the Console class.
+
+    This function uses the ConsoleTester class to test saving from the text area and from the backing store of virtual
+    mode, as plain text and compressed.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.save_tester(count=1000, virtual=False, compress=False)
+    tester.save_tester(count=1000, virtual=True, compress=True)
+
+
+def test_headless():
+    """
+    Test the HeadlessConsole class.
+
+    This function uses the HeadlessConsoleTester class to test output, scrolling, scripted input, the clipboard and
+    importing the package without Tkinter.
+
+    Returns:
+        None
+    """
+    tester = HeadlessConsoleTester()
+    tester.output_tester(count=1000, height=10, max_lines=500)
+    tester.input_tester(inputs=["first", "second", "third"])
+    tester.import_tester()
+
+
+def test_benchmarks():
+    """
+    Test the benchmark suite.
+
+    This function uses the BenchmarkTester class to run the suite on the headless console and compare its report with
+    a baseline.
+
+    Returns:
+        None
+    """
+    tester = BenchmarkTester()
+    tester.report_tester(lines=2000)
+
+
+def test_stats():
+    """
+    Test the instrumentation of the Console class.
+
+    This function uses the ConsoleTester class to test the counters and timers of the hot paths and the stats hook.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.stats_tester(count=100)
+
+
+def test_console_stats():
+    """
+    Test the ConsoleStats class.
+
+    This function uses the ConsoleStatsTester class to test the counters, the timing histograms and the hook.
+
+    Returns:
+        None
+    """
+    tester = ConsoleStatsTester()
+    tester.histogram_tester(durations=[0.0000005, 0.000003, 0.0000035, 0.001, 100.0],
+                            expected_histogram={1: 1, 4: 2, 1024: 1, 2 ** 27: 1})
+
+
+def test_channels():
+    """
+    Test the ChannelConsole class.
+
+    This function uses the ChannelConsoleTester class to test writing to channels, the unread counts and the lazy
+    rendering of the selected channel.
+
+    Returns:
+        None
+    """
+    tester = ChannelConsoleTester()
+    tester.channels_tester(count=500)
+
+
+def test_bindings():
+    """
+    Test the scoped bindings of the Console class.
+
+    This function uses the ChannelConsoleTester class to test that several consoles in one window keep their own
+    bindings.
+
+    Returns:
+        None
+    """
+    tester = ChannelConsoleTester()
+    tester.bindings_tester()
+
+
+def test_render_rate():
+    """
+    Test limiting the render rate of the Console class.
+
+    This function uses the ConsoleTester class to test that lines beyond the render rate are suppressed and
+    summarized.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.render_rate_tester(rate=100, count=1000)
+
+
+def test_pause():
+    """
+    Test holding output back while the view of the Console class is scrolled away from the end.
+
+    This function uses the ConsoleTester class to test that output is held back and inserted on returning to the end.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.pause_tester(count=500)
+
+
+def test_reuse_entry():
+    """
+    Test reusing one entry field for every input of the Console class.
+
+    This function uses the ConsoleTester class to test that the kept entry field is moved to every input.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.reuse_entry_tester(values=["first", "second", "third"])
+
+
+def test_rewrite():
+    """
+    Test rewriting the last line of the Console class in place.
+
+    This function uses the ConsoleTester class to test carriage returns, erase-line sequences and progress bars in
+    the text area and in virtual mode.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.rewrite_tester(updates=1000, virtual=False)
+    tester.rewrite_tester(updates=1000, virtual=True)
+
+
+def test_line_editor():
+    """
+    Test the LineEditor class.
+
+    This function uses the LineEditorTester class to test carriage returns, backspaces and cursor movement and
+    erase-line sequences.
+
+    Returns:
+        None
+    """
+    tester = LineEditorTester()
+    tester.feed_tester(chunks=["one\n", "10%", "\r20%", "\r\x1b[K30%\n", "abc", "\x08\x08X", "\x1b[1GY\x1b[5Cz"],
+                       expected_line="YXc   z")
+    tester.feed_tester(chunks=["keep\npartial", "\x1b[2K\rnew\x1b[2D\x1b[K"], expected_line="n")
+
+
+def test_progress():
+    """
+    Test the ProgressBar class.
+
+    This function uses the LineEditorTester class to test that a progress bar redraws one line of the scrollback.
+
+    Returns:
+        None
+    """
+    tester = LineEditorTester()
+    tester.progress_tester(updates=5000)
+
+
+def test_type_ahead():
+    """
+    Test taking queued and typed-ahead inputs in the Console class.
+
+    This function uses the ConsoleTester class to test that scripted inputs and lines typed while no input is pending
+    are taken without showing the entry field.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.type_ahead_tester(script=["first", "second", "third"], typed="typed")
+
+
+def test_repl():
+    """
+    Test the interactive Python interpreter of the Console class.
+
+    This function uses the ConsoleTester class to test multi-line statements, output and interruption on a worker
+    thread and in a child interpreter.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.repl_tester(isolated=False)
+    tester.repl_tester(isolated=True)
+
+
+def test_repl_serve():
+    """
+    Test the child interpreter of an isolated REPL.
+
+    This function uses the ReplTester class to test expressions, multi-line statements, tracebacks and syntax errors.
+
+    Returns:
+        None
+    """
+    tester = ReplTester()
+    tester.serve_tester(statements=["x = 41", "x + 1", "def f():\n    return 'é'\n", "f()", "1 / 0", "1 +"],
+                        expected_outputs=["", "42\n", "", "'é'\n", "ZeroDivisionError", "SyntaxError"])
+
+
+def test_serve():
+    """
+    Test streaming messages from local clients into the Console class.
+
+    This function uses the ConsoleTester class to test that the lines of concurrent clients are written whole after
+    their labels.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.server_tester(clients=4, lines=500)
+
+
+def test_server():
+    """
+    Test the ConsoleServer class.
+
+    This function uses the ServerTester class to test newline-delimited and length-prefixed messages, connection
+    labels, the limit on the size of a message and the check for a console that can be written from other threads.
+
+    Returns:
+        None
+    """
+    tester = ServerTester()
+    tester.lines_tester(chunks=[b"one\ntw", b"o\nthr", b"ee\n\xc3", b"\xa9\nlast"],
+                        expected_text="[first] one\n[first] two\n[first] three\n[first] é\n[first] last\n")
+    tester.length_tester(messages=["hello", "multi\nline", "wörld"], max_message=1024)
+    tester.threadsafe_tester()
+
+
+def test_highlight():
+    """
+    Test highlighting patterns in the output of the Console class.
+
+    This function uses the ConsoleTester class to test that matches are tagged in new output, across ANSI styles, at
+    a cost that does not grow with the scrollback.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.highlight_tester(count=5000)
+
+
+def test_highlighter():
+    """
+    Test the Highlighter class.
+
+    This function uses the HighlighterTester class to test rules with styles and with existing tags, precedence,
+    matches across segments and tags that are added to existing ones.
+
+    Returns:
+        None
+    """
+    tester = HighlighterTester()
+    tester.highlight_tester(rules=DEFAULT_RULES + [(r"(x)(y)", "stderr")],
+                            segments=[("ok 10.0.0.1 took 12 ms\nERROR bad\nxy", None)],
+                            expected_segments=[("ok ", None), ("10.0.0.1", "highlight_2"), (" took ", None),
+                                               ("12 ms", "highlight_3"), ("\n", None), ("ERROR bad", "highlight_0"),
+                                               ("\n", None), ("xy", "stderr")])
+    tester.highlight_tester(rules=DEFAULT_RULES, segments=[("ERR", None), ("OR here", "a"), (" 5ms\n", ("b", "c"))],
+                            expected_segments=[("ERR", "highlight_0"), ("OR here", ("a", "highlight_0")),
+                                               (" 5ms", ("b", "c", "highlight_0")), ("\n", ("b", "c"))])
+
+
+def test_record():
+    """
+    Test recording a session of the Console class and replaying it.
+
+    This function uses the ConsoleTester class to test that a replay from the event loop repeats the recorded output
+    and inputs.
+
+    Returns:
+        None
+    """
+    tester = ConsoleTester()
+    tester.record_tester(count=200)
+
+
+def test_session():
+    """
+    Test the SessionRecorder and SessionReplay classes.
+
+    This function uses the SessionTester class to test recordings with and without compression, timed replays and
+    truncated recordings.
+
+    Returns:
+        None
+    """
+    tester = SessionTester()
+    tester.replay_tester(compress=False, count=1000)
+    tester.replay_tester(compress=True, count=1000)
+    tester.truncated_tester()
+
+
+def test_replay_benchmark():
+    """
+    Test the replay benchmark of the benchmark suite.
+
+    This function uses the BenchmarkTester class to test that replaying a recorded session reports its throughput.
+
+    Returns:
+        None
+    """
+    tester = BenchmarkTester()
+    tester.replay_tester(lines=2000)
+
+
+def test_stream_order():
+    """
+    Test flushing the ConsoleStream class from several threads.
+
+    This function uses the ConsoleStreamTester class to test that text flushed by several threads reaches the console
+    in the order it was written.
+
+    Returns:
+        None
+    """
+    tester = ConsoleStreamTester()
+    tester.order_tester(threads=8, lines=200)
@@ -11,7 +11,18 @@ Functions:
 
 import queue
 import threading
-from .tests import test_print, test_input, test_copy_text, test_paste_text
+from .tests import test_print, test_input, test_copy_text, test_paste_text, test_buffered_print, \
+    test_threadsafe_print, test_output_queue_backpressure, test_scrollback, \
+    test_virtual_copy, test_line_store, test_redirect, \
+    test_input_async, test_run_process, test_ansi, test_ansi_parser, \
+    test_search, test_search_index, test_resize, \
+    test_history, test_input_history, test_completion, test_completers, \
+    test_save, test_headless, \
+    test_benchmarks, test_stats, test_console_stats, test_channels, test_bindings, \
+    test_render_rate, test_pause, test_reuse_entry, \
+    test_rewrite, test_line_editor, test_progress, test_type_ahead, test_repl, test_repl_serve, \
+    test_serve, test_server, test_highlight, test_highlighter, test_record, test_session, test_replay_benchmark, \
+    test_stream_order
 
 
 def thread(func):